@@ -0,0 +1,227 @@
+"""
+Post-auction summary for the admin dashboard.
+
+Players, teams and bids are each read with one column query (no ORM objects)
+into pandas frames, and every figure is a vectorized groupby over them:
+- spend per team;
+- sold price and premium over base price by role;
+- registrations and spend by residential block;
+- bid wars: bids and bidding teams per lot, and how long each lot ran from
+  its first bid to its last;
+- the top buys per role.
+The endpoint caches the result by data version, so it is only rebuilt after
+players, teams or bids change.
+"""
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database import ReadSessionLocal, stored_rows
+from lazy_imports import get_numpy, get_pandas
+from models import Bid, BlockName, Player, PlayerRole, PlayerStatus, Team
+
+TOP_BUYS = 5
+TOP_BID_WARS = 10
+
+# Premium of sold price over base price, as a fraction of base price
+PREMIUM_BANDS = [
+    ("at base", 0.0),
+    ("up to 50%", 0.5),
+    ("50-100%", 1.0),
+    ("100-200%", 2.0),
+    ("over 200%", float("inf")),
+]
+
+def bids_version(db: Session) -> tuple:
+    """Bids are only ever added or deleted, and have no updated_at, so count and highest id version them"""
+    return tuple(db.query(func.count(Bid.id), func.max(Bid.id)).one())
+
+def _frame(db: Session, *columns):
+    """
+    Columns as stored (see stored_rows) into a frame. Enum and datetime
+    values are converted in pandas, which is much faster than SQLAlchemy
+    converting each value.
+    """
+    pd = get_pandas()
+    rows = stored_rows(db, columns)
+    names = [c.key for c in columns]
+    return pd.DataFrame(dict(zip(names, zip(*rows))) if rows else {name: [] for name in names})
+
+def _enum_values(series, enum_class):
+    # Enum columns store member names
+    return series.map({member.name: member.value for member in enum_class})
+
+def _money(value) -> Optional[int]:
+    return None if get_pandas().isna(value) else int(round(float(value)))
+
+def _number(value, digits: int = 1) -> Optional[float]:
+    return None if get_pandas().isna(value) else round(float(value), digits)
+
+def _rupees(frame):
+    """Money columns as whole rupees"""
+    return frame.round(0).astype("Int64")
+
+def _records(frame) -> list:
+    """JSON-ready rows: numpy scalars become Python ones and missing values None"""
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+def load_frames(db: Session, league: Optional[str] = None):
+    """Players, teams and bids frames, limited to one league's auction if given"""
+    pd = get_pandas()
+    players = _frame(
+        db, Player.id, Player.name, Player.role, Player.status, Player.block_name,
+        Player.base_price, Player.sold_price, Player.team_id, Player.league
+    )
+    teams = _frame(db, Team.id, Team.name, Team.short_name, Team.budget, Team.remaining_budget, Team.league)
+    bids = _frame(db, Bid.auction_id, Bid.player_id, Bid.team_id, Bid.bid_amount, Bid.created_at)
+    if league is not None:
+        players = players[players["league"] == league]
+        teams = teams[teams["league"] == league]
+        bids = bids[bids["player_id"].isin(players["id"])]
+    players = players.assign(
+        role=_enum_values(players["role"], PlayerRole),
+        status=_enum_values(players["status"], PlayerStatus),
+        block_name=_enum_values(players["block_name"], BlockName).fillna("Unknown"),
+        base_price=players["base_price"].astype("float64"),
+        sold_price=players["sold_price"].astype("float64"),
+        team_id=players["team_id"].astype("Int64"),
+    )
+    bids = bids.assign(
+        bid_amount=bids["bid_amount"].astype("float64"),
+        created_at=pd.to_datetime(bids["created_at"], format="ISO8601"),
+    )
+    return players, teams, bids
+
+def sold_players(players):
+    np = get_numpy()
+    sold = players[(players["status"] == PlayerStatus.SOLD.value) & players["sold_price"].notna()]
+    base = sold["base_price"].where(sold["base_price"] > 0)
+    return sold.assign(premium=(sold["sold_price"] / base - 1).replace([np.inf, -np.inf], np.nan))
+
+def team_spend(teams, sold) -> list:
+    spend = sold.groupby("team_id")["sold_price"].agg(
+        players_bought="size", spent="sum", average_price="mean", highest_price="max"
+    )
+    summary = teams.set_index("id").join(spend)
+    summary["players_bought"] = summary["players_bought"].fillna(0).astype(int)
+    summary["spent"] = summary["spent"].fillna(0.0)
+    summary["budget_used_pct"] = (summary["spent"] / summary["budget"].where(summary["budget"] > 0) * 100).round(1)
+    money = ["spent", "average_price", "highest_price", "budget", "remaining_budget"]
+    summary[money] = _rupees(summary[money])
+    summary = summary.reset_index().rename(columns={"id": "team_id"}).sort_values(
+        ["spent", "team_id"], ascending=[False, True]
+    )
+    return _records(summary[[
+        "team_id", "name", "short_name", "players_bought", "spent", "average_price",
+        "highest_price", "budget", "remaining_budget", "budget_used_pct"
+    ]])
+
+def by_role(players, sold) -> list:
+    registered = players.assign(unsold=players["status"] == PlayerStatus.UNSOLD.value).groupby("role").agg(
+        registered=("id", "size"), unsold=("unsold", "sum")
+    )
+    prices = sold.groupby("role").agg(
+        sold=("sold_price", "size"),
+        total_spent=("sold_price", "sum"),
+        average_price=("sold_price", "mean"),
+        median_price=("sold_price", "median"),
+        lowest_price=("sold_price", "min"),
+        highest_price=("sold_price", "max"),
+        average_premium_pct=("premium", "mean"),
+        median_premium_pct=("premium", "median"),
+    )
+    summary = registered.join(prices)
+    summary["sold"] = summary["sold"].fillna(0).astype(int)
+    summary["total_spent"] = summary["total_spent"].fillna(0.0)
+    money = ["total_spent", "average_price", "median_price", "lowest_price", "highest_price"]
+    summary[money] = _rupees(summary[money])
+    premiums = ["average_premium_pct", "median_premium_pct"]
+    summary[premiums] = (summary[premiums] * 100).round(1)
+    return _records(summary.reset_index())
+
+def premiums(sold) -> dict:
+    pd = get_pandas()
+    premium = sold["premium"].dropna()
+    edges = [-float("inf")] + [upper for _, upper in PREMIUM_BANDS]
+    bands = pd.cut(premium, edges, labels=[label for label, _ in PREMIUM_BANDS]).value_counts(sort=False)
+    return {
+        "average_pct": _number(premium.mean() * 100),
+        "median_pct": _number(premium.median() * 100),
+        "highest_pct": _number(premium.max() * 100),
+        "bands": [{"band": band, "players": int(count)} for band, count in bands.items()],
+    }
+
+def by_block(players, sold) -> list:
+    registered = players.groupby("block_name")["id"].size().rename("registered")
+    spend = sold.groupby("block_name")["sold_price"].agg(sold="size", total_spent="sum", average_price="mean")
+    summary = registered.to_frame().join(spend)
+    summary["sold"] = summary["sold"].fillna(0).astype(int)
+    summary["total_spent"] = summary["total_spent"].fillna(0.0)
+    summary[["total_spent", "average_price"]] = _rupees(summary[["total_spent", "average_price"]])
+    return _records(summary.reset_index().sort_values(["registered", "block_name"], ascending=[False, True]))
+
+def bid_wars(bids, players) -> dict:
+    lots = bids.groupby(["auction_id", "player_id"]).agg(
+        bids=("bid_amount", "size"),
+        teams=("team_id", "nunique"),
+        opening_bid=("bid_amount", "min"),
+        final_bid=("bid_amount", "max"),
+        first_bid_at=("created_at", "min"),
+        last_bid_at=("created_at", "max"),
+    )
+    lots["seconds"] = (lots["last_bid_at"] - lots["first_bid_at"]).dt.total_seconds()
+    longest = lots.sort_values(["bids", "seconds"], ascending=False).head(TOP_BID_WARS).reset_index()
+    longest = longest.merge(players[["id", "name", "role"]], left_on="player_id", right_on="id", how="left")
+    longest[["opening_bid", "final_bid"]] = _rupees(longest[["opening_bid", "final_bid"]])
+    seconds = lots["seconds"]
+    return {
+        "lots": int(len(lots)),
+        "bids": int(lots["bids"].sum()),
+        "average_bids_per_lot": _number(lots["bids"].mean()),
+        "median_bids_per_lot": _number(lots["bids"].median()),
+        "most_bids_in_a_lot": None if lots.empty else int(lots["bids"].max()),
+        "average_teams_per_lot": _number(lots["teams"].mean()),
+        "average_lot_seconds": _number(seconds.mean()),
+        "median_lot_seconds": _number(seconds.median()),
+        "p90_lot_seconds": _number(seconds.quantile(0.9)),
+        "longest_lot_seconds": _number(seconds.max()),
+        "total_bidding_seconds": _number(seconds.sum()),
+        "longest_bid_wars": _records(longest[[
+            "auction_id", "player_id", "name", "role", "bids", "teams", "opening_bid", "final_bid", "seconds"
+        ]].round({"seconds": 1})),
+    }
+
+def top_buys(sold, teams) -> dict:
+    ranked = sold.sort_values(["sold_price", "id"], ascending=[False, True]).groupby("role").head(TOP_BUYS)
+    ranked = ranked.merge(
+        teams[["id", "name"]].rename(columns={"id": "team_id", "name": "team_name"}), on="team_id", how="left"
+    )
+    ranked = ranked.assign(premium_pct=(ranked["premium"] * 100).round(1)).rename(columns={"id": "player_id"})
+    ranked[["base_price", "sold_price"]] = _rupees(ranked[["base_price", "sold_price"]])
+    columns = ["player_id", "name", "team_id", "team_name", "base_price", "sold_price", "premium_pct"]
+    return {role: _records(group[columns]) for role, group in ranked.groupby("role", sort=True)}
+
+def build_summary(league: Optional[str] = None) -> dict:
+    """The whole summary; reads with its own session, as it runs in the threadpool"""
+    db = ReadSessionLocal()
+    try:
+        players, teams, bids = load_frames(db, league)
+    finally:
+        db.close()
+    sold = sold_players(players)
+    status_counts = players["status"].value_counts()
+    return {
+        "league": league,
+        "players": {
+            "total": int(len(players)),
+            **{status.value: int(status_counts.get(status.value, 0)) for status in PlayerStatus},
+        },
+        "total_spent": _money(sold["sold_price"].sum()),
+        "average_price": _money(sold["sold_price"].mean()),
+        "teams": team_spend(teams, sold),
+        "roles": by_role(players, sold),
+        "premiums": premiums(sold),
+        "blocks": by_block(players, sold),
+        "bid_wars": bid_wars(bids, players),
+        "top_buys": top_buys(sold, teams),
+    }
@@ -0,0 +1,98 @@
+"""
+Auction order: generating the sequence players come up in, and storing it.
+
+generate_order() builds a full sequence from rules:
+- marquee players first: the given ids, or else the highest rated players;
+- the rest interleaved by role, each role spread evenly through the sequence
+  rather than one role after another;
+- players from the same residential block kept apart where possible;
+- within a role, highest rating first (unrated players last, by id).
+apply_order() writes any sequence, generated or hand-built, with one
+executemany UPDATE instead of a SELECT and UPDATE per player.
+"""
+import heapq
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from models import Player as PlayerModel, PlayerStatus
+
+MARQUEE_COUNT = 10
+# How far down a role's queue to look for a player from a different block
+BLOCK_LOOKAHEAD = 3
+
+def eligible_players(db: Session, league: Optional[str] = None) -> list:
+    """(id, role, block_name, rating) of every player the next auction will bring up"""
+    query = select(PlayerModel.id, PlayerModel.role, PlayerModel.block_name, PlayerModel.rating).where(
+        PlayerModel.status == PlayerStatus.AVAILABLE,
+        PlayerModel.registration_fee_paid == True
+    )
+    if league:
+        query = query.where(PlayerModel.league == league)
+    return db.execute(query).all()
+
+def _seed_key(player) -> tuple:
+    # Highest rating first, unrated players after every rated one
+    return (player.rating is None, -(player.rating or 0.0), player.id)
+
+def _interleave(ranked: list) -> list:
+    """Players in seed order -> roles spread evenly, neighbouring blocks kept apart"""
+    queues: Dict[object, deque] = {}
+    for player in ranked:
+        queues.setdefault(player.role, deque()).append(player)
+    sizes = {role: len(queue) for role, queue in queues.items()}
+    # A role's k-th player ideally sits (k + 0.5) / size of the way through the
+    # sequence; always taking the role whose next slot is earliest spreads each one evenly
+    heap = [(0.5 / sizes[role], index, role) for index, role in enumerate(queues)]
+    heapq.heapify(heap)
+    order = []
+    last_block = None
+    while heap:
+        _, index, role = heapq.heappop(heap)
+        queue = queues[role]
+        pick = 0
+        if last_block is not None:
+            for position in range(min(BLOCK_LOOKAHEAD, len(queue))):
+                if queue[position].block_name != last_block:
+                    pick = position
+                    break
+        player = queue[pick]
+        del queue[pick]
+        order.append(player)
+        last_block = player.block_name
+        if queue:
+            placed = sizes[role] - len(queue)
+            heapq.heappush(heap, ((placed + 0.5) / sizes[role], index, role))
+    return order
+
+def generate_order(players: list, marquee_count: int = MARQUEE_COUNT,
+                   marquee_ids: Optional[List[int]] = None) -> List[int]:
+    """Player ids in auction order, from (id, role, block_name, rating) rows"""
+    ranked = sorted(players, key=_seed_key)
+    if marquee_ids is not None:
+        chosen = set(marquee_ids)
+        marquee = [player for player in ranked if player.id in chosen]
+    else:
+        marquee = [player for player in ranked if player.rating is not None][:marquee_count]
+    marquee_set = {player.id for player in marquee}
+    rest = [player for player in ranked if player.id not in marquee_set]
+    return [player.id for player in marquee] + [player.id for player in _interleave(rest)]
+
+def apply_order(db: Session, orders: Iterable[Tuple[int, int]]) -> int:
+    """
+    Store (player id, order) pairs in one executemany; ids that don't exist
+    are skipped. Returns how many players were updated. Does not commit.
+    """
+    orders = dict(orders)
+    if not orders:
+        return 0
+    existing = set(db.scalars(select(PlayerModel.id).where(PlayerModel.id.in_(list(orders)))))
+    now = datetime.utcnow()
+    rows = [
+        {"id": player_id, "auction_order": order, "updated_at": now}
+        for player_id, order in orders.items() if player_id in existing
+    ]
+    if rows:
+        db.execute(update(PlayerModel), rows)
+    return len(rows)
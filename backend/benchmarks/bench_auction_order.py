@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Auction order: generating and storing the sequence for N players.
+
+Seeds a temporary SQLite database with N available, paid-up players with
+random roles, blocks and ratings (one in ten unrated). It then:
+- stores a hand-built order through POST /api/auction/set-auction-order and
+  compares it with the old path, a SELECT and UPDATE per player;
+- generates and stores an order through POST /api/auction/generate-auction-order.
+It reports time and SQL statements for each and checks the generated
+sequence: marquee players are the highest rated, every role stays within
+one player of its share of any prefix, neighbours rarely share a block, and
+the stored auction_order matches.
+
+Usage (from the backend directory):
+    python benchmarks/bench_auction_order.py
+    python benchmarks/bench_auction_order.py --players 1000 10000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_order_')}/order.db"
+os.environ.setdefault("LOT_TIMER_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+
+import main
+from database import SessionLocal, engine
+from models import Bid, BlockName, Player, PlayerRole, PlayerStatus
+from query_counter import QueryCounter
+
+ROLES = list(PlayerRole)
+BLOCKS = list(BlockName)
+MARQUEE = 10
+
+
+def seed(players):
+    rng = random.Random(players)
+    rows = [{
+        "id": i + 1, "name": f"Player {i}", "email": f"p{i}@example.com",
+        "role": rng.choice(ROLES).name, "block_name": rng.choice(BLOCKS).name,
+        "status": PlayerStatus.AVAILABLE.name, "registration_fee_paid": True,
+        "rating": None if i % 10 == 0 else round(rng.uniform(0, 100), 1),
+    } for i in range(players)]
+    with engine.begin() as connection:
+        connection.execute(delete(Bid))
+        connection.execute(delete(Player))
+        connection.execute(insert(Player), rows)
+    return rows
+
+
+def legacy_set_order(orders):
+    """The old set-auction-order: one SELECT per player, then a flush of one UPDATE each"""
+    db = SessionLocal()
+    try:
+        for item in orders:
+            player = db.query(Player).filter(Player.id == item["player_id"]).first()
+            if player:
+                player.auction_order = item["order"]
+        db.commit()
+    finally:
+        db.close()
+
+
+def check(order, rows):
+    by_id = {row["id"]: row for row in rows}
+    assert sorted(order) == sorted(by_id), "every player exactly once"
+    top = sorted((row for row in rows if row["rating"] is not None), key=lambda r: (-r["rating"], r["id"]))
+    assert order[:MARQUEE] == [row["id"] for row in top[:MARQUEE]], "marquee players first"
+    rest = [by_id[player_id] for player_id in order[MARQUEE:]]
+    totals = Counter(row["role"] for row in rest)
+    seen = Counter()
+    worst = 0.0
+    for position, row in enumerate(rest, 1):
+        seen[row["role"]] += 1
+        for role, total in totals.items():
+            worst = max(worst, abs(seen[role] - position * total / len(rest)))
+    assert worst <= 1.0, f"a role drifted {worst} players from its share"
+    same_block = sum(a["block_name"] == b["block_name"] for a, b in zip(rest, rest[1:]))
+    with engine.connect() as connection:
+        stored = dict(connection.execute(select(Player.id, Player.auction_order)).all())
+    assert [stored[player_id] for player_id in order] == list(range(1, len(order) + 1))
+    return round(worst, 2), same_block
+
+
+def timed(call):
+    with QueryCounter(engine) as queries:
+        started = time.perf_counter()
+        result = call()
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+    return result, elapsed, queries.count
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for players in args.players:
+            rows = seed(players)
+            orders = [{"player_id": row["id"], "order": players - i} for i, row in enumerate(rows)]
+            _, legacy_ms, legacy_queries = timed(lambda: legacy_set_order(orders))
+            response, bulk_ms, bulk_queries = timed(
+                lambda: client.post("/api/auction/set-auction-order", headers=headers, json=orders))
+            assert response.json()["updated_count"] == players, response.text
+
+            response, generate_ms, generate_queries = timed(lambda: client.post(
+                "/api/auction/generate-auction-order", headers=headers, json={"marquee_count": MARQUEE}))
+            assert response.status_code == 200, response.text
+            order = response.json()["order"]
+            drift, same_block = check(order, rows)
+            print(json.dumps({
+                "players": players,
+                "legacy_set_order_ms": legacy_ms, "legacy_set_order_statements": legacy_queries,
+                "set_order_ms": bulk_ms, "set_order_statements": bulk_queries,
+                "generate_ms": generate_ms, "generate_statements": generate_queries,
+                "max_role_drift": drift, "same_block_neighbours": same_block,
+                "random_same_block_neighbours": round((players - MARQUEE - 1) / len(BLOCKS)),
+            }))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
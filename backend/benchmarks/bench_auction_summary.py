@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Auction summary: build time, cached repeats and a cross-check.
+
+Seeds a temporary SQLite database with a finished auction:
+- N players, about two thirds sold across 12 teams;
+- 3 to 20 bids per sold lot, a few seconds apart.
+It then calls GET /api/analytics/summary in-process. It reports the cold
+build time, a repeated load (served from the response cache), a 304 for an
+unchanged ETag, and a rebuild after one more bid. Team spend, role counts
+and bid totals are checked against plain Python sums over the same rows.
+
+Usage (from the backend directory):
+    python benchmarks/bench_auction_summary.py
+    python benchmarks/bench_auction_summary.py --players 2000 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="gpl_summary_")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/summary.db"
+os.environ.setdefault("LOT_TIMER_SECONDS", "0")
+sys.path.insert(0, BACKEND_DIR)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+
+import main
+from database import engine
+from models import Auction, Bid, BlockName, Player, PlayerRole, PlayerStatus, Team
+from response_cache import response_cache
+
+TEAMS = 12
+ROLES = list(PlayerRole)
+BLOCKS = list(BlockName)
+
+
+def seed(players):
+    """A finished auction; returns the expected per-team spend, role counts and bid count"""
+    rng = random.Random(players)
+    with engine.begin() as connection:
+        for model in (Bid, Auction, Player, Team):
+            connection.execute(delete(model))
+        connection.execute(insert(Team), [{"id": t + 1, "name": f"Team {t}", "short_name": f"T{t:02d}"}
+                                          for t in range(TEAMS)])
+        connection.execute(insert(Auction), [{"id": 1, "status": "COMPLETED"}])
+        started = datetime(2025, 11, 2, 10, 0)
+        spend, roles, bids = defaultdict(float), Counter(), []
+        rows = []
+        for i in range(players):
+            sold = i % 3 != 2
+            team_id = rng.randrange(TEAMS) + 1 if sold else None
+            price = 10000 + 5000 * rng.randrange(0, 40) if sold else None
+            role = ROLES[i % len(ROLES)]
+            roles[role.value] += 1
+            rows.append({
+                "id": i + 1, "name": f"Player {i}", "email": f"p{i}@example.com", "role": role.name,
+                "status": (PlayerStatus.SOLD if sold else PlayerStatus.UNSOLD).name,
+                "block_name": BLOCKS[i % len(BLOCKS)].name if i % 7 else None,
+                "base_price": 10000, "sold_price": price, "team_id": team_id,
+            })
+            if sold:
+                spend[team_id] += price
+                lot_start = started + timedelta(minutes=i)
+                for b in range(rng.randint(3, 20)):
+                    bids.append({"auction_id": 1, "player_id": i + 1, "team_id": rng.randrange(TEAMS) + 1,
+                                 "bid_amount": 10000 + 5000 * b, "created_at": lot_start + timedelta(seconds=4 * b)})
+        connection.execute(insert(Player), rows)
+        for start in range(0, len(bids), 20000):
+            connection.execute(insert(Bid), bids[start:start + 20000])
+    return spend, roles, len(bids)
+
+
+def check(summary, spend, roles, bids):
+    for team in summary["teams"]:
+        assert team["spent"] == round(spend.get(team["team_id"], 0.0)), team
+    assert {row["role"]: row["registered"] for row in summary["roles"]} == dict(roles), summary["roles"]
+    assert summary["bid_wars"]["bids"] == bids, summary["bid_wars"]
+    assert summary["total_spent"] == round(sum(spend.values()))
+
+
+def timed(client, headers):
+    started = time.perf_counter()
+    response = client.get("/api/analytics/summary", headers=headers)
+    return response, round((time.perf_counter() - started) * 1000, 1)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[2000, 20000])
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.get("/api/analytics/summary", headers=headers)  # import pandas outside the timings
+        for players in args.players:
+            spend, roles, bids = seed(players)
+            response_cache.clear()
+            cold, cold_ms = timed(client, headers)
+            assert cold.status_code == 200, cold.text
+            check(cold.json(), spend, roles, bids)
+            cached, cached_ms = timed(client, headers)
+            assert cached.content == cold.content
+            revalidated, revalidated_ms = timed(client, dict(headers, **{"If-None-Match": cold.headers["etag"]}))
+            assert revalidated.status_code == 304
+            with engine.begin() as connection:
+                connection.execute(insert(Bid), [{"auction_id": 1, "player_id": 1, "team_id": 1, "bid_amount": 999999}])
+            rebuilt, rebuilt_ms = timed(client, headers)
+            assert rebuilt.json()["bid_wars"]["bids"] == bids + 1
+            print(json.dumps({"players": players, "bids": bids, "cold_ms": cold_ms, "cached_ms": cached_ms,
+                              "not_modified_ms": revalidated_ms, "after_new_bid_ms": rebuilt_ms,
+                              "bytes": len(cold.content)}))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
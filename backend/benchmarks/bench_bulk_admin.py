@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Bulk admin mutations: set-based reset and batch mark-available / mark-unsold
+against the old per-row loops.
+
+Seeds a temporary SQLite database with N players (half sold across 12
+teams, with 3 bids each) and a live auction, then for each operation runs
+the old way and the new way on identical data and compares the results:
+- reset: the previous reset_auction loop (load every player and team, set
+  attributes, commit) vs POST /api/auction/reset, with and without
+  archive_bids;
+- mark-unsold: one POST /api/players/{id}/mark-unsold per sold player vs
+  one POST /api/players/batch/mark-unsold;
+- mark-available: one POST /api/players/{id}/mark-available per sold player
+  vs one POST /api/players/batch/mark-available.
+Each reports time and SQL statements, and asserts that both ways leave the
+same players and team purses.
+
+Usage (from the backend directory):
+    python benchmarks/bench_bulk_admin.py
+    python benchmarks/bench_bulk_admin.py --players 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_bulk_')}/bulk.db"
+os.environ.setdefault("LOT_TIMER_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, insert, select
+
+import main
+from database import SessionLocal, engine
+from models import (Auction, AuctionStatus, Bid, BidArchive, Player, PlayerRole, PlayerStatus, Team)
+from feasibility import feasibility
+from leaderboards import leaderboards
+from purse import projection
+from query_counter import QueryCounter
+from response_cache import response_cache
+
+TEAMS = 12
+ROLES = list(PlayerRole)
+
+
+def seed(players):
+    """Half the players sold, the auction in progress; returns the sold player ids"""
+    rng = random.Random(players)
+    spend = [0.0] * TEAMS
+    count = [0] * TEAMS
+    rows, bids, sold = [], [], []
+    for i in range(players):
+        is_sold = i % 2 == 0
+        team = rng.randrange(TEAMS)
+        price = 10000 + 5000 * rng.randrange(0, 20)
+        rows.append({
+            "id": i + 1, "name": f"Player {i}", "email": f"p{i}@example.com", "role": ROLES[i % len(ROLES)].name,
+            "status": (PlayerStatus.SOLD if is_sold else PlayerStatus.AVAILABLE).name,
+            "registration_fee_paid": True,
+            "team_id": team + 1 if is_sold else None, "sold_price": price if is_sold else None,
+        })
+        if is_sold:
+            sold.append(i + 1)
+            spend[team] += price
+            count[team] += 1
+            bids.extend({"auction_id": 1, "player_id": i + 1, "team_id": rng.randrange(TEAMS) + 1,
+                         "bid_amount": 10000 + 5000 * b, "is_winning_bid": b == 2} for b in range(3))
+    with engine.begin() as connection:
+        for model in (BidArchive, Bid, Auction, Player, Team):
+            connection.execute(delete(model))
+        connection.execute(insert(Team), [{
+            "id": t + 1, "name": f"Team {t}", "short_name": f"T{t:02d}", "budget": 10000000,
+            "remaining_budget": 10000000 - spend[t], "players_count": count[t],
+        } for t in range(TEAMS)])
+        connection.execute(insert(Auction), [{"id": 1, "status": AuctionStatus.IN_PROGRESS.name,
+                                              "current_player_id": 2, "current_bid_amount": 10000}])
+        connection.execute(insert(Player), rows)
+        for start in range(0, len(bids), 20000):
+            connection.execute(insert(Bid), bids[start:start + 20000])
+    # Seeded behind the app's back: drop everything it keeps in memory
+    for view in (projection, leaderboards, feasibility):
+        view.invalidate()
+    response_cache.clear()
+    return sold
+
+
+def state():
+    with engine.connect() as connection:
+        players = connection.execute(select(Player.id, Player.status, Player.team_id, Player.sold_price)
+                                     .order_by(Player.id)).all()
+        teams = connection.execute(select(Team.id, Team.remaining_budget, Team.budget, Team.players_count)
+                                   .order_by(Team.id)).all()
+        auctions = connection.execute(select(Auction.id, Auction.status, Auction.current_player_id)).all()
+        bids = connection.execute(select(func.count()).select_from(Bid)).scalar()
+        archived = connection.execute(select(func.count()).select_from(BidArchive)).scalar()
+    return [tuple(row) for row in players], [tuple(row) for row in teams], [tuple(row) for row in auctions], bids, archived
+
+
+def legacy_reset():
+    """reset_auction before it became set-based"""
+    db = SessionLocal()
+    try:
+        for player in db.query(Player).all():
+            player.status = PlayerStatus.AVAILABLE
+            player.team_id = None
+            player.sold_price = None
+        for team in db.query(Team).all():
+            team.remaining_budget = 1000000
+            team.budget = 1000000
+            team.players_count = 0
+        for auction in db.query(Auction).filter(Auction.status == AuctionStatus.IN_PROGRESS).all():
+            auction.status = AuctionStatus.COMPLETED
+            auction.current_player_id = None
+            auction.current_bid_amount = None
+            auction.current_bidding_team_id = None
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed(call):
+    with QueryCounter(engine) as queries:
+        started = time.perf_counter()
+        call()
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+    return elapsed, queries.count
+
+
+def loop(client, headers, path, ids):
+    for player_id in ids:
+        response = client.post(f"/api/players/{player_id}/{path}", headers=headers)
+        assert response.status_code == 200, response.text
+
+
+def batch(client, headers, path, ids):
+    response = client.post(f"/api/players/batch/{path}", headers=headers, json={"player_ids": ids})
+    assert response.status_code == 200, response.text
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=10000)
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        results = {"players": args.players}
+
+        seed(args.players)
+        results["reset_loop_ms"], results["reset_loop_statements"] = timed(legacy_reset)
+        expected = state()
+        seed(args.players)
+        results["reset_ms"], results["reset_statements"] = timed(
+            lambda: client.post("/api/auction/reset", headers=headers).raise_for_status())
+        assert state() == expected, "set-based reset differs from the loop"
+        bids = expected[3]
+        seed(args.players)
+        results["reset_archive_ms"], results["reset_archive_statements"] = timed(
+            lambda: client.post("/api/auction/reset", headers=headers, params={"archive_bids": True}).raise_for_status())
+        archived = state()
+        assert archived[:3] == expected[:3] and archived[3:] == (0, bids), archived[3:]
+
+        for path in ("mark-unsold", "mark-available"):
+            sold = seed(args.players)
+            results[f"{path}_loop_ms"], results[f"{path}_loop_statements"] = timed(
+                lambda: loop(client, headers, path, sold))
+            expected = state()
+            sold = seed(args.players)
+            results[f"{path}_batch_ms"], results[f"{path}_batch_statements"] = timed(
+                lambda: batch(client, headers, path, sold))
+            assert state() == expected, f"batch {path} differs from the loop"
+        print(json.dumps(results))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
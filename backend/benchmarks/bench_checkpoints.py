@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Auction checkpoints: save and restore times, and a round-trip check.
+
+Seeds a temporary SQLite database with N players (half sold across 12
+teams, with 3 bids each) and an auction in progress, then:
+1. saves a checkpoint through POST /api/checkpoints/;
+2. changes everything a checkpoint covers through the API: bids and a
+   sale on the live lot, a batch mark-unsold, a new player registered,
+   and finally a reset that archives the bids;
+3. restores through POST /api/checkpoints/{name}/restore.
+It asserts that players, purses, auctions and bids are back exactly as
+saved (the late registration stays, available), and that the purses,
+leaderboards and pool served from memory match the restored database. It reports save and restore times.
+
+Usage (from the backend directory):
+    python benchmarks/bench_checkpoints.py
+    python benchmarks/bench_checkpoints.py --players 1000 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_checkpoints_')}/checkpoints.db"
+os.environ.setdefault("LOT_TIMER_SECONDS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+import main
+from bench_bulk_admin import seed, state
+from database import SessionLocal, engine
+from feasibility import SquadFeasibility, feasibility
+from leaderboards import Leaderboards, leaderboards
+from models import Checkpoint, CheckpointAuction, CheckpointBid, CheckpointPlayer, CheckpointTeam, PlayerStatus, Team
+from purse import PurseProjection, projection
+from query_counter import QueryCounter
+
+ROOM = 100000000
+
+
+def timed(call):
+    with QueryCounter(engine) as queries:
+        started = time.perf_counter()
+        response = call()
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+    assert response.status_code == 200, response.text
+    return response, elapsed, queries.count
+
+
+def scramble(client, headers, players, sold):
+    """Change players, purses, the auction and bids through the API"""
+    current = client.get("/api/auction/current").json()
+    amount = current["current_bid_amount"]
+    for team_id in (1, 2, 1):
+        response = client.post("/api/auction/bid", headers=headers, json={"team_id": team_id, "bid_amount": amount})
+        assert response.status_code == 200, response.text
+        amount += 5000
+    assert client.post("/api/auction/sold", headers=headers).status_code == 200
+    assert client.post("/api/players/batch/mark-unsold", headers=headers,
+                       json={"player_ids": sold[:50]}).status_code == 200
+    client.post("/api/registration/register", json={
+        "name": "Late Entry", "email": f"late{players}@example.com", "role": "bowler"
+    })
+    assert client.post("/api/auction/reset", headers=headers, params={"archive_bids": True}).status_code == 200
+
+
+def check_memory(client):
+    db = SessionLocal()
+    try:
+        purses = [purse.to_dict() for purse in PurseProjection().all(db)]
+        boards = Leaderboards().snapshot(db)
+        assert feasibility.pool(db) == SquadFeasibility().pool(db), "pool differs from a reload"
+    finally:
+        db.close()
+    assert client.get("/api/teams/purses").json() == purses, "purses differ from a reload"
+    assert client.get("/api/auction/leaderboards").json() == boards, "leaderboards differ from a reload"
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for players in args.players:
+            with engine.begin() as connection:
+                for model in (CheckpointBid, CheckpointAuction, CheckpointTeam, CheckpointPlayer, Checkpoint):
+                    connection.execute(delete(model))
+            sold = seed(players)
+            with engine.begin() as connection:
+                # Larger seeds overspend the default purse; leave room for the live lot's bids
+                connection.execute(update(Team).values(budget=Team.budget + ROOM,
+                                                       remaining_budget=Team.remaining_budget + ROOM))
+            for view in (projection, leaderboards, feasibility):
+                view.invalidate()
+            saved = state()
+            check_memory(client)
+
+            _, save_ms, save_statements = timed(
+                lambda: client.post("/api/checkpoints/", headers=headers, json={"name": "rehearsal"}))
+            duplicate = client.post("/api/checkpoints/", headers=headers, json={"name": "rehearsal"})
+            assert duplicate.status_code == 400, duplicate.text
+
+            scramble(client, headers, players, sold)
+            assert state()[:4] != saved[:4]
+
+            response, restore_ms, restore_statements = timed(
+                lambda: client.post("/api/checkpoints/rehearsal/restore", headers=headers))
+            restored = state()
+            late = [row for row in restored[0] if row[0] > players]
+            assert [row[1:] for row in late] == [(PlayerStatus.AVAILABLE, None, None)], late
+            restored = (restored[0][:players],) + restored[1:]
+            # The archived bids stay archived; everything else is as saved
+            for index, part in enumerate(("players", "teams", "auctions", "bids")):
+                if restored[index] != saved[index]:
+                    diff = set(restored[index]) ^ set(saved[index]) if index < 3 else (restored[index], saved[index])
+                    raise AssertionError(f"restored {part} differ: {sorted(diff, key=str)[:6] if index < 3 else diff}")
+            check_memory(client)
+            assert client.get("/api/auction/current").json()["status"] == "in_progress"
+
+            listed = client.get("/api/checkpoints/", headers=headers).json()
+            assert [c["name"] for c in listed] == ["rehearsal"] and listed[0]["bids"] == saved[3]
+            assert client.delete("/api/checkpoints/rehearsal", headers=headers).status_code == 200
+            print(json.dumps({
+                "players": players, "bids": saved[3],
+                "save_ms": save_ms, "save_statements": save_statements,
+                "restore_ms": restore_ms, "restore_statements": restore_statements,
+                "restored": response.json()["restored"],
+            }))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
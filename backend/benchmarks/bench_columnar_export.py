@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Columnar (Parquet / Arrow) export vs the Excel export, for analysis.
+
+Seeds a season: N players (as bench_export_stream does) and several bids
+per sold player. It starts uvicorn on that database and downloads
+/api/analytics/export in both formats, while polling /health to show that
+the export does not block the event loop. It then times loading the result
+the way a notebook would (pyarrow/pandas) against loading
+/api/players/export/excel with openpyxl into a DataFrame, and checks the column types.
+
+Usage (from the backend directory):
+    python benchmarks/bench_columnar_export.py
+    python benchmarks/bench_columnar_export.py --players 20000 --bids-per-sale 8
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_export_stream import BACKEND_DIR, seed, start_server
+
+
+def seed_bids(database_url, bids_per_sale):
+    script = f"""
+import sys
+sys.path.insert(0, {BACKEND_DIR!r})
+from sqlalchemy import create_engine, insert, select
+from models import Auction, Bid, Player
+engine = create_engine({database_url!r})
+with engine.begin() as connection:
+    connection.execute(insert(Auction), [{{"season": 2, "status": "COMPLETED"}}])
+    sold = connection.execute(select(Player.id, Player.team_id).where(Player.team_id.is_not(None))).all()
+    rows = [
+        {{"auction_id": 1, "player_id": player_id, "team_id": team_id, "bid_amount": 10000 + step * 5000,
+          "is_winning_bid": step == {bids_per_sale} - 1}}
+        for player_id, team_id in sold for step in range({bids_per_sale})
+    ]
+    for start in range(0, len(rows), 5000):
+        connection.execute(insert(Bid), rows[start:start + 5000])
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, check=True)
+
+
+async def download_while_polling(port, headers, path):
+    """Download path while timing /health every 20 ms; returns (seconds, body, worst /health ms)"""
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+        done = asyncio.Event()
+        worst = 0.0
+
+        async def poll():
+            nonlocal worst
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                worst = max(worst, time.perf_counter() - started)
+                await asyncio.sleep(0.02)
+
+        poller = asyncio.create_task(poll())
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+        assert response.status_code == 200, (response.status_code, response.text[:200])
+        return elapsed, response.content, worst * 1000
+
+
+def read_excel(body):
+    """What pandas.read_excel does, without its openpyxl version floor"""
+    import openpyxl
+    import pandas as pd
+    rows = openpyxl.load_workbook(io.BytesIO(body), read_only=True).active.iter_rows(values_only=True)
+    header = next(rows)
+    return pd.DataFrame(list(rows), columns=header)
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--bids-per-sale", type=int, default=6)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    workdir = tempfile.mkdtemp(prefix="gpl_columnar_")
+    database_url = f"sqlite:///{workdir}/season.db"
+    seed(database_url, args.players)
+    seed_bids(database_url, args.bids_per_sale)
+
+    server = start_server(args.port, database_url)
+    try:
+        token = httpx.post(f"http://127.0.0.1:{args.port}/api/auth/login",
+                           json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        # The first export pays for importing pyarrow; keep that out of the timings
+        httpx.get(f"http://127.0.0.1:{args.port}/api/analytics/export?tables=teams", headers=headers)
+        downloads = {}
+        for fmt in ("parquet", "arrow"):
+            elapsed, body, worst = asyncio.run(
+                download_while_polling(args.port, headers, f"/api/analytics/export?format={fmt}"))
+            downloads[fmt] = body
+            print(json.dumps({"export": fmt, "ms": round(elapsed * 1000, 1), "bytes": len(body),
+                              "worst_health_ms": round(worst, 1)}))
+        excel = httpx.get(f"http://127.0.0.1:{args.port}/api/players/export/excel", headers=headers, timeout=600).content
+    finally:
+        server.terminate()
+        server.wait()
+
+    archive = zipfile.ZipFile(io.BytesIO(downloads["parquet"]))
+    pq.read_table(io.BytesIO(archive.read("teams.parquet"))).to_pandas()
+    tables, parquet_ms = timed(lambda: {name: pq.read_table(io.BytesIO(archive.read(name))) for name in archive.namelist()})
+    frames, parquet_pandas_ms = timed(lambda: {name: table.to_pandas() for name, table in tables.items()})
+    arrow_archive = zipfile.ZipFile(io.BytesIO(downloads["arrow"]))
+    arrow_tables, arrow_ms = timed(lambda: {
+        name: pa.ipc.open_stream(arrow_archive.read(name)).read_all() for name in arrow_archive.namelist()})
+    excel_frame, excel_ms = timed(lambda: read_excel(excel))
+    print(json.dumps({
+        "load_all_tables_parquet_ms": parquet_ms,
+        "parquet_to_pandas_ms": parquet_pandas_ms,
+        "load_all_tables_arrow_ms": arrow_ms,
+        "load_players_excel_ms": excel_ms,
+        "rows": {name: table.num_rows for name, table in tables.items()},
+    }))
+
+    players = tables["players.parquet"]
+    assert players.num_rows == args.players == len(excel_frame)
+    assert players.schema.field("sold_price").type == pa.int64()
+    assert pa.types.is_dictionary(players.schema.field("role").type)
+    assert pa.types.is_timestamp(players.schema.field("created_at").type)
+    assert tables["bids.parquet"].schema.field("bid_amount").type == pa.int64()
+    assert arrow_tables["bids.arrow"].equals(tables["bids.parquet"])
+    print("OK: typed columns (money int64, enums dictionary-encoded, timestamps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Commits per second on the bid path under each database engine profile.
+
+Each iteration mirrors what POST /api/auction/bid writes: insert a Bid row,
+move the auction's current bid and bidding team, and commit. SQLite
+profiles run against a fresh temporary file; the "sqlite-defaults" row is
+a plain create_engine() with rollback-journal mode, for comparison.
+
+Usage (from the backend directory):
+    python benchmarks/bench_db_profiles.py
+    python benchmarks/bench_db_profiles.py --bids 5000 --postgres-url postgresql://localhost/gpl_bench
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, build_engine
+from models import Auction, AuctionStatus, Bid, Player, PlayerRole, PlayerStatus, Team
+
+
+def seed(SessionFactory):
+    db = SessionFactory()
+    teams = [Team(name=f"Team {i}", short_name=f"T{i}") for i in range(2)]
+    player = Player(name="Bench Player", email="bench@example.com", role=PlayerRole.BATSMAN, status=PlayerStatus.AVAILABLE)
+    db.add_all(teams + [player])
+    db.flush()
+    auction = Auction(status=AuctionStatus.IN_PROGRESS, current_player_id=player.id, current_bid_amount=player.base_price)
+    db.add(auction)
+    db.commit()
+    ids = auction.id, player.id, [team.id for team in teams]
+    db.close()
+    return ids
+
+
+def run_bid_path(engine, bids: int) -> float:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    auction_id, player_id, team_ids = seed(SessionFactory)
+
+    db = SessionFactory()
+    amount = 10000.0
+    start = time.perf_counter()
+    for i in range(bids):
+        team_id = team_ids[i % 2]
+        auction = db.get(Auction, auction_id)
+        db.add(Bid(auction_id=auction_id, player_id=player_id, team_id=team_id, bid_amount=amount))
+        auction.current_bid_amount = amount
+        auction.current_bidding_team_id = team_id
+        db.commit()
+        amount += 5000
+    elapsed = time.perf_counter() - start
+    db.close()
+    engine.dispose()
+    return bids / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bids", type=int, default=2000)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpl_bench_")
+    runs = [
+        ("sqlite-defaults", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+        ("dev-sqlite", lambda url: build_engine(url, "dev-sqlite")),
+        ("prod-sqlite", lambda url: build_engine(url, "prod-sqlite")),
+    ]
+
+    print(f"{'profile':<18}{'commits/s':>12}")
+    print("-" * 30)
+    for name, factory in runs:
+        url = f"sqlite:///{os.path.join(workdir, name)}.db"
+        print(f"{name:<18}{run_bid_path(factory(url), args.bids):>12.0f}")
+
+    if args.postgres_url:
+        print(f"{'prod-postgres':<18}{run_bid_path(build_engine(args.postgres_url, 'prod-postgres'), args.bids):>12.0f}")
+    else:
+        print(f"{'prod-postgres':<18}{'skipped':>12}  (pass --postgres-url)")
+
+
+if __name__ == "__main__":
+    main()
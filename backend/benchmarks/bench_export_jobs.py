@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Export jobs: build time, cached repeats and event-loop impact.
+
+Seeds N players (as bench_export_stream does) and starts uvicorn. It then:
+- runs a players export job, polling /health every 20 ms while it builds
+  in the worker process;
+- asks for the same export again, which should come back done and cached;
+- changes one team and checks that a new job is built.
+
+Usage (from the backend directory):
+    python benchmarks/bench_export_jobs.py
+    python benchmarks/bench_export_jobs.py --players 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_export_stream import seed, start_server
+
+
+async def run_job(client, headers):
+    """POST the players export and poll it to completion while timing /health"""
+    started = time.perf_counter()
+    job = (await client.post("/api/exports/players", headers=headers)).json()
+    submitted = time.perf_counter() - started
+    worst = 0.0
+    while job["status"] in ("queued", "running"):
+        ping = time.perf_counter()
+        await client.get("/health")
+        worst = max(worst, time.perf_counter() - ping)
+        await asyncio.sleep(0.02)
+        job = (await client.get(f"/api/exports/jobs/{job['job_id']}", headers=headers)).json()
+    return job, submitted, time.perf_counter() - started, worst
+
+
+async def main_async(port, players):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+        token = (await client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        job, submitted, total, worst = await run_job(client, headers)
+        assert job["status"] == "done", job
+        print(json.dumps({"run": "first", "players": players, "post_ms": round(submitted * 1000, 1),
+                          "done_ms": round(total * 1000, 1), "bytes": job["size"],
+                          "worst_health_ms": round(worst * 1000, 1)}))
+
+        started = time.perf_counter()
+        again = (await client.post("/api/exports/players", headers=headers)).json()
+        download = await client.get(again["download_url"], headers=headers)
+        elapsed = time.perf_counter() - started
+        assert again["job_id"] == job["job_id"] and again["status"] == "done"
+        assert len(download.content) == job["size"]
+        print(json.dumps({"run": "unchanged", "post_and_download_ms": round(elapsed * 1000, 1)}))
+
+        update = await client.put("/api/teams/1", json={"owner_name": "New owner"}, headers=headers)
+        assert update.status_code == 200, update.text
+        changed, _, total, _ = await run_job(client, headers)
+        assert changed["job_id"] != job["job_id"] and changed["status"] == "done"
+        print(json.dumps({"run": "after change", "done_ms": round(total * 1000, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=20000)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpl_jobs_")
+    database_url = f"sqlite:///{workdir}/jobs.db"
+    seed(database_url, args.players)
+    os.environ["EXPORT_CACHE_DIR"] = os.path.join(workdir, "exports")
+    server = start_server(args.port, database_url)
+    try:
+        asyncio.run(main_async(args.port, args.players))
+    finally:
+        server.terminate()
+        server.wait()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
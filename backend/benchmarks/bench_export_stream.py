@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Players XLSX export: time to first byte and peak server memory.
+
+Seeds a temporary SQLite database with N players (a third of them sold to
+teams). It starts uvicorn on that database and downloads
+/api/players/export/excel over a real socket. It reports:
+- time to first body byte;
+- total download time and size;
+- how far the server's peak RSS (VmHWM) rose above its resident size before
+  the export.
+Each size gets a fresh server so the peaks do not carry over. The workbook
+is then opened with openpyxl to check it holds every player.
+
+On SQLite the peak includes the engine profile's page cache and mmap window,
+which fill up during the first few tens of thousands of rows and then stay
+flat; they are bounded by the profile, not by the export.
+
+Usage (from the backend directory):
+    python benchmarks/bench_export_stream.py
+    python benchmarks/bench_export_stream.py --players 10000 100000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS = 12
+ROLES = ["batsman", "bowler", "all_rounder", "left_handed"]
+
+
+def seed(database_url, players):
+    """Create the schema and bulk insert rows in a child process, so this one stays small"""
+    script = f"""
+import sys
+sys.path.insert(0, {BACKEND_DIR!r})
+from sqlalchemy import create_engine, insert
+from database import Base
+from models import Player, Team
+engine = create_engine({database_url!r})
+Base.metadata.create_all(engine)
+with engine.begin() as connection:
+    connection.execute(insert(Team), [{{"name": f"Team {{i}}", "short_name": f"T{{i:02d}}"}} for i in range({TEAMS})])
+    sold = {players} // 3
+    rows = []
+    for i in range({players}):
+        team_id = i % {TEAMS} + 1 if i < sold else None
+        rows.append({{
+            "name": f"Player {{i}}", "email": f"player{{i}}@example.com", "phone": f"98{{i:08d}}",
+            "age": 20 + i % 25, "role": {ROLES!r}[i % 4].upper(), "status": "SOLD" if team_id else "AVAILABLE",
+            "team_id": team_id, "sold_price": 25000 if team_id else None, "registration_fee_paid": True,
+            "cricheroes_id": str(100000 + i), "player_image": "data:image/png;base64," + "A" * 2000,
+        }})
+        if len(rows) == 5000:
+            connection.execute(insert(Player), rows)
+            rows = []
+    if rows:
+        connection.execute(insert(Player), rows)
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, check=True)
+
+
+def start_server(port, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, LOT_TIMER_SECONDS="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    for _ in range(200):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit("Server did not start")
+
+
+def memory_kb(pid, field):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def download(port, token, path):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    started = time.perf_counter()
+    connection.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+    response = connection.getresponse()
+    assert response.status == 200, response.status
+    first = response.read(1)
+    first_byte = time.perf_counter() - started
+    body = first + response.read()
+    total = time.perf_counter() - started
+    connection.close()
+    return first_byte, total, body
+
+
+def count_rows(body):
+    import io
+    import openpyxl
+    workbook = openpyxl.load_workbook(io.BytesIO(body), read_only=True)
+    return workbook.active.max_row - 1 if workbook.active.max_row else sum(1 for _ in workbook.active.rows) - 1
+
+
+def run(players, port):
+    workdir = tempfile.mkdtemp(prefix="gpl_export_")
+    database_url = f"sqlite:///{workdir}/export.db"
+    seed(database_url, players)
+    server = start_server(port, database_url)
+    try:
+        token = httpx.post(f"http://127.0.0.1:{port}/api/auth/login",
+                           json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        # Warm up the export imports on a tiny route so they are not counted as growth
+        httpx.get(f"http://127.0.0.1:{port}/api/teams/export/excel", headers={"Authorization": f"Bearer {token}"})
+        before = memory_kb(server.pid, "VmRSS")
+        first_byte, total, body = download(port, token, "/api/players/export/excel")
+        peak = memory_kb(server.pid, "VmHWM")
+    finally:
+        server.terminate()
+        server.wait()
+    rows = count_rows(body)
+    assert rows == players, f"workbook has {rows} players, expected {players}"
+    return {
+        "players": players,
+        "ttfb_ms": round(first_byte * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "bytes": len(body),
+        "peak_rss_growth_mb": round((peak - before) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    for players in args.players:
+        print(json.dumps(run(players, args.port)))
+
+
+if __name__ == "__main__":
+    main()
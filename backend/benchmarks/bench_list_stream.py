@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Players list as JSON vs streamed NDJSON/CSV.
+
+Seeds N players (as bench_export_stream does) and fetches /api/players/
+through uvicorn in each format, on a fresh server each time. It reports the
+time to first byte, total time and peak server RSS growth. It then checks
+that:
+- NDJSON carries exactly the JSON list's items;
+- CSV has one row per player;
+- paging with limit and X-Next-Cursor visits every player once.
+
+Usage (from the backend directory):
+    python benchmarks/bench_list_stream.py
+    python benchmarks/bench_list_stream.py --players 100000 --page 25000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_export_stream import seed, start_server, memory_kb
+
+FORMATS = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def fetch(port, token, accept, params=None):
+    headers = {"Authorization": f"Bearer {token}", "Accept": accept}
+    started = time.perf_counter()
+    with httpx.stream("GET", f"http://127.0.0.1:{port}/api/players/", params=params, headers=headers, timeout=600) as response:
+        assert response.status_code == 200, response.status_code
+        chunks = response.iter_bytes()
+        first = next(chunks, b"")
+        first_byte = time.perf_counter() - started
+        body = first + b"".join(chunks)
+        next_cursor = response.headers.get("x-next-cursor")
+    return first_byte, time.perf_counter() - started, body, next_cursor
+
+
+def login(port):
+    return httpx.post(f"http://127.0.0.1:{port}/api/auth/login",
+                      json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--page", type=int, default=15000)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpl_list_")
+    database_url = f"sqlite:///{workdir}/list.db"
+    seed(database_url, args.players)
+
+    bodies = {}
+    for name, accept in FORMATS.items():
+        server = start_server(args.port, database_url)
+        try:
+            token = login(args.port)
+            before = memory_kb(server.pid, "VmRSS")
+            first_byte, total, body, _ = fetch(args.port, token, accept)
+            peak = memory_kb(server.pid, "VmHWM")
+        finally:
+            server.terminate()
+            server.wait()
+        bodies[name] = body
+        print(json.dumps({
+            "format": name,
+            "players": args.players,
+            "ttfb_ms": round(first_byte * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+            "bytes": len(body),
+            "peak_rss_growth_mb": round((peak - before) / 1024, 1),
+        }))
+
+    listed = sorted(json.loads(bodies["json"]), key=lambda item: item["id"])
+    streamed = [json.loads(line) for line in bodies["ndjson"].splitlines()]
+    assert streamed == listed, "NDJSON items differ from the JSON list"
+    rows = list(csv.DictReader(io.StringIO(bodies["csv"].decode("utf-8"))))
+    assert [int(row["id"]) for row in rows] == [item["id"] for item in listed], "CSV rows differ"
+
+    server = start_server(args.port, database_url)
+    try:
+        token = login(args.port)
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": args.page, **({"cursor": cursor} if cursor else {})}
+            _, _, body, cursor = fetch(args.port, token, FORMATS["ndjson"], params)
+            seen.extend(json.loads(line)["id"] for line in body.splitlines())
+            pages += 1
+            if cursor is None:
+                break
+    finally:
+        server.terminate()
+        server.wait()
+    assert seen == [item["id"] for item in listed], "cursor pages do not add up to the full list"
+    print(f"OK: NDJSON and CSV match JSON; {pages} cursor pages of {args.page} cover all {len(seen)} players")
+
+
+if __name__ == "__main__":
+    main()
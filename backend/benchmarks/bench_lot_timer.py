@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Lot timer checks and jitter benchmark.
+
+1. Drives LotTimer with a manual clock to check that resets push the
+   deadline out, cancelled lots never fire, and expiry fires exactly once.
+2. Measures how late real timers fire (actual - deadline) while the event
+   loop is kept busy with simulated bid broadcasts.
+
+Usage (from the backend directory):
+    python benchmarks/bench_lot_timer.py
+    python benchmarks/bench_lot_timer.py --auctions 50 --lots 20 --load-tasks 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_timer import LotTimer
+
+
+class ManualClock:
+    """Clock that only moves when advance() is called"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self.now + delay, future))
+        await future
+
+    async def advance(self, seconds):
+        self.now += seconds
+        for wake_at, future in list(self._sleepers):
+            if wake_at <= self.now and not future.done():
+                future.set_result(None)
+        self._sleepers = [(w, f) for w, f in self._sleepers if not f.done()]
+        # Let the timer task run its expiry callbacks
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+
+async def check_with_manual_clock():
+    clock = ManualClock()
+    expired = []
+
+    async def on_expire(auction_id, player_id):
+        expired.append((auction_id, player_id, clock.now))
+
+    timer = LotTimer(on_expire, clock=clock, wall_clock=lambda: 1000.0 + clock.now, sleep=clock.sleep)
+
+    message = timer.start(1, 10, 15)
+    assert message["deadline"] == 1015.0 and message["remaining_seconds"] == 15
+    await clock.advance(10)
+    assert expired == []
+
+    # A bid at t=10 resets the lot to t=25
+    timer.start(1, 10, 15)
+    await clock.advance(10)
+    assert expired == [], "reset lot expired at its old deadline"
+    await clock.advance(5)
+    assert expired == [(1, 10, 25.0)], expired
+
+    # Cancelled lots never fire, other auctions are unaffected
+    timer.start(2, 20, 5)
+    timer.start(3, 30, 8)
+    timer.cancel(2)
+    await clock.advance(10)
+    assert expired[1:] == [(3, 30, 35.0)], expired
+    assert timer.remaining(3) is None
+
+    await timer.stop()
+    print("manual clock checks: OK")
+
+
+async def measure_jitter(auctions, lots, load_tasks, duration):
+    lateness = []
+    deadlines = {}
+    remaining = {"lots": auctions * lots}
+    done = asyncio.Event()
+
+    async def on_expire(auction_id, player_id):
+        lateness.append(time.monotonic() - deadlines[(auction_id, player_id)])
+        remaining["lots"] -= 1
+        if player_id < lots:
+            schedule(auction_id, player_id + 1)
+        if remaining["lots"] == 0:
+            done.set()
+
+    timer = LotTimer(on_expire)
+
+    def schedule(auction_id, player_id):
+        seconds = duration * random.uniform(0.5, 1.5)
+        timer.start(auction_id, player_id, seconds)
+        deadlines[(auction_id, player_id)] = time.monotonic() + seconds
+
+    async def broadcast_load():
+        payload = {"type": "new_bid", "data": {"team_name": "x" * 40, "bid_amount": 10000, "timestamp": "now"}}
+        while not done.is_set():
+            for _ in range(20):
+                json.dumps(payload)
+            await asyncio.sleep(0)
+
+    load = [asyncio.create_task(broadcast_load()) for _ in range(load_tasks)]
+    for auction_id in range(1, auctions + 1):
+        schedule(auction_id, 1)
+    await done.wait()
+    for task in load:
+        task.cancel()
+    await timer.stop()
+
+    lateness_ms = sorted(value * 1000 for value in lateness)
+    p99 = lateness_ms[int(len(lateness_ms) * 0.99) - 1]
+    print(
+        f"{len(lateness_ms)} expiries, {auctions} auctions, {load_tasks} load tasks: "
+        f"median {statistics.median(lateness_ms):.2f} ms, p99 {p99:.2f} ms, max {lateness_ms[-1]:.2f} ms late"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auctions", type=int, default=10)
+    parser.add_argument("--lots", type=int, default=10)
+    parser.add_argument("--load-tasks", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=0.2, help="Mean lot duration in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(check_with_manual_clock())
+    asyncio.run(measure_jitter(args.auctions, args.lots, 0, args.duration))
+    asyncio.run(measure_jitter(args.auctions, args.lots, args.load_tasks, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Owner registrations workbook: rows per second and output parity.
+
+Seeds a temporary SQLite database with N owner registrations and builds the
+workbook with write_owner_registrations_export. It reports rows per second
+and the peak Python memory of the build (traced in a separate run, so
+tracing does not slow the timed one).
+The same registrations then go through the previous cell-by-cell builder,
+kept below for comparison. Its width loop used column[0].column_letter, which
+fails on merged cells; the copy here fixes that one line and changes nothing
+else. The two workbooks must match cell for cell: values, fonts, fills,
+alignment, merged ranges and column widths.
+
+Usage (from the backend directory):
+    python benchmarks/bench_owner_workbook.py
+    python benchmarks/bench_owner_workbook.py --rows 1000 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="gpl_owner_")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/owners.db"
+sys.path.insert(0, BACKEND_DIR)
+
+import openpyxl
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from sqlalchemy import delete, insert
+
+from database import Base, SessionLocal, engine
+from models import BlockName, OwnerRegistration
+from routers.owner_registration import write_owner_registrations_export
+
+BLOCKS = list(BlockName)
+
+
+def seed(rows):
+    Base.metadata.create_all(engine)
+    started = datetime(2025, 10, 1, 9, 0)
+    with engine.begin() as connection:
+        connection.execute(delete(OwnerRegistration))
+        connection.execute(insert(OwnerRegistration), [{
+            "owner_full_name": f"Owner {i}",
+            "owner_block": BLOCKS[i % len(BLOCKS)],
+            "owner_unit_number": str(100 + i % 900),
+            "co_owner_full_name": f"Co-owner with a longer name {i}" if i % 3 else None,
+            "co_owner_block": BLOCKS[(i + 1) % len(BLOCKS)] if i % 3 else None,
+            "co_owner_unit_number": str(200 + i % 700) if i % 3 else None,
+            "interested_to_buy": i % 2 == 0,
+            "team_price": 15000.0,
+            "created_at": started + timedelta(minutes=i),
+        } for i in range(rows)])
+
+
+def legacy_workbook(path):
+    """The previous builder, with only the column letter lookup fixed"""
+    db = SessionLocal()
+    registrations = db.query(OwnerRegistration).order_by(OwnerRegistration.created_at.desc()).all()
+    db.close()
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Owner Registrations"
+    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    ws.merge_cells('A1:I1')
+    event_cell = ws['A1']
+    event_cell.value = "Galaxia Premier League Season 2 - Owner Registrations"
+    event_cell.font = Font(bold=True, size=16, color="4F81BD")
+    event_cell.alignment = Alignment(horizontal="center", vertical="center")
+    ws.merge_cells('A2:I2')
+    event_details = ws['A2']
+    event_details.value = "Tournament: 10-11 January 2026 | Auction: 2nd November 2025 at Club Stella | Team Price: ₹15,000"
+    event_details.font = Font(size=11, italic=True)
+    event_details.alignment = Alignment(horizontal="center", vertical="center")
+    ws.append([])
+    ws.append(["ID", "Owner Full Name", "Owner Block", "Owner Unit", "Co-Owner Full Name", "Co-Owner Block",
+               "Co-Owner Unit", "Interested to Buy", "Team Price (INR)", "Registration Date"])
+    for cell in ws[4]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+    for reg in registrations:
+        ws.append([
+            reg.id,
+            reg.owner_full_name,
+            reg.owner_block.value if reg.owner_block else "",
+            reg.owner_unit_number,
+            reg.co_owner_full_name if reg.co_owner_full_name else "N/A",
+            reg.co_owner_block.value if reg.co_owner_block else "N/A",
+            reg.co_owner_unit_number if reg.co_owner_unit_number else "N/A",
+            "Yes" if reg.interested_to_buy else "No",
+            f"₹{reg.team_price:,.0f}",
+            reg.created_at.strftime("%d-%b-%Y %I:%M %p")
+        ])
+    for column in ws.columns:
+        max_length = 0
+        column_letter = get_column_letter(column[0].column)
+        for cell in column:
+            if len(str(cell.value)) > max_length:
+                max_length = len(str(cell.value))
+        ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
+    last_row = ws.max_row + 2
+    ws.merge_cells(f'A{last_row}:B{last_row}')
+    summary_cell = ws[f'A{last_row}']
+    summary_cell.value = "Total Registrations:"
+    summary_cell.font = Font(bold=True, size=11)
+    summary_cell.alignment = Alignment(horizontal="right")
+    ws[f'C{last_row}'] = len(registrations)
+    ws[f'C{last_row}'].font = Font(bold=True, size=11)
+    interested_count = sum(1 for reg in registrations if reg.interested_to_buy)
+    last_row += 1
+    ws.merge_cells(f'A{last_row}:B{last_row}')
+    interested_cell = ws[f'A{last_row}']
+    interested_cell.value = "Interested to Buy:"
+    interested_cell.font = Font(bold=True, size=11, color="00B050")
+    interested_cell.alignment = Alignment(horizontal="right")
+    ws[f'C{last_row}'] = interested_count
+    ws[f'C{last_row}'].font = Font(bold=True, size=11, color="00B050")
+    wb.save(path)
+
+
+def cell_format(cell):
+    font, fill, alignment = cell.font, cell.fill, cell.alignment
+    return (cell.value, font.b, font.i, font.sz, font.color.rgb if font.color else None,
+            fill.fill_type, fill.fgColor.rgb, alignment.horizontal, alignment.vertical)
+
+
+def compare(new_path, legacy_path):
+    new, legacy = openpyxl.load_workbook(new_path).active, openpyxl.load_workbook(legacy_path).active
+    assert new.title == legacy.title
+    assert sorted(map(str, new.merged_cells.ranges)) == sorted(map(str, legacy.merged_cells.ranges))
+    assert (new.max_row, new.max_column) == (legacy.max_row, legacy.max_column), (new.max_row, legacy.max_row)
+    for column in range(1, legacy.max_column + 1):
+        letter = get_column_letter(column)
+        assert new.column_dimensions[letter].width == legacy.column_dimensions[letter].width, letter
+    for new_row, legacy_row in zip(new.iter_rows(), legacy.iter_rows()):
+        for new_cell, legacy_cell in zip(new_row, legacy_row):
+            assert cell_format(new_cell) == cell_format(legacy_cell), (new_cell.coordinate, cell_format(new_cell))
+
+
+def timed(build, path):
+    started = time.perf_counter()
+    build(path)
+    return time.perf_counter() - started
+
+
+def peak_mb(build, path):
+    tracemalloc.start()
+    try:
+        build(path)
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 20000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        seed(rows)
+        new_path, legacy_path = os.path.join(WORKDIR, "new.xlsx"), os.path.join(WORKDIR, "legacy.xlsx")
+        new_seconds = timed(write_owner_registrations_export, new_path)
+        legacy_seconds = timed(legacy_workbook, legacy_path)
+        compare(new_path, legacy_path)
+        print(json.dumps({
+            "rows": rows,
+            "rows_per_second": round(rows / new_seconds),
+            "legacy_rows_per_second": round(rows / legacy_seconds),
+            "speedup": round(legacy_seconds / new_seconds, 2),
+            "peak_mb": peak_mb(write_owner_registrations_export, new_path),
+            "legacy_peak_mb": peak_mb(legacy_workbook, legacy_path),
+            "bytes": os.path.getsize(new_path),
+        }))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Bulk player import against one POST /api/registration/register per player.
+
+Builds N registration rows with a few bad ones mixed in (an invalid email,
+an unknown role, a flat number with letters, an email repeated in the file
+and one already registered), then on a fresh set of players each time:
+- registers every row through POST /api/registration/register;
+- imports the same rows as a CSV through POST /api/players/import;
+- imports them as an XLSX.
+It asserts that each import rejects exactly the bad rows, with their row
+numbers, leaves the same players as registering them one by one, and
+that the squad pool in memory takes the new players in. It reports time
+and SQL statements for each.
+
+Usage (from the backend directory):
+    python benchmarks/bench_player_import.py
+    python benchmarks/bench_player_import.py --players 5000
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_import_')}/import.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+import main
+from database import SessionLocal, engine
+from feasibility import SquadFeasibility, feasibility
+from lazy_imports import get_openpyxl
+from models import Bid, Player
+from query_counter import QueryCounter
+
+COLUMNS = ["Name", "Email", "Phone", "Age", "Role", "Batting Style", "Block Name", "Flat Number", "Jersey Size", "League"]
+ROLES = ["batsman", "bowler", "all_rounder", "left_handed"]
+COMPARED = (Player.name, Player.email, Player.phone, Player.age, Player.role, Player.batting_style,
+            Player.block_name, Player.flat_number, Player.jersey_size, Player.league,
+            Player.status, Player.registration_fee_paid, Player.has_cricheroes_data)
+
+
+def build_rows(players):
+    """Registration rows, and the 1-based file rows (header is row 1) that must be rejected"""
+    rows = [[f"Player {i}", f"player{i}@example.com", str(9000000000 + i), str(18 + i % 40),
+             ROLES[i % len(ROLES)], "right_handed" if i % 3 else "left_handed", None,
+             str(100 + i % 900), "L", "Premier" if i % 2 else None] for i in range(players)]
+    bad = {5: (1, "not-an-email"), 17: (4, "keeper"), 29: (7, "12B"), 41: (1, "player3@example.com"),
+           53: (1, "existing@example.com")}
+    for index, (column, value) in bad.items():
+        rows[index][column] = value
+    return rows, sorted(index + 2 for index in bad)
+
+
+def reset_players():
+    with engine.begin() as connection:
+        connection.execute(delete(Bid))
+        connection.execute(delete(Player))
+        connection.execute(Player.__table__.insert().values(
+            name="Existing", email="existing@example.com", role="BATSMAN", status="AVAILABLE"))
+
+
+def players_state():
+    with engine.connect() as connection:
+        return sorted(tuple(row) for row in connection.execute(select(*COMPARED)))
+
+
+def as_csv(rows):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return text.getvalue().encode()
+
+
+def as_xlsx(rows):
+    workbook = get_openpyxl().Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+    for row in rows:
+        # Numbers as numbers, as a spreadsheet would hold them
+        sheet.append([int(value) if value and value.isdigit() else value for value in row])
+    data = io.BytesIO()
+    workbook.save(data)
+    return data.getvalue()
+
+
+def register_all(client, rows):
+    for row in rows:
+        body = {key: value for key, value in zip(
+            ["name", "email", "phone", "age", "role", "batting_style", "block_name", "flat_number",
+             "jersey_size", "league"], row) if value is not None}
+        client.post("/api/registration/register", json=body)
+
+
+def timed(call):
+    with QueryCounter(engine) as queries:
+        started = time.perf_counter()
+        result = call()
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+    return result, elapsed, queries.count
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2000)
+    args = parser.parse_args()
+    rows, rejected = build_rows(args.players)
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        results = {"players": args.players}
+
+        reset_players()
+        # register_player prints a debug block per call
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, results["register_ms"], results["register_statements"] = timed(lambda: register_all(client, rows))
+        expected = players_state()
+
+        for kind, data in (("csv", as_csv(rows)), ("xlsx", as_xlsx(rows))):
+            reset_players()
+            response, results[f"{kind}_ms"], results[f"{kind}_statements"] = timed(lambda: client.post(
+                "/api/players/import", headers=headers, files={"file": (f"players.{kind}", data)}))
+            assert response.status_code == 200, response.text
+            report = response.json()
+            assert [error["row"] for error in report["errors"]] == rejected, report["errors"]
+            assert report["imported"] == args.players - len(rejected) and report["rows"] == args.players, report
+            assert players_state() == expected, f"{kind} import differs from registering one by one"
+            db = SessionLocal()
+            try:
+                assert feasibility.pool(db) == SquadFeasibility().pool(db), f"{kind} import: pool differs from a reload"
+            finally:
+                db.close()
+
+        bad = client.post("/api/players/import", headers=headers,
+                          files={"file": ("players.csv", b"Name,Phone\nA,1\n")})
+        assert bad.status_code == 400 and "email" in bad.json()["detail"], bad.text
+        assert client.post("/api/players/import", headers=headers,
+                           files={"file": ("players.txt", b"")}).status_code == 400
+        print(json.dumps(results))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Player ratings: load, vectorized compute and persist, with a cross-check.
+
+Seeds a temporary SQLite database with N players with random CricHeroes
+stats (about one in ten has never played). It times loading the stats,
+computing every rating in one NumPy pass and a plain per-player Python loop
+doing the same arithmetic, and checks that both agree. It then calls
+POST /api/players/ratings/recompute twice: the first run writes every
+rating, the second finds nothing changed and writes nothing.
+
+Usage (from the backend directory):
+    python benchmarks/bench_player_ratings.py
+    python benchmarks/bench_player_ratings.py --players 10000 100000
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="gpl_ratings_")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/ratings.db"
+os.environ.setdefault("LOT_TIMER_SECONDS", "0")
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, insert, select
+
+import main
+from database import SessionLocal, engine
+from models import Bid, Player, PlayerRole
+from player_ratings import (DEFAULT_WEIGHTS, FEATURES, RATING_DECIMALS, ROLES, SCALE_PERCENTILE,
+                            compute_ratings, load_stats)
+
+
+def seed(players):
+    rng = random.Random(players)
+    rows = []
+    for i in range(players):
+        matches = 0 if i % 10 == 0 else rng.randint(1, 150)
+        wickets = rng.randint(0, 2 * matches) if matches else 0
+        rows.append({
+            "id": i + 1, "name": f"Player {i}", "email": f"p{i}@example.com",
+            "role": ROLES[i % len(ROLES)].name,
+            "matches_played": matches,
+            "runs_scored": rng.randint(0, 60 * matches) if matches else 0,
+            "wickets_taken": wickets,
+            "batting_average": round(rng.uniform(0, 60), 2) if matches else 0.0,
+            "bowling_average": round(rng.uniform(8, 60), 2) if wickets else 0.0,
+            "strike_rate": round(rng.uniform(0, 220), 2) if matches else 0.0,
+        })
+    with engine.begin() as connection:
+        connection.execute(delete(Bid))
+        connection.execute(delete(Player))
+        for start in range(0, len(rows), 20000):
+            connection.execute(insert(Player), rows[start:start + 20000])
+
+
+def python_ratings(role_codes, stats):
+    """The same ratings one player at a time; only the percentiles come from numpy"""
+    rows = stats.tolist()
+    played = [row for row in rows if row[0] > 0]
+
+    def top(values):
+        values = [v for v in values if v > 0]
+        return float(np.percentile(values, SCALE_PERCENTILE)) if values else 0.0
+
+    tops = {
+        "runs_per_match": top([r[1] / r[0] for r in played if r[1] > 0]),
+        "batting_average": top([r[3] for r in played]),
+        "strike_rate": top([r[5] for r in played]),
+        "wickets_per_match": top([r[2] / r[0] for r in played if r[2] > 0]),
+        "experience": top([math.log1p(r[0]) for r in played]),
+    }
+    bowled = [r[4] for r in played if r[4] > 0 and r[2] > 0]
+    best = float(np.percentile(bowled, 100 - SCALE_PERCENTILE)) if bowled else 0.0
+
+    def scaled(value, name):
+        return min(max(value / tops[name], 0.0), 1.0) if tops[name] > 0 else 0.0
+
+    ratings = []
+    for code, (matches, runs, wickets, batting, bowling, strike) in zip(role_codes.tolist(), rows):
+        if matches <= 0:
+            ratings.append(None)
+            continue
+        features = {
+            "runs_per_match": scaled(runs / matches, "runs_per_match"),
+            "batting_average": scaled(batting, "batting_average"),
+            "strike_rate": scaled(strike, "strike_rate"),
+            "wickets_per_match": scaled(wickets / matches, "wickets_per_match"),
+            "bowling_average": min(max(best / bowling, 0.0), 1.0) if bowling > 0 and wickets > 0 else 0.0,
+            "experience": scaled(math.log1p(matches), "experience"),
+        }
+        weights = DEFAULT_WEIGHTS[ROLES[code].value]
+        total = sum(weights.values())
+        score = sum(features[name] * weights.get(name, 0.0) for name in FEATURES) / total * 100
+        ratings.append(round(score, RATING_DECIMALS))
+    return ratings
+
+
+def ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for players in args.players:
+            seed(players)
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                ids, current, role_codes, stats = load_stats(db)
+                load_ms = ms(started)
+            finally:
+                db.close()
+            started = time.perf_counter()
+            ratings = compute_ratings(role_codes, stats)
+            compute_ms = ms(started)
+            started = time.perf_counter()
+            expected = python_ratings(role_codes, stats)
+            loop_ms = ms(started)
+            for got, want in zip(ratings.tolist(), expected):
+                if want is None:
+                    assert math.isnan(got), got
+                else:
+                    # Rounding to one decimal can land either side of a .x5 boundary
+                    assert abs(got - want) <= 0.1 + 1e-9, (got, want)
+
+            started = time.perf_counter()
+            first = client.post("/api/players/ratings/recompute", headers=headers)
+            first_ms = ms(started)
+            assert first.status_code == 200, first.text
+            assert first.json()["updated"] == first.json()["rated"] == int(np.count_nonzero(~np.isnan(ratings)))
+            started = time.perf_counter()
+            again = client.post("/api/players/ratings/recompute", headers=headers)
+            again_ms = ms(started)
+            assert again.json()["updated"] == 0, again.json()
+            with engine.connect() as connection:
+                stored = connection.execute(select(func.count()).where(Player.rating.isnot(None))).scalar()
+            assert stored == first.json()["rated"]
+            print(json.dumps({"players": players, "load_ms": load_ms, "vectorized_ms": compute_ms,
+                              "python_loop_ms": loop_ms, "recompute_ms": first_ms,
+                              "unchanged_recompute_ms": again_ms, "stats": first.json()}))
+
+        bad = client.post("/api/players/ratings/recompute", headers=headers,
+                          json={"weights": {PlayerRole.BOWLER.value: {"catches": 1}}})
+        assert bad.status_code == 400, bad.text
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_bench()
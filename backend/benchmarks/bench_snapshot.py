@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Reconnect storm benchmark: what N spectators cost when they reload the live page.
+
+Compares, per client:
+  - the old page load: /auction/current + /teams/
+  - GET /auction/snapshot
+  - GET /auction/snapshot with If-None-Match (nothing changed since last load)
+
+The current player and teams get realistic base64 image blobs, since those
+dominate the old payloads.
+
+Usage (from the backend directory):
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py --clients 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_snapshot_')}/snapshot.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import engine, SessionLocal
+from models import Player, Team
+from query_counter import QueryCounter
+
+IMAGE_BLOB = "data:image/png;base64," + "A" * 60000
+
+
+def seed(client):
+    token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/teams/initialize")
+    for index in range(20):
+        client.post("/api/registration/register", json={
+            "name": f"Player {index}", "email": f"player{index}@example.com", "role": "batsman"
+        })
+    db = SessionLocal()
+    db.query(Team).update({"team_logo": IMAGE_BLOB})
+    db.query(Player).update({"player_image": IMAGE_BLOB})
+    db.commit()
+    db.close()
+    client.post("/api/auction/start", headers=headers)
+    amount = 10000
+    for index in range(10):
+        client.post("/api/auction/bid", json={"team_id": 1 + index % 2, "bid_amount": amount}, headers=headers)
+        amount += 5000
+
+
+def storm(client, clients, requests):
+    total_bytes = 0
+    with QueryCounter(engine) as queries:
+        start = time.perf_counter()
+        for _ in range(clients):
+            for path, headers in requests:
+                total_bytes += len(client.get(path, headers=headers).content)
+        elapsed = time.perf_counter() - start
+    return elapsed, total_bytes, queries.count
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        seed(client)
+        etag = client.get("/api/auction/snapshot").headers["etag"]
+        scenarios = [
+            ("/current + /teams/", [("/api/auction/current", {}), ("/api/teams/", {})]),
+            ("/snapshot", [("/api/auction/snapshot", {})]),
+            ("/snapshot, If-None-Match", [("/api/auction/snapshot", {"If-None-Match": etag})]),
+        ]
+        print(f"{args.clients} reconnecting clients")
+        print(f"{'scenario':<28} {'time':>8} {'per client':>11} {'bytes/client':>13} {'SQL total':>10}")
+        for name, requests in scenarios:
+            elapsed, total_bytes, statements = storm(client, args.clients, requests)
+            print(
+                f"{name:<28} {elapsed:>7.2f}s {elapsed / args.clients * 1000:>9.2f}ms "
+                f"{total_bytes // args.clients:>13} {statements:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main_bench()
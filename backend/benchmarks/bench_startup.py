@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark and regression guard.
+
+Imports `main` in fresh interpreters, reports the median wall time and
+fails if it exceeds the budget or if any heavy dependency that should be
+lazily loaded was imported at startup.
+
+Usage (from the backend directory):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --budget-ms 1200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just by importing the app
+LAZY_MODULES = ["pandas", "openpyxl", "bs4", "requests", "razorpay", "numpy", "pyarrow"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed_ms": elapsed * 1000,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit("Importing main failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "1500")))
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    timings = [sample["elapsed_ms"] for sample in samples]
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+    median_ms = statistics.median(timings)
+
+    print(f"import main: median {median_ms:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms ({args.runs} runs)")
+    print(f"heavy modules loaded at startup: {', '.join(loaded) or 'none'}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: {', '.join(loaded)} should be loaded lazily")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: median startup {median_ms:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
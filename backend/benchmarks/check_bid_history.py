@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Bid history query-count checks.
+
+Seeds a temporary SQLite database and asserts that:
+1. The history of the player on the block is served from memory, after one
+   statement that checks the tail ends at the player's newest bid.
+2. A closed lot's history costs the same handful of statements whether it
+   has 5 bids or 60 (team and player are eager loaded, not one query per bid).
+3. Cursor pages join up to the full history, and the last page has no
+   X-Next-Cursor header.
+
+Usage (from the backend directory):
+    python benchmarks/check_bid_history.py
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_history_')}/history.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import engine
+from query_counter import QueryCounter
+
+BID_STEP = 5000
+
+
+def bid_up(client, headers, bids):
+    amount = client.get("/api/auction/current").json()["current_bid_amount"]
+    for index in range(bids):
+        response = client.post("/api/auction/bid", json={"team_id": 1 + index % 2, "bid_amount": amount}, headers=headers)
+        assert response.status_code == 200, response.text
+        amount += BID_STEP
+
+
+def history(client, player_id, **params):
+    response = client.get(f"/api/auction/history/{player_id}", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def main_check():
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/api/teams/initialize")
+        for index in range(3):
+            client.post("/api/registration/register", json={
+                "name": f"Player {index}", "email": f"player{index}@example.com", "role": "batsman"
+            })
+        client.post("/api/auction/start", headers=headers)
+
+        statement_counts = {}
+        for bids in (5, 60):
+            player_id = client.get("/api/auction/current").json()["current_player_id"]
+            bid_up(client, headers, bids)
+
+            with QueryCounter(engine) as queries:
+                live = history(client, player_id).json()
+            assert len(live) == bids, len(live)
+            assert queries.count == 1, f"live lot history ran {queries.count} statements"
+
+            with QueryCounter(engine) as queries:
+                tail_page = history(client, player_id, cursor=live[-3]["id"]).json()
+            assert [bid["id"] for bid in tail_page] == [bid["id"] for bid in live[-2:]]
+            assert queries.count == 1
+
+            assert client.post("/api/auction/sold", headers=headers).status_code == 200
+
+            with QueryCounter(engine) as queries:
+                closed = history(client, player_id).json()
+            assert [bid["id"] for bid in closed] == [bid["id"] for bid in live]
+            assert closed[-1]["is_winning_bid"] and closed[-1]["team"]["id"] == live[-1]["team_id"]
+            statement_counts[bids] = queries.count
+            print(f"{bids:>3} bids: live lot 1 statement, closed lot {queries.count} statements")
+
+        assert statement_counts[5] == statement_counts[60], statement_counts
+
+        # Page through the 60-bid lot 25 at a time
+        pages, cursor = [], None
+        while True:
+            response = history(client, player_id, limit=25, **({"cursor": cursor} if cursor else {}))
+            pages.append(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        assert [len(page) for page in pages] == [25, 25, 10], [len(page) for page in pages]
+        assert [bid["id"] for page in pages for bid in page] == [bid["id"] for bid in closed]
+        print("cursor pages: 25 + 25 + 10, joined = full history")
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
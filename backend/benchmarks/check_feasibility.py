@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Squad feasibility checks.
+
+Seeds a temporary SQLite database with 12 teams and just enough players to
+fill every team's minimum squad, some with higher base prices set through
+PUT /api/players/{id}. It then runs lots through the API (sales, unsold
+lots, refunds with mark-unsold / mark-available, base price edits, a
+deleted player). After every step it asserts that:
+1. The incrementally maintained pool equals a pool reloaded from the
+   database.
+2. Every team's guaranteed max bid equals a brute-force answer over the
+   sorted list of base prices left.
+3. GET /api/teams/feasibility runs no SQL.
+4. The bid cap, read from the database, matches brute force too, including
+   after a sale another worker committed behind this process's caches.
+It also checks that a bid above the guaranteed limit, but within the plain
+reserve rule, is refused, and times the limits for 12 and 1,200 teams.
+
+Usage (from the backend directory):
+    python benchmarks/check_feasibility.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_feasibility_')}/feasibility.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+import main
+from database import SessionLocal, engine
+from feasibility import SquadFeasibility, feasibility, guaranteed_max_bid
+from models import Player, PlayerStatus, Team
+from purse import BASE_PLAYER_PRICE, MINIMUM_PLAYERS, max_bid_for, projection
+from query_counter import QueryCounter
+
+TEAMS = 12
+PLAYERS = TEAMS * MINIMUM_PLAYERS + 8
+ROLES = ["batsman", "bowler", "all_rounder", "left_handed"]
+PRICES = [10000, 20000, 50000]
+
+
+def brute_force(remaining_budget, players_count, others_needed, prices):
+    """Take out the lot on the block and the others' minimums as the cheapest, then price this team's slots"""
+    needed = MINIMUM_PLAYERS - players_count
+    limit = max_bid_for(remaining_budget, players_count)
+    if needed <= 0:
+        return limit, True
+    left = prices[others_needed + 1:]
+    if len(left) < needed - 1:
+        return limit, False
+    return min(limit, max(remaining_budget - sum(left[:needed - 1]), BASE_PLAYER_PRICE)), True
+
+
+def expected_limits(db):
+    """team id -> brute-force (guaranteed max bid, fillable) from the database"""
+    prices = sorted(
+        BASE_PLAYER_PRICE if price is None else price for price in db.scalars(
+            select(Player.base_price).where(Player.status == PlayerStatus.AVAILABLE,
+                                            Player.registration_fee_paid == True))
+    )
+    teams = {team.id: team for team in db.query(Team)}
+    needed = {team_id: max(0, MINIMUM_PLAYERS - team.players_count) for team_id, team in teams.items()}
+    return {
+        team.id: brute_force(team.remaining_budget, team.players_count,
+                             sum(needed.values()) - needed[team.id], prices)
+        for team in teams.values()
+    }, teams, len(prices)
+
+
+def check_caps(db, step, expected, teams):
+    """The bid cap reads the database, whatever the caches hold"""
+    for team_id, (limit, _) in expected.items():
+        assert feasibility.max_bid(db, teams[team_id]) == limit, (step, team_id, limit)
+
+
+def check(client, step):
+    with QueryCounter(engine) as queries:
+        summary = client.get("/api/teams/feasibility").json()
+    assert queries.count == 0, f"{step}: feasibility ran {queries.statements}"
+
+    db = SessionLocal()
+    try:
+        assert feasibility.pool(db) == SquadFeasibility().pool(db), f"{step}: pool differs from a reload"
+        expected, teams, pool_size = expected_limits(db)
+        check_caps(db, step, expected, teams)
+    finally:
+        db.close()
+    assert summary["pool"]["players"] == pool_size, step
+    for row in summary["teams"]:
+        assert (row["guaranteed_max_bid_limit"], row["squad_fillable"]) == expected[row["team_id"]], (step, row)
+    return summary
+
+
+def check_other_worker(client, headers):
+    """A sale committed by another worker never reaches this one's caches"""
+    available = client.get("/api/players/", headers=headers, params={"status": "available"}).json()
+    sold = [player["id"] for player in available[-3:]]
+    with engine.begin() as connection:
+        connection.execute(update(Player).where(Player.id.in_(sold))
+                           .values(status=PlayerStatus.SOLD, team_id=1, sold_price=BASE_PLAYER_PRICE))
+        connection.execute(update(Team).where(Team.id == 1).values(
+            players_count=Team.players_count + len(sold),
+            remaining_budget=Team.remaining_budget - len(sold) * BASE_PLAYER_PRICE))
+    db = SessionLocal()
+    try:
+        expected, teams, _ = expected_limits(db)
+        stale = feasibility.summary(db)
+        assert any(row["guaranteed_max_bid_limit"] != expected[row["team_id"]][0] for row in stale["teams"]), \
+            "expected the caches to be stale"
+        check_caps(db, "other worker", expected, teams)
+    finally:
+        db.close()
+    # Caught up, as a restart or the next bulk statement would
+    projection.invalidate()
+    feasibility.invalidate()
+    client.get("/api/teams/feasibility")
+
+
+def bid_up(client, headers, rng, limits):
+    amount = client.get("/api/auction/current").json()["current_bid_amount"]
+    teams = rng.sample(range(1, TEAMS + 1), rng.randint(1, 4))
+    winner = None
+    for index in range(rng.randint(1, 6)):
+        team_id = teams[index % len(teams)]
+        if amount > limits[team_id]:
+            break
+        response = client.post("/api/auction/bid", json={"team_id": team_id, "bid_amount": amount}, headers=headers)
+        assert response.status_code == 200, response.text
+        winner = team_id
+        amount += 5000 * rng.randint(1, 4)
+    return winner
+
+
+def main_check():
+    rng = random.Random(11)
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/api/teams/initialize")
+        client.get("/api/teams/purses")  # load the purses dropped by initialize
+        for index in range(PLAYERS):
+            client.post("/api/registration/register", json={
+                "name": f"Player {index}", "email": f"player{index}@example.com", "role": ROLES[index % len(ROLES)]
+            })
+        for player_id in range(1, PLAYERS + 1, 3):
+            response = client.put(f"/api/players/{player_id}", headers=headers,
+                                  json={"base_price": rng.choice(PRICES)})
+            assert response.status_code == 200, response.text
+        summary = check(client, "registered")
+        print(f"pool of {summary['pool']['players']} for {summary['players_needed']} slots: matches a reload")
+
+        client.post("/api/auction/start", headers=headers)
+        # The dearer players are the last ones left for a team, so its guaranteed limit is below the plain reserve rule
+        summary = check(client, "started")
+        tight = [row for row in summary["teams"] if row["guaranteed_max_bid_limit"] < row["max_bid_limit"]]
+        assert tight, "expected a team whose guaranteed limit is tighter"
+        team = tight[0]
+        amount = client.get("/api/auction/current").json()["current_bid_amount"]
+        amount = max(amount, team["guaranteed_max_bid_limit"] + 5000)
+        assert amount <= team["max_bid_limit"]
+        response = client.post("/api/auction/bid", json={"team_id": team["team_id"], "bid_amount": amount},
+                               headers=headers)
+        assert response.status_code == 400, response.text
+        print(f"team {team['team_id']}: bid of {amount} refused, guaranteed limit "
+              f"{team['guaranteed_max_bid_limit']} < reserve rule {team['max_bid_limit']}")
+
+        sold = []
+        for lot in range(40):
+            limits = {row["team_id"]: row["guaranteed_max_bid_limit"] for row in check(client, f"lot {lot}")["teams"]}
+            player_id = client.get("/api/auction/current").json()["current_player_id"]
+            winner = None if lot % 5 == 4 else bid_up(client, headers, rng, limits)
+            if winner is None:
+                assert client.post("/api/auction/unsold", headers=headers).status_code == 200
+            else:
+                assert client.post("/api/auction/sold", headers=headers).status_code == 200
+                sold.append(player_id)
+        check(client, "after lots")
+        print(f"{len(sold)} sales and {40 - len(sold)} unsold lots: limits match brute force after every lot")
+        check_other_worker(client, headers)
+        check(client, "other worker")
+        print("sale by another worker: bid caps follow the database while the caches lag")
+
+        for index, player_id in enumerate(sold[:4]):
+            action = "mark-unsold" if index % 2 else "mark-available"
+            assert client.post(f"/api/players/{player_id}/{action}", headers=headers).status_code == 200
+            check(client, f"{action} {player_id}")
+        upcoming = client.get("/api/players/", headers=headers, params={"status": "available"}).json()
+        spare = upcoming[-1]["id"]
+        assert client.put(f"/api/players/{spare}", headers=headers, json={"base_price": 30000}).status_code == 200
+        check(client, "base price edit")
+        assert client.delete(f"/api/players/{upcoming[-2]['id']}", headers=headers).status_code == 200
+        check(client, "delete")
+        print("refunds, edits and deletes: pool matches a reload")
+
+        assert client.post("/api/auction/reset", headers=headers).status_code == 200
+        with QueryCounter(engine) as queries:
+            client.get("/api/teams/feasibility")
+        assert queries.count == 2, f"reload after reset ran {queries.statements}"
+        check(client, "reset")
+        print("reset: pool reloaded")
+
+    for teams in (12, 1200):
+        prices = [(10000.0, 150 * teams), (20000.0, 50 * teams), (50000.0, 10 * teams)]
+        started = time.perf_counter()
+        for team in range(teams):
+            guaranteed_max_bid(500000.0, team % MINIMUM_PLAYERS, (teams - 1) * 6, prices)
+        print(f"{teams} teams: limits in {(time.perf_counter() - started) * 1000:.2f} ms")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Live leaderboard checks.
+
+Seeds a temporary SQLite database and runs an auction through the API:
+lots are sold after bidding wars of different lengths, some go unsold, and
+sold players are refunded with mark-unsold and mark-available. After every
+step it asserts that:
+1. The incrementally maintained boards equal boards rebuilt from the
+   database, and the most expensive buy and top spender agree with the
+   players list.
+2. GET /api/auction/leaderboards runs one statement, the boards' version,
+   once the first read after a change has reloaded them.
+It also checks that a WebSocket viewer gets the boards on connect and again
+after a sale, and that moving a team to another league through
+PUT /api/teams/{id} moves its purse and squad-pool limits with it.
+
+Usage (from the backend directory):
+    python benchmarks/check_leaderboards.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_boards_')}/boards.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal, engine
+from leaderboards import Leaderboards
+from query_counter import QueryCounter
+
+PLAYERS = 24
+ROLES = ["batsman", "bowler", "all_rounder", "left_handed"]
+BID_STEP = 5000
+
+
+def bid_up(client, headers, rng):
+    amount = client.get("/api/auction/current").json()["current_bid_amount"]
+    teams = rng.sample(range(1, 13), rng.randint(1, 5))
+    for index in range(rng.randint(1, 12)):
+        response = client.post("/api/auction/bid", json={"team_id": teams[index % len(teams)], "bid_amount": amount},
+                               headers=headers)
+        assert response.status_code == 200, response.text
+        amount += BID_STEP * rng.randint(1, 3)
+
+
+def check_boards(client, headers, step):
+    client.get("/api/auction/leaderboards")
+    with QueryCounter(engine) as queries:
+        live = client.get("/api/auction/leaderboards").json()
+    assert queries.count == 1, f"{step}: leaderboards ran {queries.count} statements"
+
+    db = SessionLocal()
+    try:
+        rebuilt = Leaderboards().snapshot(db)
+    finally:
+        db.close()
+    assert live == rebuilt, f"{step}: incremental boards differ from a rebuild\n{live}\n{rebuilt}"
+
+    sold = [player for player in client.get("/api/players/", headers=headers).json() if player["status"] == "sold"]
+    spend = defaultdict(float)
+    for player in sold:
+        spend[player["team_id"]] += player["sold_price"]
+    if sold:
+        assert live["most_expensive_buys"][0]["price"] == max(player["sold_price"] for player in sold), step
+        assert live["top_spenders"][0]["spent"] == max(spend.values()), step
+    else:
+        assert live["most_expensive_buys"] == [] and live["top_spenders"] == [], step
+
+
+def check_league_move(client, headers):
+    """PUT /api/teams/{id} with a new league moves the team's purse and squad-pool limits with it"""
+    spender = client.get("/api/auction/leaderboards").json()["top_spenders"][0]["team_id"]
+    for league in ("senior", None):
+        response = client.put(f"/api/teams/{spender}", headers=headers, json={"league": league})
+        assert response.status_code == 200, response.text
+        senior = [purse["team_id"] for purse in client.get("/api/teams/purses", params={"league": "senior"}).json()]
+        assert senior == ([spender] if league else []), (league, senior)
+        assert all(purse["league"] == league for purse in client.get("/api/teams/purses").json()
+                   if purse["team_id"] == spender)
+        feasibility = client.get("/api/teams/feasibility", params={"league": "senior"}).json()
+        assert [row["team_id"] for row in feasibility["teams"]] == senior, feasibility["teams"]
+        boards = client.get("/api/auction/leaderboards", params={"league": "senior"}).json()
+        db = SessionLocal()
+        try:
+            assert boards == Leaderboards().snapshot(db, "senior"), (league, boards)
+        finally:
+            db.close()
+        check_boards(client, headers, f"league {league}")
+
+
+def main_check():
+    rng = random.Random(7)
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/api/teams/initialize")
+        for index in range(PLAYERS):
+            client.post("/api/registration/register", json={
+                "name": f"Player {index}", "email": f"player{index}@example.com", "role": ROLES[index % len(ROLES)]
+            })
+        client.post("/api/auction/start", headers=headers)
+        check_boards(client, headers, "start")
+
+        with client.websocket_connect("/api/auction/ws") as websocket:
+            assert websocket.receive_json()["type"] == "purses"
+            initial = websocket.receive_json()
+            assert initial["type"] == "leaderboards" and initial["data"]["most_expensive_buys"] == []
+            bid_up(client, headers, rng)
+            assert client.post("/api/auction/sold", headers=headers).status_code == 200
+            message = websocket.receive_json()
+            while message["type"] != "leaderboards":
+                message = websocket.receive_json()
+            assert len(message["data"]["most_expensive_buys"]) == 1
+        print("websocket: boards on connect and after a sale")
+
+        sold_ids = []
+        for lot in range(1, PLAYERS // 2):
+            player_id = client.get("/api/auction/current").json()["current_player_id"]
+            if lot % 4 == 0:
+                assert client.post("/api/auction/unsold", headers=headers).status_code == 200
+            else:
+                bid_up(client, headers, rng)
+                assert client.post("/api/auction/sold", headers=headers).status_code == 200
+                sold_ids.append(player_id)
+            check_boards(client, headers, f"lot {lot}")
+        print(f"{len(sold_ids) + 1} sales: incremental boards match a rebuild after every lot")
+
+        for index, player_id in enumerate(sold_ids[:4]):
+            action = "mark-unsold" if index % 2 else "mark-available"
+            response = client.post(f"/api/players/{player_id}/{action}", headers=headers)
+            assert response.status_code == 200, response.text
+            check_boards(client, headers, f"{action} {player_id}")
+        print("refunds: boards match a rebuild after mark-unsold and mark-available")
+
+        # Sell on until the refunded players have been back on the block and sold again
+        resold = 0
+        while client.get("/api/auction/current").json().get("status") == "in_progress":
+            player_id = client.get("/api/auction/current").json()["current_player_id"]
+            bid_up(client, headers, rng)
+            assert client.post("/api/auction/sold", headers=headers).status_code == 200
+            resold += player_id in sold_ids
+            check_boards(client, headers, "resale")
+        assert resold == 2, resold
+        print("resales: refunded players sold again, boards match a rebuild")
+
+        check_league_move(client, headers)
+        print("league move: purses, squad pool and boards follow the team")
+
+        assert client.post("/api/auction/reset", headers=headers).status_code == 200
+        with QueryCounter(engine) as queries:
+            client.get("/api/auction/leaderboards")
+        assert queries.count == 3, f"reload after reset ran {queries.count} statements"
+        check_boards(client, headers, "reset")
+        print("reset: boards cleared")
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
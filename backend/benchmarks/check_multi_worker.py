@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Conditional GETs under several workers.
+
+Each worker keeps its own response cache and in-memory state, so a write
+committed by another worker reaches this one only through the database.
+This seeds a temporary SQLite database, warms the caches through the API,
+then commits changes directly with the engine, as another worker would,
+and asserts that every route below answers the old ETag with a fresh 200
+body rather than a 304 or a cached body:
+- GET /api/teams/ after a team's purse changes;
+- GET /api/players/{id} and GET /api/teams/{id} after a sale, which have
+  no ETag but must not keep serving this worker's cached body;
+- GET /api/auction/current and GET /api/auction/snapshot after a bid, and
+  after a pause that changes only the auction row.
+It also checks that the live lot's bid history and a sale here include
+another worker's bids, that the leaderboards include another worker's sale, that this worker's lot timer does not close a lot
+whose countdown another worker restarted later, and that a duration set
+on another worker is the one GET /api/auction/timer reports.
+
+Usage (from the backend directory):
+    python benchmarks/check_multi_worker.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_workers_')}/workers.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+
+import main
+from database import engine
+from models import Auction, AuctionStatus, Bid, Player, PlayerStatus, Team
+
+
+def revalidate(client, path, etag, **kwargs):
+    """GET with If-None-Match: must not be a 304; returns the response"""
+    response = client.get(path, headers={"If-None-Match": etag, **kwargs.pop("headers", {})}, **kwargs)
+    assert response.status_code == 200, f"{path}: {response.status_code} for a stale ETag"
+    assert response.headers["ETag"] != etag, f"{path}: ETag did not change"
+    return response
+
+
+def check_teams(client):
+    first = client.get("/api/teams/")
+    assert first.status_code == 200
+    assert client.get("/api/teams/", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    with engine.begin() as connection:
+        connection.execute(update(Team).where(Team.id == 1).values(remaining_budget=Team.remaining_budget - 5000))
+    fresh = revalidate(client, "/api/teams/", first.headers["ETag"])
+    team = next(team for team in fresh.json() if team["id"] == 1)
+    before = next(team for team in first.json() if team["id"] == 1)
+    assert team["remaining_budget"] == before["remaining_budget"] - 5000, team
+    print("teams: another worker's write changes the ETag and the body")
+
+
+def check_live(client, headers):
+    for index in range(3):
+        client.post("/api/registration/register", json={
+            "name": f"Player {index}", "email": f"player{index}@example.com", "role": "batsman"
+        })
+    assert client.post("/api/auction/start", headers=headers).status_code == 200
+    current = client.get("/api/auction/current")
+    snapshot = client.get("/api/auction/snapshot")
+    for path, response in (("/api/auction/current", current), ("/api/auction/snapshot", snapshot)):
+        assert client.get(path, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+    # A bid taken by another worker
+    with engine.begin() as connection:
+        auction_id, player_id = connection.execute(select(Auction.id, Auction.current_player_id)).one()
+        connection.execute(insert(Bid).values(auction_id=auction_id, player_id=player_id, team_id=2, bid_amount=10000))
+        connection.execute(update(Auction).where(Auction.id == auction_id)
+                           .values(current_bid_amount=10000, current_bidding_team_id=2))
+    current = revalidate(client, "/api/auction/current", current.headers["ETag"])
+    assert current.json()["current_bidding_team_id"] == 2, current.json()
+    snapshot = revalidate(client, "/api/auction/snapshot", snapshot.headers["ETag"])
+    assert [bid["team_id"] for bid in snapshot.json()["bids"]] == [2], snapshot.json()["bids"]
+
+    # A pause on another worker touches only the auction row
+    with engine.begin() as connection:
+        connection.execute(update(Auction).where(Auction.id == auction_id).values(status=AuctionStatus.PAUSED))
+    current = revalidate(client, "/api/auction/current", current.headers["ETag"])
+    assert current.json()["status"] == "paused", current.json()
+    snapshot = revalidate(client, "/api/auction/snapshot", snapshot.headers["ETag"])
+    assert snapshot.json()["auction"]["status"] == "paused"
+    print("current and snapshot: another worker's bid and pause change the ETag and the body")
+
+
+def check_lot_timer(client, headers):
+    with engine.begin() as connection:
+        auction_id, player_id = connection.execute(select(Auction.id, Auction.current_player_id)).one()
+        connection.execute(update(Auction).where(Auction.id == auction_id).values(status=AuctionStatus.IN_PROGRESS))
+    assert client.put("/api/auction/timer?seconds=1", headers=headers).status_code == 200
+    assert client.post("/api/auction/bid", json={"team_id": 3, "bid_amount": 15000}, headers=headers).status_code == 200
+
+    # Another worker takes a bid half a second later and restarts its own countdown
+    time.sleep(0.5)
+    with engine.begin() as connection:
+        connection.execute(update(Auction).where(Auction.id == auction_id)
+                           .values(current_bidding_team_id=4, lot_deadline=datetime.utcnow() + timedelta(seconds=1)))
+    time.sleep(0.8)  # past this worker's deadline, not the other one's
+    with engine.connect() as connection:
+        status = connection.execute(select(Player.status).where(Player.id == player_id)).scalar()
+    assert status == PlayerStatus.AVAILABLE, f"lot closed at a stale deadline: {status}"
+    time.sleep(0.6)
+    with engine.connect() as connection:
+        status, team_id = connection.execute(select(Player.status, Player.team_id).where(Player.id == player_id)).one()
+    assert (status, team_id) == (PlayerStatus.SOLD, 4), (status, team_id)
+
+    # A duration set on another worker
+    with engine.begin() as connection:
+        connection.execute(update(Auction).where(Auction.id == auction_id).values(lot_timer_seconds=30))
+    assert client.get("/api/auction/timer").json()["duration_seconds"] == 30
+    assert client.put("/api/auction/timer?seconds=0", headers=headers).status_code == 200
+    assert not client.get("/api/auction/timer").json()["active"]
+    print("lot timer: a countdown restarted by another worker holds the lot open")
+
+
+def check_details(client):
+    with engine.connect() as connection:
+        on_block = connection.execute(select(Auction.current_player_id)).scalar()
+        player_id = connection.execute(select(Player.id).where(
+            Player.status == PlayerStatus.AVAILABLE, Player.id != on_block)).scalars().first()
+    before = client.get(f"/api/players/{player_id}").json()
+    team = client.get("/api/teams/5").json()
+    assert before["team_id"] is None and before["id"] == player_id
+
+    # A sale on another worker
+    with engine.begin() as connection:
+        connection.execute(update(Player).where(Player.id == player_id)
+                           .values(status=PlayerStatus.SOLD, team_id=5, sold_price=20000))
+        connection.execute(update(Team).where(Team.id == 5).values(remaining_budget=Team.remaining_budget - 20000))
+    player = client.get(f"/api/players/{player_id}").json()
+    assert (player["status"], player["team_id"]) == ("sold", 5), player
+    sold = client.get("/api/teams/5").json()
+    assert sold["remaining_budget"] == team["remaining_budget"] - 20000, sold
+    assert player_id in [p["id"] for p in sold["players"]], sold["players"]
+    print("player and team details: another worker's sale reaches this worker's cache")
+
+
+def check_bid_war(client, headers):
+    current = client.get("/api/auction/current").json()
+    auction_id, player_id = current["id"], current["current_player_id"]
+    amount = current["current_bid_amount"]
+    assert client.post("/api/auction/bid", json={"team_id": 6, "bid_amount": amount}, headers=headers).status_code == 200
+
+    # The lot's next bid is taken by another worker
+    with engine.begin() as connection:
+        connection.execute(insert(Bid).values(auction_id=auction_id, player_id=player_id, team_id=7,
+                                              bid_amount=amount + 5000))
+        connection.execute(update(Auction).where(Auction.id == auction_id)
+                           .values(current_bid_amount=amount + 5000, current_bidding_team_id=7))
+    history = client.get(f"/api/auction/history/{player_id}").json()
+    assert [bid["team_id"] for bid in history] == [6, 7], history
+    assert client.post("/api/auction/sold", headers=headers).status_code == 200
+    wars = client.get("/api/auction/leaderboards").json()["biggest_bid_wars"]
+    war = next(entry for entry in wars if entry["player_id"] == player_id)
+    assert (war["bids"], war["teams"]) == (2, 2), war
+    print("history and leaderboards: the live lot includes the bids taken by another worker")
+
+
+def check_leaderboards(client):
+    top = client.get("/api/auction/leaderboards").json()["most_expensive_buys"]
+    price = max([entry["price"] for entry in top], default=0) + 50000
+
+    # A record sale on another worker
+    with engine.begin() as connection:
+        player_id = connection.execute(insert(Player).values(
+            name="Record Buy", email="record@example.com", role="batsman", status=PlayerStatus.SOLD,
+            registration_fee_paid=True, team_id=8, sold_price=price)).inserted_primary_key[0]
+        connection.execute(update(Team).where(Team.id == 8).values(remaining_budget=Team.remaining_budget - price))
+    top = client.get("/api/auction/leaderboards").json()["most_expensive_buys"]
+    assert top and (top[0]["player_id"], top[0]["price"]) == (player_id, price), top
+    print("leaderboards: another worker's sale reaches this worker's boards")
+
+
+def main_check():
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/api/teams/initialize")
+        check_teams(client)
+        check_live(client, headers)
+        check_lot_timer(client, headers)
+        check_details(client)
+        check_bid_war(client, headers)
+        check_leaderboards(client)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Proxy bidding checks.
+
+1. resolve_proxy_bids() against hand-worked cases: ties go to the leader,
+   then to the earlier registration; the price does not depend on where
+   the bidding started (no increment parity); a long war is at most two
+   bids.
+2. Through the API on a temporary SQLite database: a war between 1,000,000
+   and 990,000 ceilings adds two Bid rows to the opening bid and leaves the
+   lot at 995,000.
+
+Usage (from the backend directory):
+    python benchmarks/check_proxy_bidding.py
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_proxy_')}/proxy.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+import main
+from database import engine
+from feasibility import feasibility
+from models import Bid, Team
+from proxy_bidding import resolve_proxy_bids
+from purse import projection
+
+# (ceilings, leader, current amount, base price) -> bids written
+CASES = [
+    # Equal ceilings: the earlier registration wins at the shared ceiling, whatever the base
+    (({1: 50000, 2: 50000}, None, 15000, 15000), [(1, 50000)]),
+    (({1: 50000, 2: 50000}, None, 10000, 10000), [(1, 50000)]),
+    (({2: 50000, 1: 50000}, None, 10000, 10000), [(2, 50000)]),
+    # The price is the runner-up's ceiling plus one increment, from either base
+    (({1: 100000, 2: 50000}, None, 15000, 15000), [(2, 50000), (1, 55000)]),
+    (({1: 100000, 2: 50000}, None, 10000, 10000), [(2, 50000), (1, 55000)]),
+    # Capped at the winner's ceiling
+    (({1: 52000, 2: 50000}, None, 10000, 10000), [(2, 50000), (1, 52000)]),
+    # A lone ceiling opens at the base price, or outbids the leader by one increment
+    (({1: 100000}, None, 10000, 10000), [(1, 10000)]),
+    (({2: 100000}, 1, 20000, 10000), [(2, 25000)]),
+    # The leader keeps the lot on a tie with a challenger
+    (({2: 50000, 1: 50000}, 1, 20000, 10000), [(1, 50000)]),
+    # The leader's own ceiling answers a challenger
+    (({1: 60000, 2: 40000}, 1, 20000, 10000), [(2, 40000), (1, 45000)]),
+    (({1: 30000, 2: 40000}, 1, 20000, 10000), [(1, 30000), (2, 35000)]),
+    # Nobody can beat the current bid
+    (({2: 20000}, 1, 20000, 10000), []),
+    # A long war is still two bids
+    (({1: 1000000, 2: 990000}, None, 10000, 10000), [(2, 990000), (1, 995000)]),
+]
+
+
+def check_cases():
+    for args, expected in CASES:
+        result = resolve_proxy_bids(*args)
+        assert result == expected, (args, result, expected)
+    print(f"{len(CASES)} cases: ties, parity and long wars resolve as expected")
+
+
+def check_api():
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.post("/api/teams/initialize")
+        for index in range(3):
+            client.post("/api/registration/register", json={
+                "name": f"Player {index}", "email": f"player{index}@example.com", "role": "batsman"
+            })
+        with engine.begin() as connection:
+            connection.execute(update(Team).values(budget=10000000, remaining_budget=10000000))
+        projection.invalidate()
+        feasibility.invalidate()
+        assert client.post("/api/auction/start", headers=headers).status_code == 200
+
+        for team_id, ceiling in ((1, 1000000), (2, 990000)):
+            response = client.post("/api/auction/proxy-bid", headers=headers,
+                                   json={"team_id": team_id, "max_amount": ceiling})
+            assert response.status_code == 200, response.text
+        current = client.get("/api/auction/current").json()
+        assert (current["current_bidding_team_id"], current["current_bid_amount"]) == (1, 995000), current
+        with engine.connect() as connection:
+            bids = connection.execute(select(func.count()).select_from(Bid)).scalar()
+        # team 1's opening bid, then team 2's last bid and team 1's answer
+        assert bids == 3, bids
+    print("API: 1,000,000 vs 990,000 settles at 995,000 with 3 Bid rows")
+
+
+def main_check():
+    check_cases()
+    check_api()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Per-route SQL statement budgets.
+
+Seeds a temporary SQLite database with thousands of players (a third of them
+sold, with bids), then requests each read route with the response cache
+cleared. It asserts that the number of statements stays under the route's
+budget. The budgets do not depend on the number of rows, so an N+1
+regression (a lazy load per player, a query per row in an export) fails
+loudly.
+
+Usage (from the backend directory):
+    python benchmarks/check_query_counts.py
+    python benchmarks/check_query_counts.py --players 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='gpl_queries_')}/queries.db"
+os.environ["LOT_TIMER_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import engine, SessionLocal
+from models import Bid, BlockName, OwnerRegistration, Player, PlayerRole, PlayerStatus, Team
+from query_counter import QueryCounter
+from response_cache import response_cache
+
+TEAMS = 12
+ROLES = list(PlayerRole)
+
+# route -> maximum statements (the admin routes include one for the current user,
+# the exports one per table version checked against the export job cache)
+BUDGETS = {
+    "/api/teams/": 2,
+    "/api/teams/purses": 1,
+    "/api/teams/{team_id}": 3,  # the teams and players version, the team, its players
+    "/api/teams/{team_id}/max-bid-limit": 2,  # the team, then the cap inputs from the database
+    "/api/teams/export/excel": 3,
+    "/api/players/": 3,
+    "/api/players/{player_id}": 2,  # the players and teams version, then the player
+    "/api/players/{sold_player_id}": 2,
+    "/api/players/available/count": 1,
+    "/api/players/export/excel": 4,
+    "/api/auction/current": 2,  # the live version, then the lot
+    "/api/auction/snapshot": 4,  # the live version, the lot, its bids and the purses
+    "/api/auction/history/{sold_player_id}": 3,
+    "/api/owner-registrations/": 2,
+}
+
+
+def seed(players):
+    db = SessionLocal()
+    teams = [Team(name=f"Team {index}", short_name=f"T{index:02d}") for index in range(TEAMS)]
+    db.add_all(teams)
+    db.flush()
+    sold = players // 3
+    rows = []
+    for index in range(players):
+        team = teams[index % TEAMS] if index < sold else None
+        rows.append(Player(
+            name=f"Player {index}",
+            email=f"player{index}@example.com",
+            role=ROLES[index % len(ROLES)],
+            status=PlayerStatus.SOLD if team else PlayerStatus.AVAILABLE,
+            registration_fee_paid=True,
+            team_id=team.id if team else None,
+            sold_price=20000 if team else None,
+            player_image="data:image/png;base64," + "A" * 2000,
+        ))
+    db.add_all(rows)
+    db.flush()
+    db.add_all(
+        Bid(auction_id=1, player_id=player.id, team_id=player.team_id, bid_amount=10000 + step * 5000)
+        for player in rows[:sold] for step in range(3)
+    )
+    db.add_all(
+        OwnerRegistration(owner_full_name=f"Owner {index}", owner_block=BlockName.ORION, owner_unit_number=str(index))
+        for index in range(200)
+    )
+    db.commit()
+    sold_player_id = rows[0].id
+    db.close()
+    return sold_player_id
+
+
+def main_check():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=3000)
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        sold_player_id = seed(args.players)
+        token = client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.post("/api/auction/start", headers=headers).status_code == 200
+        client.post("/api/auction/bid", json={"team_id": 1, "bid_amount": 10000}, headers=headers)
+        player_id = client.get("/api/auction/current").json()["current_player_id"]
+
+        failures = []
+        print(f"{args.players} players, {TEAMS} teams")
+        for route, budget in BUDGETS.items():
+            path = route.format(team_id=1, player_id=player_id, sold_player_id=sold_player_id)
+            response_cache.clear()
+            with QueryCounter(engine) as queries:
+                response = client.get(path, headers=headers)
+            assert response.status_code == 200, (path, response.status_code, response.text[:200])
+            status = "ok" if queries.count <= budget else "OVER BUDGET"
+            print(f"  {route:<42} {queries.count:>3} statements (budget {budget}) {status}")
+            if queries.count > budget:
+                failures.append(route)
+
+    if failures:
+        raise SystemExit(f"FAIL: {', '.join(failures)}")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
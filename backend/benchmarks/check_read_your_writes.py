@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Read-your-writes with a read replica.
+
+Runs against a temporary SQLite primary with one SQLite file replica that
+is never refreshed, so anything read from it is stale. It asserts that:
+- a request that writes gets an X-Last-Write response header;
+- the writing client, echoing that header, reads its write from the primary;
+- another client, without the header, is still served by the replica;
+- a header older than REPLICA_MAX_LAG_SECONDS no longer keeps the client
+  on the primary;
+- the response cache never serves one client's read to the other, and
+  never keeps a body read from the replica.
+
+Usage (from the backend directory):
+    python benchmarks/check_read_your_writes.py
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+DATA_DIR = tempfile.mkdtemp(prefix="gpl_replica_")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATA_DIR}/primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{DATA_DIR}/replica.db"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import LAST_WRITE_HEADER, REPLICA_MAX_LAG_SECONDS, refresh_sqlite_replicas
+from response_cache import response_cache
+
+
+def main_check():
+    with TestClient(main.app) as client:
+        client.post("/api/teams/initialize")
+        refresh_sqlite_replicas()
+        read = client.get("/api/players/available/count")
+        assert read.status_code == 200 and LAST_WRITE_HEADER not in read.headers, read.headers
+
+        response = client.post("/api/registration/register", json={
+            "name": "Late Entry", "email": "late@example.com", "role": "batsman"
+        })
+        assert response.status_code in (200, 201), response.text
+        stamp = response.headers.get(LAST_WRITE_HEADER)
+        assert stamp, f"no {LAST_WRITE_HEADER} header on a write"
+        path = f"/api/players/{response.json()['id']}"
+
+        # Read twice each way: the response cache must not hand one client's read to the other
+        for _ in range(2):
+            assert client.get(path, headers={LAST_WRITE_HEADER: stamp}).status_code == 200, \
+                "the writing client did not read its own write"
+            assert client.get(path).status_code == 404, "a client that did not write was not served by the replica"
+        expired = str(float(stamp) - REPLICA_MAX_LAG_SECONDS - 1)
+        assert client.get(path, headers={LAST_WRITE_HEADER: expired}).status_code == 404, \
+            "a write older than REPLICA_MAX_LAG_SECONDS kept the client on the primary"
+        print("the writer reads the primary within REPLICA_MAX_LAG_SECONDS; other clients read the replica")
+
+        # Bodies read from the replica are not kept; the writer's are
+        entries = response_cache.stats()["entries"]
+        assert client.get("/api/teams/1").status_code == 200
+        assert response_cache.stats()["entries"] == entries, "a body read from the replica was cached"
+        assert client.get("/api/teams/1", headers={LAST_WRITE_HEADER: stamp}).status_code == 200
+        assert response_cache.stats()["entries"] == entries + 1
+        print("replica reads are not cached")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main_check()
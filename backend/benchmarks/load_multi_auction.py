@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Load test: several auctions running in parallel on one backend.
+
+Starts uvicorn on a temporary SQLite database and creates one league per
+auction (teams and players). It starts all the auctions and connects WebSocket
+viewers to each auction's room. Then it drives bids and sales in every auction
+concurrently. It reports request latency and throughput, and checks that
+viewers only received updates for their own auction.
+
+Usage (from the backend directory):
+    python benchmarks/load_multi_auction.py
+    python benchmarks/load_multi_auction.py --auctions 6 --lots 30 --viewers 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS_PER_LEAGUE = 4
+
+
+def start_server(port: int, workdir: str):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{workdir}/load.db", LOT_TIMER_SECONDS="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit("Server did not start")
+
+
+async def seed(client, headers, auctions, lots):
+    leagues = {}
+    for index in range(auctions):
+        league = f"league-{index + 1}"
+        team_ids = []
+        for team_number in range(TEAMS_PER_LEAGUE):
+            response = await client.post("/api/teams/", json={
+                "name": f"{league} team {team_number}",
+                "short_name": f"{chr(65 + index)}{team_number:02d}",
+                "league": league,
+            })
+            team_ids.append(response.json()["id"])
+        player_ids = set()
+        for player_number in range(lots):
+            response = await client.post("/api/registration/register", json={
+                "name": f"{league} player {player_number}",
+                "email": f"{league}-{player_number}@example.com",
+                "role": "batsman",
+                "league": league,
+            })
+            player_ids.add(response.json()["id"])
+        response = await client.post(f"/api/auction/start?league={league}", headers=headers)
+        leagues[league] = {
+            "auction_id": response.json()["auction_id"],
+            "team_ids": team_ids,
+            "player_ids": player_ids,
+        }
+    return leagues
+
+
+async def view(port, auction_id, received, ready):
+    async with websockets.connect(f"ws://127.0.0.1:{port}/api/auction/ws/{auction_id}") as websocket:
+        ready.release()
+        try:
+            async for raw in websocket:
+                received.append(json.loads(raw))
+        except websockets.ConnectionClosed:
+            pass
+
+
+async def drive(client, headers, auction, lots, bids_per_lot, latencies):
+    auction_id = auction["auction_id"]
+    team_ids = auction["team_ids"]
+    for _ in range(lots):
+        amount = 10000
+        for bid_number in range(bids_per_lot):
+            start = time.perf_counter()
+            response = await client.post(
+                f"/api/auction/bid?auction_id={auction_id}",
+                json={"team_id": team_ids[bid_number % 2], "bid_amount": amount},
+                headers=headers,
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise SystemExit(f"Bid failed in auction {auction_id}: {response.text}")
+            amount += 5000
+        start = time.perf_counter()
+        response = await client.post(f"/api/auction/sold?auction_id={auction_id}", headers=headers)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise SystemExit(f"Sale failed in auction {auction_id}: {response.text}")
+
+
+async def run(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        login = await client.post("/api/auth/login", json={"username": "Admin", "password": "Admin123*#"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        leagues = await seed(client, headers, args.auctions, args.lots)
+
+        viewers = []
+        ready = asyncio.Semaphore(0)
+        for league, auction in leagues.items():
+            for _ in range(args.viewers):
+                received = []
+                task = asyncio.create_task(view(args.port, auction["auction_id"], received, ready))
+                viewers.append((league, received, task))
+        for _ in viewers:
+            await ready.acquire()
+
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            drive(client, headers, auction, args.lots, args.bids_per_lot, latencies)
+            for auction in leagues.values()
+        ))
+        elapsed = time.perf_counter() - start
+
+        await asyncio.sleep(0.5)
+        for _, _, task in viewers:
+            task.cancel()
+        await asyncio.gather(*(task for _, _, task in viewers), return_exceptions=True)
+
+    latencies_ms = sorted(value * 1000 for value in latencies)
+    p99 = latencies_ms[int(len(latencies_ms) * 0.99) - 1]
+    print(f"{args.auctions} auctions x {args.lots} lots x {args.bids_per_lot} bids, {args.viewers} viewers per auction")
+    print(f"{len(latencies)} requests in {elapsed:.2f} s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"latency: median {statistics.median(latencies_ms):.1f} ms, p99 {p99:.1f} ms")
+
+    leaked = 0
+    counts = []
+    for league, received, _ in viewers:
+        own_players = leagues[league]["player_ids"]
+        counts.append(len(received))
+        for message in received:
+            player_id = message.get("data", {}).get("player_id") if isinstance(message.get("data"), dict) else None
+            if player_id is not None and player_id not in own_players:
+                leaked += 1
+    print(f"messages per viewer: min {min(counts)}, max {max(counts)}")
+    if leaked:
+        raise SystemExit(f"FAIL: {leaked} messages from other auctions reached viewers")
+    print("isolation: OK (viewers only received their own auction's updates)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auctions", type=int, default=4)
+    parser.add_argument("--lots", type=int, default=15)
+    parser.add_argument("--bids-per-lot", type=int, default=4)
+    parser.add_argument("--viewers", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpl_load_")
+    server = start_server(args.port, workdir)
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
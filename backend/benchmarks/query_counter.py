@@ -0,0 +1,30 @@
+"""
+Count the SQL statements an engine executes.
+
+    with QueryCounter(engine) as queries:
+        client.get("/api/teams/")
+    print(queries.count, queries.statements)
+"""
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
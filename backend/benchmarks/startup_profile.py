@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Startup import profile for the backend.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+summarizes the output by top-level package, so it is easy to see what a
+cold start is paying for.
+
+Usage (from the backend directory):
+    python benchmarks/startup_profile.py
+    python benchmarks/startup_profile.py --top 30 --module routers.auction
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_importtime(module: str) -> str:
+    """Import a module in a fresh interpreter and return the -X importtime log"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(f"Importing {module} failed")
+    return result.stderr
+
+
+def parse_importtime(log: str):
+    """Parse importtime lines into (self_us, cumulative_us, module) tuples"""
+    entries = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return entries
+
+
+def summarize(entries, top: int):
+    """Total self time per top-level package, largest first"""
+    per_package = defaultdict(int)
+    for self_us, _, name in entries:
+        per_package[name.strip().split(".")[0]] += self_us
+    total_us = sum(per_package.values())
+
+    print(f"{'package':<32}{'ms':>10}{'share':>9}")
+    print("-" * 51)
+    for package, self_us in sorted(per_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total_us:>9.1%}")
+    print("-" * 51)
+    print(f"{'total':<32}{total_us / 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20, help="Number of packages to show")
+    args = parser.parse_args()
+
+    entries = parse_importtime(run_importtime(args.module))
+    summarize(entries, args.top)
+
+
+if __name__ == "__main__":
+    main()
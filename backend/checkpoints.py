@@ -0,0 +1,124 @@
+"""
+Auction checkpoints: named copies of the auction state, restored in place.
+
+Creating a checkpoint copies what an auction changes into checkpoint_*
+tables, with one INSERT ... SELECT per table:
+- every player's status, team and sold price;
+- every team's purse;
+- the auction rows;
+- the bids.
+Restoring copies them back with UPDATE ... FROM and replaces the bids, all
+in one transaction. Both stay inside the database and work the same on
+SQLite and PostgreSQL. Nothing else is touched: users, registrations,
+payments, and player details edited since the checkpoint are kept. Players
+registered after the checkpoint go back to the pool if they have been sold
+since.
+"""
+from sqlalchemy import delete, insert, literal, select, update
+from sqlalchemy.orm import Session
+from models import (
+    Auction as AuctionModel,
+    Bid as BidModel,
+    Checkpoint,
+    CheckpointAuction,
+    CheckpointBid,
+    CheckpointPlayer,
+    CheckpointTeam,
+    Player as PlayerModel,
+    PlayerStatus,
+    Team as TeamModel,
+)
+
+PLAYER_COLUMNS = ("status", "team_id", "sold_price")
+TEAM_COLUMNS = ("budget", "remaining_budget", "players_count")
+AUCTION_COLUMNS = (
+    "season", "name", "league", "status", "current_player_id", "current_bid_amount",
+    "current_bidding_team_id", "started_at", "ended_at", "created_at",
+)
+BID_COLUMNS = ("auction_id", "player_id", "team_id", "bid_amount", "is_winning_bid", "created_at")
+
+# snapshot table, its id column, the live table and the columns copied
+SNAPSHOTS = (
+    (CheckpointPlayer, "player_id", PlayerModel, PLAYER_COLUMNS),
+    (CheckpointTeam, "team_id", TeamModel, TEAM_COLUMNS),
+    (CheckpointAuction, "auction_id", AuctionModel, AUCTION_COLUMNS),
+    (CheckpointBid, "bid_id", BidModel, BID_COLUMNS),
+)
+
+def create_checkpoint(db: Session, name: str) -> Checkpoint:
+    """Copy the auction state under `name`. Commits."""
+    checkpoint = Checkpoint(name=name)
+    db.add(checkpoint)
+    db.flush()
+    counts = []
+    for snapshot, key, model, columns in SNAPSHOTS:
+        counts.append(db.execute(
+            insert(snapshot).from_select(
+                ["checkpoint_id", key, *columns],
+                select(literal(checkpoint.id), model.id, *[getattr(model, column) for column in columns])
+            )
+        ).rowcount)
+    checkpoint.players, checkpoint.teams, checkpoint.auctions, checkpoint.bids = counts
+    db.commit()
+    db.refresh(checkpoint)
+    return checkpoint
+
+def _copy_back(db: Session, checkpoint_id: int, snapshot, key: str, model, columns) -> int:
+    """UPDATE model FROM snapshot for the rows that still exist"""
+    return db.execute(
+        update(model)
+        .where(model.id == getattr(snapshot, key), snapshot.checkpoint_id == checkpoint_id)
+        .values({column: getattr(snapshot, column) for column in columns})
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+def restore_checkpoint(db: Session, checkpoint: Checkpoint) -> dict:
+    """Put the auction back as it was at the checkpoint. Does not commit."""
+    checkpoint_id = checkpoint.id
+    saved_players = select(CheckpointPlayer.player_id).where(CheckpointPlayer.checkpoint_id == checkpoint_id)
+    saved_auctions = select(CheckpointAuction.auction_id).where(CheckpointAuction.checkpoint_id == checkpoint_id)
+
+    # Bids go first, as they reference auctions, players and teams
+    db.execute(delete(BidModel).execution_options(synchronize_session=False))
+
+    players = _copy_back(db, checkpoint_id, CheckpointPlayer, "player_id", PlayerModel, PLAYER_COLUMNS)
+    db.execute(
+        update(PlayerModel)
+        .where(PlayerModel.status == PlayerStatus.SOLD, PlayerModel.id.not_in(saved_players))
+        .values(status=PlayerStatus.AVAILABLE, team_id=None, sold_price=None)
+        .execution_options(synchronize_session=False)
+    )
+    teams = _copy_back(db, checkpoint_id, CheckpointTeam, "team_id", TeamModel, TEAM_COLUMNS)
+
+    # Auctions started since are dropped, and any deleted since come back
+    db.execute(
+        delete(AuctionModel).where(AuctionModel.id.not_in(saved_auctions))
+        .execution_options(synchronize_session=False)
+    )
+    _copy_back(db, checkpoint_id, CheckpointAuction, "auction_id", AuctionModel, AUCTION_COLUMNS)
+    db.execute(
+        insert(AuctionModel).from_select(
+            ["id", *AUCTION_COLUMNS],
+            select(CheckpointAuction.auction_id, *[getattr(CheckpointAuction, column) for column in AUCTION_COLUMNS])
+            .where(CheckpointAuction.checkpoint_id == checkpoint_id,
+                   CheckpointAuction.auction_id.not_in(select(AuctionModel.id)))
+        )
+    )
+
+    # Bids on players or teams deleted since cannot come back
+    bids = db.execute(
+        insert(BidModel).from_select(
+            ["id", *BID_COLUMNS],
+            select(CheckpointBid.bid_id, *[getattr(CheckpointBid, column) for column in BID_COLUMNS])
+            .where(CheckpointBid.checkpoint_id == checkpoint_id,
+                   CheckpointBid.player_id.in_(select(PlayerModel.id)),
+                   CheckpointBid.team_id.in_(select(TeamModel.id)))
+        )
+    ).rowcount
+    return {"players": players, "teams": teams, "auctions": checkpoint.auctions, "bids": bids}
+
+def delete_checkpoint(db: Session, checkpoint: Checkpoint):
+    """Drop a checkpoint and its copies. Does not commit."""
+    for snapshot, _, _, _ in SNAPSHOTS:
+        db.execute(delete(snapshot).where(snapshot.checkpoint_id == checkpoint.id))
+    db.delete(checkpoint)
@@ -0,0 +1,120 @@
+"""
+Typed columnar export of auction data for analysis.
+
+Players, teams, bids and auctions are written as Parquet files or Arrow IPC
+streams with real column types instead of spreadsheet text:
+- enums are dictionary-encoded strings;
+- money is whole rupees in int64;
+- timestamps are timestamp[us];
+- nullable columns stay null.
+The Arrow types follow the SQLAlchemy column types, so columns added to the
+models are exported without touching this module. Image and logo blobs are
+left out.
+
+Building an export reads whole tables and compresses them, so callers run it
+in the threadpool rather than on the event loop.
+"""
+import io
+import zipfile
+from typing import Dict, Iterable, List
+from sqlalchemy import Boolean, DateTime, Enum, Float, Integer, select
+from database import ReadSessionLocal
+from lazy_imports import get_pyarrow, get_pyarrow_parquet
+from models import Auction, Bid, Player, Team
+
+PARQUET = "parquet"
+ARROW = "arrow"
+FORMATS = {
+    PARQUET: (".parquet", "application/vnd.apache.parquet"),
+    ARROW: (".arrow", "application/vnd.apache.arrow.stream"),
+}
+
+# Table name -> (model, columns left out)
+EXPORT_TABLES = {
+    "players": (Player, {"player_image", "photo_url", "payment_id"}),
+    "teams": (Team, {"team_logo"}),
+    "bids": (Bid, set()),
+    "auctions": (Auction, set()),
+}
+
+# Float columns holding rupee amounts, exported as integers
+MONEY_COLUMNS = {"budget", "remaining_budget", "base_price", "sold_price", "amount", "bid_amount", "current_bid_amount"}
+
+READ_BATCH_ROWS = 5000
+
+def _arrow_type(pa, column):
+    if column.name in MONEY_COLUMNS:
+        return pa.int64()
+    if isinstance(column.type, Enum):
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+def _convert(column, values: List) -> List:
+    if column.name in MONEY_COLUMNS:
+        return [None if value is None else int(round(value)) for value in values]
+    if isinstance(column.type, Enum):
+        return [None if value is None else value.value for value in values]
+    return values
+
+def build_table(db, name: str):
+    """One export table as a pyarrow.Table"""
+    pa = get_pyarrow()
+    model, excluded = EXPORT_TABLES[name]
+    columns = [column for column in model.__table__.columns if column.name not in excluded]
+    values: Dict[str, List] = {column.name: [] for column in columns}
+    result = db.execute(
+        select(*columns).order_by(model.__table__.c.id).execution_options(yield_per=READ_BATCH_ROWS)
+    )
+    for rows in result.partitions():
+        for index, column in enumerate(columns):
+            values[column.name].extend(row[index] for row in rows)
+
+    arrays, fields = [], []
+    for column in columns:
+        arrow_type = _arrow_type(pa, column)
+        data = _convert(column, values.pop(column.name))
+        if pa.types.is_dictionary(arrow_type):
+            array = pa.array(data, type=pa.string()).dictionary_encode()
+        else:
+            array = pa.array(data, type=arrow_type)
+        arrays.append(array)
+        fields.append(pa.field(column.name, array.type, nullable=bool(column.nullable)))
+    money = [column.name for column in columns if column.name in MONEY_COLUMNS]
+    metadata = {"table": name, "currency": "INR", "money_columns": ",".join(money)}
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+def write_table(table, fmt: str) -> bytes:
+    pa = get_pyarrow()
+    buffer = io.BytesIO()
+    if fmt == PARQUET:
+        get_pyarrow_parquet().write_table(table, buffer, compression="zstd")
+    else:
+        with pa.ipc.new_stream(buffer, table.schema) as writer:
+            writer.write_table(table)
+    return buffer.getvalue()
+
+def build_export(fmt: str, tables: Iterable[str]) -> Dict[str, bytes]:
+    """File name -> contents for each requested table"""
+    extension = FORMATS[fmt][0]
+    db = ReadSessionLocal()
+    try:
+        return {f"{name}{extension}": write_table(build_table(db, name), fmt) for name in tables}
+    finally:
+        db.close()
+
+def zip_files(files: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            # Parquet files are compressed already; Arrow streams are not
+            compression = zipfile.ZIP_STORED if name.endswith(".parquet") else zipfile.ZIP_DEFLATED
+            archive.writestr(name, data, compress_type=compression)
+    return buffer.getvalue()
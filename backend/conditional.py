@@ -0,0 +1,51 @@
+"""
+Conditional GET (ETag / If-None-Match) for read endpoints.
+
+A list's version is read with one aggregate query (row count, newest
+updated_at, highest id), which changes whenever a row is added, updated or
+removed. Endpoints compare the ETag built from it with If-None-Match before
+loading any rows, so an unchanged list costs that one query and a 304.
+"""
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+def table_version(db: Session, model) -> tuple:
+    """Row count, newest updated_at and highest id of a table"""
+    return tuple(db.query(func.count(model.id), func.max(model.updated_at), func.max(model.id)).one())
+
+def version_columns(*models) -> list:
+    """table_version() of each table as scalar subqueries, to select in one query"""
+    return [
+        select(aggregate).select_from(model).scalar_subquery()
+        for model in models
+        for aggregate in (func.count(model.id), func.max(model.updated_at), func.max(model.id))
+    ]
+
+def tables_version(db: Session, *models) -> tuple:
+    """table_version() of several tables in one query"""
+    return tuple(db.execute(select(*version_columns(*models))).one())
+
+def make_etag(*parts) -> str:
+    """Strong ETag from a version plus anything else that shapes the response (filters, etc.)"""
+    return '"' + hashlib.sha1(repr(parts).encode()).hexdigest()[:20] + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but revalidate it on every use
+    response.headers["Cache-Control"] = "no-cache"
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
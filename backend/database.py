@@ -1,24 +1,240 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, Enum, String, create_engine, event, select, type_coerce
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from contextvars import ContextVar
+import itertools
 import os
+import sqlite3
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./gpl_auction.db")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Named engine profiles, selected with DB_PROFILE. Each profile carries the
+# create_engine() arguments and, for SQLite, the pragmas applied to every new
+# connection. Pool sizes can be overridden per deployment through env vars.
+ENGINE_PROFILES = {
+    "dev-sqlite": {
+        "engine_args": {
+            "connect_args": {"check_same_thread": False},
+            "query_cache_size": 500,
+        },
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,  # 16 MB
+            "mmap_size": 64 * 1024 * 1024,
+            "busy_timeout": 5000,
+        },
+    },
+    "prod-sqlite": {
+        "engine_args": {
+            # pysqlite keeps this many prepared statements per connection
+            "connect_args": {"check_same_thread": False, "cached_statements": 256},
+            "query_cache_size": 1200,
+        },
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,  # 64 MB
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+    },
+    "prod-postgres": {
+        "engine_args": {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "pool_pre_ping": True,
+            "query_cache_size": 1200,
+        },
+        "pragmas": {},
+    },
+}
+
+def default_profile_name(database_url: str) -> str:
+    """Pick a profile from the URL when DB_PROFILE is not set"""
+    return "dev-sqlite" if database_url.startswith("sqlite") else "prod-postgres"
+
+def build_engine(database_url: str, profile_name: str = None):
+    """Create an engine configured from a named profile"""
+    profile_name = profile_name or default_profile_name(database_url)
+    if profile_name not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{profile_name}'. Choose from: {', '.join(ENGINE_PROFILES)}")
+
+    profile = ENGINE_PROFILES[profile_name]
+    is_sqlite = database_url.startswith("sqlite")
+    if is_sqlite != profile_name.endswith("sqlite"):
+        raise ValueError(f"DB_PROFILE '{profile_name}' does not match database URL")
+
+    new_engine = create_engine(database_url, **profile["engine_args"])
+
+    pragmas = profile["pragmas"]
+    if pragmas:
+        @event.listens_for(new_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return new_engine
+
+DB_PROFILE = os.getenv("DB_PROFILE") or default_profile_name(DATABASE_URL)
+
+engine = build_engine(DATABASE_URL, DB_PROFILE)
+
+# Read replicas: comma separated URLs. For local testing these can be file
+# copies of the SQLite database (see refresh_sqlite_replicas) or a second
+# Postgres server.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_PROFILE = os.getenv("DB_REPLICA_PROFILE") or None
+
+# After a client writes, its reads stay on the primary for this long so that
+# it does not read stale data from a replica that has not caught up yet. Set
+# it above the replica lag observed in production (pg_stat_replication
+# replay_lag on Postgres); a shorter window lets a client miss its own write.
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "1"))
+
+replica_engines = [build_engine(url, DB_REPLICA_PROFILE) for url in DATABASE_REPLICA_URLS]
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+# Per-request write marker, installed by ReadYourWritesMiddleware. It holds a
+# mutable dict so that writes made inside threadpool dependencies are seen by
+# the rest of the request. "last_write" is the client's previous write, as
+# echoed back in the LAST_WRITE_HEADER request header.
+_request_writes: ContextVar = ContextVar("request_writes", default=None)
+
+# Sent on every response to a request that wrote, with the write's time; the
+# client sends it back on later requests. A wall clock time, so that any
+# worker can compare it.
+LAST_WRITE_HEADER = "X-Last-Write"
+
+def _mark_write():
+    state = _request_writes.get()
+    if state is not None:
+        state["wrote"] = True
+
+def _must_read_primary() -> bool:
+    """True while the current client may not see its own writes on a replica"""
+    state = _request_writes.get()
+    if state is None:
+        return False  # no client to keep consistent (background jobs, scripts)
+    return state["wrote"] or time.time() - state["last_write"] < REPLICA_MAX_LAG_SECONDS
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica unless the primary is required"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if _replica_cycle is None or self._flushing or _must_read_primary():
+            return engine
+        self.info["replica_read"] = True
+        return next(_replica_cycle)
+
+def read_from_replica(db: Session) -> bool:
+    """True once the session has read from a replica, which may not have every commit yet"""
+    return db.info.get("replica_read", False)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(SessionLocal, "after_flush")
+def _after_flush(session, flush_context):
+    _mark_write()
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _after_orm_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write()
+
+def _last_write(scope) -> float:
+    name = LAST_WRITE_HEADER.lower().encode()
+    for key, value in scope["headers"]:
+        if key == name:
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 0.0
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware that gives each HTTP request its own write marker, and
+    stamps responses to requests that wrote with LAST_WRITE_HEADER
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = {"wrote": False, "last_write": _last_write(scope)}
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and state["wrote"]:
+                headers = list(message.get("headers", []))
+                headers.append((LAST_WRITE_HEADER.lower().encode(), repr(time.time()).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _request_writes.set(state)
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _request_writes.reset(token)
+
+def refresh_sqlite_replicas():
+    """Copy the primary SQLite database into every SQLite replica file"""
+    if not DATABASE_URL.startswith("sqlite"):
+        raise ValueError("refresh_sqlite_replicas only works with a SQLite primary")
+    source = engine.raw_connection()
+    try:
+        for replica in replica_engines:
+            target = sqlite3.connect(replica.url.database)
+            try:
+                source.driver_connection.backup(target)
+            finally:
+                target.close()
+            replica.dispose()
+    finally:
+        source.close()
 
 Base = declarative_base()
 
+def stored_rows(db: Session, columns, *criteria) -> list:
+    """
+    Rows of `columns` as stored, for bulk reads fed straight into numpy or
+    pandas: enum columns come back as member names and datetimes as text,
+    and no ORM entities are built. The statement runs on the session's
+    connection like any other, so bound parameters in `criteria` work with
+    every driver.
+    """
+    selected = []
+    for column in columns:
+        column = column.expression  # the table column behind a mapped attribute
+        if isinstance(column.type, (Enum, DateTime)):
+            column = type_coerce(column, String).label(column.key)
+        selected.append(column)
+    return db.connection().execute(select(*selected).where(*criteria)).all()
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Session for read-only endpoints; uses a replica when one is configured"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
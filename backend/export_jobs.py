@@ -0,0 +1,185 @@
+"""
+Background export jobs with a disk cache of finished files.
+
+Building a workbook is CPU-bound Python (openpyxl, XML, deflate). Running it
+in the request, or even in a thread, competes with the live auction for the
+event loop and the GIL, so exports are built in a separate worker process.
+
+A job's id is derived from the export kind and the version of the tables it
+reads (row count, newest updated_at and highest id, as for ETags). Asking
+again while nothing has changed therefore returns the same job, and its
+finished file is served straight from disk. Job state also lives on disk,
+next to the artifacts, so any worker on the host can report on a job:
+- <id>.part while it is being built;
+- <id><ext> once it is done;
+- <id>.error if it failed.
+"""
+import asyncio
+import hashlib
+import importlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from conditional import table_version
+from models import OwnerRegistration, Player, Team
+from xlsx_stream import XLSX_MEDIA_TYPE
+
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "gpl_exports"))
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "1"))
+# A .part file older than this belongs to a build that died with its worker
+EXPORT_JOB_TIMEOUT = int(os.getenv("EXPORT_JOB_TIMEOUT", "600"))
+
+class ExportKind:
+    def __init__(self, name: str, filename: str, media_type: str, models: tuple, builder: str):
+        self.name = name
+        self.filename = filename  # may contain {timestamp}
+        self.media_type = media_type
+        self.models = models  # tables whose version keys the cached file
+        self.builder = builder  # "module:function", called with the output path in the worker
+        self.extension = os.path.splitext(filename)[1]
+
+EXPORT_KINDS = {
+    kind.name: kind for kind in (
+        ExportKind("players", "gpl_players.xlsx", XLSX_MEDIA_TYPE, (Player, Team),
+                   "routers.players:write_players_export"),
+        ExportKind("teams", "gpl_teams.xlsx", XLSX_MEDIA_TYPE, (Team,),
+                   "routers.teams:write_teams_export"),
+        ExportKind("owner-registrations", "GPL_Season2_Owner_Registrations_{timestamp}.xlsx", XLSX_MEDIA_TYPE,
+                   (OwnerRegistration,), "routers.owner_registration:write_owner_registrations_export"),
+    )
+}
+
+def _build(builder: str, part_path: str, artifact_path: str):
+    """Runs in the worker process"""
+    module_name, function_name = builder.split(":")
+    getattr(importlib.import_module(module_name), function_name)(part_path)
+    os.replace(part_path, artifact_path)
+
+class ExportJobs:
+    def __init__(self, directory: str, workers: int):
+        self.directory = directory
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def stop(self):
+        """Drop queued builds and wait for the running ones, so no worker process outlives the app"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def job_id(self, db: Session, kind: ExportKind) -> str:
+        version = repr(tuple(table_version(db, model) for model in kind.models))
+        return f"{kind.name}-{hashlib.sha1(version.encode()).hexdigest()[:16]}"
+
+    def kind_of(self, job_id: str) -> Optional[ExportKind]:
+        return EXPORT_KINDS.get(job_id.rsplit("-", 1)[0])
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, job_id + suffix)
+
+    def artifact_path(self, job_id: str) -> str:
+        return self._path(job_id, self.kind_of(job_id).extension)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        kind = self.kind_of(job_id)
+        if kind is None:
+            return None
+        job = {"job_id": job_id, "kind": kind.name}
+        artifact = self.artifact_path(job_id)
+        if os.path.exists(artifact):
+            return dict(job, status="done", size=os.path.getsize(artifact),
+                        download_url=f"/api/exports/jobs/{job_id}/download")
+        future = self._futures.get(job_id)
+        if future is not None and not future.done():
+            return dict(job, status="running" if future.running() else "queued")
+        error = self._path(job_id, ".error")
+        if os.path.exists(error):
+            with open(error) as f:
+                return dict(job, status="failed", error=f.read())
+        part = self._path(job_id, ".part")
+        if os.path.exists(part) and time.time() - os.path.getmtime(part) < EXPORT_JOB_TIMEOUT:
+            # Being built by another worker process of this app
+            return dict(job, status="running")
+        return None
+
+    def submit(self, db: Session, kind_name: str) -> dict:
+        """Start building the current version of an export, unless it is built or underway"""
+        kind = EXPORT_KINDS[kind_name]
+        job_id = self.job_id(db, kind)
+        with self._lock:
+            job = self.status(job_id)
+            if job is not None and job["status"] != "failed":
+                return job
+            os.makedirs(self.directory, exist_ok=True)
+            for suffix in (".error", ".part"):
+                if os.path.exists(self._path(job_id, suffix)):
+                    os.remove(self._path(job_id, suffix))
+            part = self._path(job_id, ".part")
+            open(part, "wb").close()
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            future = self._executor.submit(_build, kind.builder, part, self.artifact_path(job_id))
+            self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._finished(job_id, done))
+        return self.status(job_id) or {"job_id": job_id, "kind": kind.name, "status": "queued"}
+
+    def _finished(self, job_id: str, future: Future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    # A worker died (killed, out of memory); the next job gets a fresh pool
+                    self._executor = None
+                part = self._path(job_id, ".part")
+                if os.path.exists(part):
+                    os.remove(part)
+                with open(self._path(job_id, ".error"), "w") as f:
+                    f.write("Cancelled" if error is None else f"{type(error).__name__}: {error}")
+                return
+            # Older versions of the same export will never be asked for again
+            kind = self.kind_of(job_id)
+            for name in os.listdir(self.directory):
+                stem, extension = os.path.splitext(name)
+                if stem != job_id and self.kind_of(stem) is kind and extension in (kind.extension, ".error"):
+                    os.remove(os.path.join(self.directory, name))
+
+    async def artifact(self, db: Session, kind_name: str) -> str:
+        """Path of the current version of an export, building it first if needed"""
+        job = self.submit(db, kind_name)
+        deadline = time.monotonic() + EXPORT_JOB_TIMEOUT
+        while job["status"] in ("queued", "running"):
+            future = self._futures.get(job["job_id"])
+            if future is not None:
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception:
+                    pass
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"Export {job['job_id']} did not finish")
+            else:
+                await asyncio.sleep(0.2)
+            job = self.status(job["job_id"]) or {"job_id": job["job_id"], "status": "failed", "error": "Export disappeared"}
+        if job["status"] == "failed":
+            raise RuntimeError(job["error"])
+        return self.artifact_path(job["job_id"])
+
+    def cached_artifact(self, db: Session, kind_name: str) -> Optional[str]:
+        """Path of the current version of an export if it has already been built"""
+        path = self.artifact_path(self.job_id(db, EXPORT_KINDS[kind_name]))
+        return path if os.path.exists(path) else None
+
+def download_filename(kind: ExportKind) -> str:
+    return kind.filename.format(timestamp=datetime.now().strftime('%Y%m%d_%H%M%S'))
+
+export_jobs = ExportJobs(EXPORT_CACHE_DIR, EXPORT_WORKERS)
@@ -0,0 +1,261 @@
+"""
+Squad feasibility: can every team still fill its minimum squad?
+
+calculate_max_bid_limit() reserves BASE_PLAYER_PRICE for each missing slot
+without knowing whether the players are there to be bought. This keeps the
+pool of players still to be auctioned (available and paid) in memory,
+counted per league, role and base price, and derives each team's
+guaranteed max bid from it: the most it can pay for the current lot and
+still complete its squad at base prices, however the other teams fill
+theirs.
+
+The worst case for a team is that every other team buys the cheapest players
+left up to their own minimums, and the lot on the block was the cheapest of
+all. Its reserve is then the base prices of the next players after those.
+If the pool cannot cover every team's minimum, nothing can be guaranteed
+and the plain reserve rule applies.
+
+Pool changes are collected from flushed Player rows and applied when the
+session commits, like purse updates, so a sale or unsold lot costs a counter
+update. Computing the limits is O(teams x distinct base prices). Bulk
+statements that touch the pool columns make it reload.
+
+The pool and purses in memory only follow this process's commits, so the
+feasibility summary can lag a sale made by another worker. The bid cap must
+not: max_bid() reads the other teams' needs and the pool's base prices from
+the database, in one aggregate query inside the bid's transaction.
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Float, case, cast, event, func, inspect, null, select, union_all
+from sqlalchemy.orm import Session
+from models import Player as PlayerModel, PlayerStatus, Team as TeamModel
+from purse import BASE_PLAYER_PRICE, MINIMUM_PLAYERS, max_bid_for, projection
+
+# Player columns that decide whether, and in which bucket, a player is in the pool
+POOL_COLUMNS = ("status", "registration_fee_paid", "league", "role", "base_price")
+# Column defaults of a new player whose attributes were never set
+_INSERT_DEFAULTS = {"status": PlayerStatus.REGISTERED, "registration_fee_paid": False, "league": None, "base_price": None}
+
+def _price(base_price) -> float:
+    return BASE_PLAYER_PRICE if base_price is None else base_price
+
+def guaranteed_reserve(prices: List[Tuple[float, int]], skip: int, take: int) -> Optional[float]:
+    """
+    Cost of the `take` cheapest players after the `skip` cheapest, from
+    (price, count) pairs in ascending price order; None if the pool runs out.
+    """
+    total = 0.0
+    for price, count in prices:
+        if take <= 0:
+            break
+        if skip >= count:
+            skip -= count
+            continue
+        used = min(count - skip, take)
+        skip = 0
+        total += used * price
+        take -= used
+    return None if take > 0 else total
+
+def guaranteed_max_bid(remaining_budget: float, players_count: int, others_needed: int,
+                       prices: List[Tuple[float, int]]) -> Tuple[float, bool]:
+    """(max bid, whether the squad is guaranteed fillable) for a team bidding on the current lot"""
+    limit = max_bid_for(remaining_budget, players_count)
+    needed = MINIMUM_PLAYERS - players_count
+    if needed <= 0:
+        return limit, True
+    # Skip what the other teams need plus the lot on the block, then price this team's other slots
+    reserve = guaranteed_reserve(prices, others_needed + 1, needed - 1)
+    if reserve is None:
+        return limit, False
+    return min(limit, max(remaining_budget - reserve, BASE_PLAYER_PRICE)), True
+
+class SquadFeasibility:
+    """Players left to auction per league, loaded once and kept current"""
+
+    def __init__(self):
+        self._pools: Dict[Optional[str], Counter] = {}  # league -> (role, base price) -> players
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        rows = db.execute(
+            select(PlayerModel.league, PlayerModel.role, PlayerModel.base_price, func.count())
+            .where(PlayerModel.status == PlayerStatus.AVAILABLE, PlayerModel.registration_fee_paid == True)
+            .group_by(PlayerModel.league, PlayerModel.role, PlayerModel.base_price)
+        ).all()
+        pools: Dict[Optional[str], Counter] = {}
+        for league, role, base_price, count in rows:
+            pools.setdefault(league, Counter())[(role, _price(base_price))] += count
+        with self._lock:
+            self._pools = pools
+            self._loaded = True
+
+    def invalidate(self):
+        """Drop the pool; the next reader reloads it from the database"""
+        with self._lock:
+            self._pools = {}
+            self._loaded = False
+
+    def apply(self, bucket: tuple, delta: int):
+        league, role, base_price = bucket
+        with self._lock:
+            if not self._loaded:
+                return
+            pool = self._pools.setdefault(league, Counter())
+            pool[(role, base_price)] += delta
+            if pool[(role, base_price)] <= 0:
+                del pool[(role, base_price)]
+
+    def pool(self, db: Session, league: Optional[str] = None) -> Counter:
+        """(role, base price) -> players left, in one league or, without one, all of them"""
+        self.ensure_loaded(db)
+        with self._lock:
+            if league:
+                return Counter(self._pools.get(league, ()))
+            return sum(self._pools.values(), Counter())
+
+    def _prices(self, pool: Counter) -> List[Tuple[float, int]]:
+        prices = Counter()
+        for (_, base_price), count in pool.items():
+            prices[base_price] += count
+        return sorted(prices.items())
+
+    def max_bid(self, db: Session, team: TeamModel, league: Optional[str] = None) -> float:
+        """The team's guaranteed max bid for the current lot of an auction in `league`, from the database"""
+        if team.players_count >= MINIMUM_PLAYERS:
+            return max_bid_for(team.remaining_budget, team.players_count)
+        others_needed, prices = bid_inputs(db, team.id, league)
+        limit, _ = guaranteed_max_bid(team.remaining_budget, team.players_count, others_needed, prices)
+        return limit
+
+    def summary(self, db: Session, league: Optional[str] = None) -> dict:
+        pool = self.pool(db, league)
+        purses = projection.all(db, league)
+        prices = self._prices(pool)
+        total_needed = sum(purse.players_needed for purse in purses)
+        roles = Counter()
+        for (role, _), count in pool.items():
+            roles[getattr(role, "value", role)] += count
+        teams = []
+        for purse in purses:
+            limit, fillable = guaranteed_max_bid(
+                purse.remaining_budget, purse.players_count, total_needed - purse.players_needed, prices
+            )
+            teams.append(dict(purse.to_dict(), guaranteed_max_bid_limit=limit, squad_fillable=fillable))
+        players_left = sum(pool.values())
+        return {
+            "league": league,
+            "pool": {
+                "players": players_left,
+                "by_role": dict(sorted(roles.items())),
+                "by_base_price": {price: count for price, count in prices},
+            },
+            "players_needed": total_needed,
+            "shortfall": max(0, total_needed - players_left),
+            "teams": teams,
+        }
+
+feasibility = SquadFeasibility()
+
+def bid_inputs(db: Session, team_id: int, league: Optional[str] = None) -> Tuple[int, List[Tuple[float, int]]]:
+    """
+    (players the other teams still need, (base price, players) pairs of the
+    pool in ascending price order) in one query, so every worker caps bids
+    on what is committed rather than on its own cache
+    """
+    needed = func.sum(case(
+        (TeamModel.players_count < MINIMUM_PLAYERS, MINIMUM_PLAYERS - TeamModel.players_count), else_=0
+    ))
+    teams = select(cast(null(), Float).label("price"), needed.label("players")).where(TeamModel.id != team_id)
+    price = func.coalesce(PlayerModel.base_price, BASE_PLAYER_PRICE)
+    pool = select(price.label("price"), func.count().label("players")).where(
+        PlayerModel.status == PlayerStatus.AVAILABLE, PlayerModel.registration_fee_paid == True
+    ).group_by(price)
+    if league:
+        teams = teams.where(TeamModel.league == league)
+        pool = pool.where(PlayerModel.league == league)
+    others_needed, prices = 0, []
+    for row_price, players in db.execute(union_all(teams, pool)).all():
+        if row_price is None:
+            others_needed = int(players or 0)
+        else:
+            prices.append((row_price, players))
+    return others_needed, sorted(prices)
+
+def _bucket(values: dict) -> Optional[tuple]:
+    """(league, role, base price) of a player in the pool, None if outside it; KeyError if unknown"""
+    if values["status"] != PlayerStatus.AVAILABLE or not values["registration_fee_paid"]:
+        return None
+    return (values["league"], values["role"], _price(values["base_price"]))
+
+def _pool_change(player: PlayerModel, new: bool, deleted: bool) -> Tuple[Optional[tuple], Optional[tuple]]:
+    """The player's pool bucket before and after this flush"""
+    state = inspect(player)
+    before, after, changed = {}, {}, False
+    for key in POOL_COLUMNS:
+        history = state.attrs[key].history
+        if history.unchanged:
+            before[key] = after[key] = history.unchanged[0]
+        if history.deleted:
+            before[key] = history.deleted[0]
+        if history.added:
+            after[key] = history.added[0]
+            changed = True
+    if new:
+        return None, _bucket(dict(_INSERT_DEFAULTS, **after))
+    if deleted:
+        return _bucket(before), None
+    if not changed:
+        return None, None
+    return _bucket(before), _bucket(dict(before, **after))
+
+@event.listens_for(Session, "after_flush")
+def _collect_pool_changes(session, flush_context):
+    changes = session.info.setdefault("pool_changes", [])
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, PlayerModel):
+            continue
+        try:
+            before, after = _pool_change(obj, obj in session.new, obj in session.deleted)
+        except KeyError:
+            # A pool column was never loaded, so its old value is unknown
+            session.info["pool_reload"] = True
+            continue
+        if before != after:
+            if before is not None:
+                changes.append((before, -1))
+            if after is not None:
+                changes.append((after, 1))
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_pool_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, PlayerModel):
+        return
+    parameters = orm_execute_state.parameters
+    # Bulk updates by primary key (ratings, auction order) name their columns
+    if (orm_execute_state.is_update and isinstance(parameters, list) and parameters
+            and not set(parameters[0]) & set(POOL_COLUMNS)):
+        return
+    orm_execute_state.session.info["pool_reload"] = True
+
+@event.listens_for(Session, "after_commit")
+def _apply_pool_changes(session):
+    changes = session.info.pop("pool_changes", [])
+    if session.info.pop("pool_reload", False):
+        feasibility.invalidate()
+        return
+    for bucket, delta in changes:
+        feasibility.apply(bucket, delta)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pool_changes(session):
+    session.info.pop("pool_changes", None)
+    session.info.pop("pool_reload", None)
@@ -0,0 +1,58 @@
+"""
+Lazy accessors for heavy dependencies.
+
+pandas, openpyxl, pyarrow, bs4/requests and razorpay together add well over
+a second to `import main`. None of them are needed to serve the live auction,
+so they are only imported the first time an export, a CricHeroes lookup or a
+payment actually needs them.
+"""
+import importlib
+import importlib.util
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _load(module_name: str):
+    return importlib.import_module(module_name)
+
+
+@lru_cache(maxsize=None)
+def is_available(*module_names: str) -> bool:
+    """Check that modules are installed without importing them"""
+    return all(importlib.util.find_spec(name) is not None for name in module_names)
+
+
+def get_numpy():
+    return _load("numpy")
+
+
+def get_pandas():
+    return _load("pandas")
+
+
+def get_openpyxl():
+    return _load("openpyxl")
+
+
+def get_openpyxl_styles():
+    return _load("openpyxl.styles")
+
+
+def get_pyarrow():
+    return _load("pyarrow")
+
+
+def get_pyarrow_parquet():
+    return _load("pyarrow.parquet")
+
+
+def get_requests():
+    return _load("requests")
+
+
+def get_beautifulsoup():
+    return _load("bs4").BeautifulSoup
+
+
+def get_razorpay():
+    return _load("razorpay")
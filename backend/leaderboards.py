@@ -0,0 +1,212 @@
+"""
+Live leaderboards for the big screen.
+
+Most expensive buys, top spending teams, biggest bidding wars and the record
+price for each role are kept in memory, per league and overall, and updated
+from each sale and refund instead of being recomputed with SQL for every
+viewer. Sales and refunds are queued on the session by record_sold() /
+record_released() and applied when it commits, like purse updates. The
+boards are loaded from the database at startup, and dropped and reloaded
+whenever a reset or an edit makes the incremental updates unreliable.
+
+Other workers' sales and refunds only reach this one through the database,
+so the boards keep the version they were built from (players and teams,
+plus the bids' count and highest id) and every read compares it with the database's
+in one query, reloading when it has moved on.
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from conditional import version_columns
+from models import Bid as BidModel, Player as PlayerModel, PlayerStatus, Team as TeamModel
+
+LEADERBOARD_SIZE = 10
+
+class RankedBoard:
+    """Entries ordered by score, highest first; ties go to the lower id"""
+
+    def __init__(self):
+        self._order: List[tuple] = []  # (negated score, entry id), ascending
+        self._entries: Dict[int, tuple] = {}  # entry id -> (sort key, entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, entry_id: int) -> Optional[dict]:
+        item = self._entries.get(entry_id)
+        return None if item is None else item[1]
+
+    def put(self, entry_id: int, score: tuple, entry: dict):
+        self.remove(entry_id)
+        key = (tuple(-value for value in score), entry_id)
+        insort(self._order, key)
+        self._entries[entry_id] = (key, entry)
+
+    def remove(self, entry_id: int):
+        item = self._entries.pop(entry_id, None)
+        if item is not None:
+            del self._order[bisect_left(self._order, item[0])]
+
+    def top(self, count: int = LEADERBOARD_SIZE) -> List[dict]:
+        return [self._entries[entry_id][1] for _, entry_id in self._order[:count]]
+
+class LeagueBoards:
+    """The boards for one league, or for every player when league is None"""
+
+    def __init__(self):
+        self.buys = RankedBoard()  # player id -> sale
+        self.spenders = RankedBoard()  # team id -> spend
+        self.bid_wars = RankedBoard()  # player id -> bids on the lot that sold them
+        self.roles: Dict[str, RankedBoard] = {}  # role -> sales
+
+    def add_sale(self, sale: dict):
+        self.buys.put(sale["player_id"], (sale["price"],), sale)
+        self.roles.setdefault(sale["role"], RankedBoard()).put(sale["player_id"], (sale["price"],), sale)
+        if sale["bids"]:
+            self.bid_wars.put(sale["player_id"], (sale["bids"], sale["teams"]), sale)
+        spender = self.spenders.get(sale["team_id"]) or {
+            "team_id": sale["team_id"], "team_name": sale["team_name"], "spent": 0, "players": 0
+        }
+        spender = dict(spender, spent=spender["spent"] + sale["price"], players=spender["players"] + 1)
+        self.spenders.put(sale["team_id"], (spender["spent"],), spender)
+
+    def remove_sale(self, player_id: int):
+        sale = self.buys.get(player_id)
+        if sale is None:
+            return
+        self.buys.remove(player_id)
+        self.roles[sale["role"]].remove(player_id)
+        self.bid_wars.remove(player_id)
+        spender = self.spenders.get(sale["team_id"])
+        if spender["players"] <= 1:
+            self.spenders.remove(sale["team_id"])
+        else:
+            spender = dict(spender, spent=spender["spent"] - sale["price"], players=spender["players"] - 1)
+            self.spenders.put(sale["team_id"], (spender["spent"],), spender)
+
+    def to_dict(self) -> dict:
+        records = {role: board.top(1)[0] for role, board in sorted(self.roles.items()) if len(board)}
+        return {
+            "most_expensive_buys": self.buys.top(),
+            "top_spenders": self.spenders.top(),
+            "biggest_bid_wars": self.bid_wars.top(),
+            "role_records": records,
+        }
+
+def boards_version(db: Session) -> tuple:
+    """Version of the players and teams tables, plus the bids' count and highest id (bids have no updated_at)"""
+    return tuple(db.execute(select(
+        *version_columns(PlayerModel, TeamModel),
+        select(func.count(BidModel.id)).scalar_subquery(),
+        select(func.max(BidModel.id)).scalar_subquery(),
+    )).one())
+
+class Leaderboards:
+    """Every league's boards, loaded once and kept current"""
+
+    def __init__(self):
+        self._boards: Dict[Optional[str], LeagueBoards] = {}
+        self._loaded = False
+        self._version: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session, version: Optional[tuple] = None):
+        """Load the boards unless they are loaded and, if a version is given, built from it"""
+        if self._loaded and (version is None or version == self._version):
+            return
+        if version is None:
+            version = boards_version(db)
+        sales = db.execute(
+            select(
+                PlayerModel.id, PlayerModel.name, PlayerModel.role, PlayerModel.sold_price,
+                PlayerModel.league, TeamModel.id.label("team_id"), TeamModel.name.label("team_name")
+            )
+            .join(TeamModel, PlayerModel.team_id == TeamModel.id)
+            .where(PlayerModel.status == PlayerStatus.SOLD, PlayerModel.sold_price.isnot(None))
+            .order_by(PlayerModel.id)
+        ).all()
+        wars = {
+            row.player_id: (row.bids, row.teams)
+            for row in db.execute(
+                select(BidModel.player_id, func.count().label("bids"), func.count(BidModel.team_id.distinct()).label("teams"))
+                .join(PlayerModel, BidModel.player_id == PlayerModel.id)
+                .where(PlayerModel.status == PlayerStatus.SOLD)
+                .group_by(BidModel.player_id)
+            )
+        }
+        boards: Dict[Optional[str], LeagueBoards] = {None: LeagueBoards()}
+        for row in sales:
+            bids, teams = wars.get(row.id, (0, 0))
+            sale = sale_entry(row.id, row.name, row.role, row.sold_price, row.team_id, row.team_name, bids, teams)
+            for league in {None, row.league}:
+                boards.setdefault(league, LeagueBoards()).add_sale(sale)
+        with self._lock:
+            self._boards = boards
+            self._version = version
+            self._loaded = True
+
+    def invalidate(self):
+        """Drop the boards; the next reader reloads them from the database"""
+        with self._lock:
+            self._boards = {}
+            self._version = None
+            self._loaded = False
+
+    def snapshot(self, db: Session, league: Optional[str] = None) -> dict:
+        self.ensure_loaded(db, boards_version(db))
+        with self._lock:
+            boards = self._boards.get(league) or LeagueBoards()
+            return dict(boards.to_dict(), league=league)
+
+    def apply(self, change: tuple):
+        kind, league, payload = change
+        with self._lock:
+            if not self._loaded:
+                return
+            for key in {None, league}:
+                boards = self._boards.setdefault(key, LeagueBoards())
+                if kind == "sold":
+                    boards.add_sale(payload)
+                else:
+                    boards.remove_sale(payload)
+
+leaderboards = Leaderboards()
+
+def sale_entry(player_id: int, player_name: str, role, price: float, team_id: int, team_name: str,
+               bids: int, teams: int) -> dict:
+    return {
+        "player_id": player_id,
+        "player_name": player_name,
+        "role": getattr(role, "value", role),
+        "price": price,
+        "team_id": team_id,
+        "team_name": team_name,
+        "bids": bids,
+        "teams": teams,
+    }
+
+def record_sold(db: Session, player: PlayerModel, team: TeamModel, price: float):
+    """
+    Queue a sale for the leaderboards; applied when the session commits.
+    The bid war is counted in the database, which has every worker's bids.
+    """
+    bids, teams = db.execute(
+        select(func.count(), func.count(BidModel.team_id.distinct())).where(BidModel.player_id == player.id)
+    ).one()
+    sale = sale_entry(player.id, player.name, player.role, price, team.id, team.name, bids, teams)
+    db.info.setdefault("leaderboard_changes", []).append(("sold", player.league, sale))
+
+def record_released(db: Session, player: PlayerModel):
+    """Queue taking a sold player off the leaderboards (refunded, back to available or unsold)"""
+    db.info.setdefault("leaderboard_changes", []).append(("released", player.league, player.id))
+
+@event.listens_for(Session, "after_commit")
+def _apply_leaderboard_changes(session):
+    for change in session.info.pop("leaderboard_changes", []):
+        leaderboards.apply(change)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_leaderboard_changes(session):
+    session.info.pop("leaderboard_changes", None)
@@ -0,0 +1,155 @@
+"""
+Streaming list responses for integrations.
+
+List endpoints answer `Accept: application/x-ndjson` or `Accept: text/csv`
+with rows streamed from a server-side cursor (yield_per) instead of one
+JSON array built in memory. Rows are ordered by id and the stream can be
+resumed or paged with an opaque cursor token: with `limit`, the id that ends
+the page is looked up before streaming starts, so X-Next-Cursor is sent as a
+header and the body is just rows. NDJSON lines have the same shape as the
+JSON list items; CSV flattens nested objects into dotted columns
+("team.name").
+"""
+import base64
+import csv
+import io
+import json
+from typing import Callable, Iterable, Optional, Sequence
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from database import ReadSessionLocal
+
+NDJSON = "ndjson"
+CSV = "csv"
+MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv; charset=utf-8"}
+STREAM_BATCH_ROWS = 1000
+STREAM_MAX_LIMIT = 100000
+
+_ACCEPTED = {
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "text/csv": CSV,
+    "application/json": None,
+    "*/*": None,
+}
+
+def stream_format(request: Request) -> Optional[str]:
+    """NDJSON or CSV if the Accept header prefers one, None for the normal JSON response"""
+    offers = []
+    for position, part in enumerate(request.headers.get("accept", "").split(",")):
+        media, _, params = part.partition(";")
+        media = media.strip().lower()
+        if media not in _ACCEPTED:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            offers.append((-quality, position, _ACCEPTED[media]))
+    return min(offers)[2] if offers else None
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).rstrip(b"=").decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Id to continue after. Plain integers (the older X-Next-Cursor format) are still accepted."""
+    if cursor is None:
+        return None
+    if cursor.isdigit():
+        return int(cursor)
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["after"]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(after, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after
+
+def _json_line(item: dict) -> bytes:
+    # Items are mostly JSON-ready already; only the odd datetime goes through jsonable_encoder
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=jsonable_encoder).encode("utf-8")
+
+def _flatten(item: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif value is None or isinstance(value, (str, int, float)):
+            flat[f"{prefix}{key}"] = value
+        else:
+            flat[f"{prefix}{key}"] = jsonable_encoder(value)
+    return flat
+
+def _ndjson_chunks(items: Iterable[dict]):
+    batch = []
+    for item in items:
+        batch.append(_json_line(item))
+        if len(batch) >= STREAM_BATCH_ROWS:
+            yield b"\n".join(batch) + b"\n"
+            batch.clear()
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+def _csv_chunks(items: Iterable[dict]):
+    buffer = io.StringIO()
+    writer = None
+    rows = 0
+    for item in items:
+        row = _flatten(item)
+        if writer is None:
+            # Columns come from the first row; nested objects that are null there stay out
+            writer = csv.DictWriter(buffer, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        rows += 1
+        if rows % STREAM_BATCH_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def _items(model, filters: Sequence, options: Sequence, after: Optional[int], upto: Optional[int],
+           to_item: Callable):
+    # The request's session is closed by the time the body is sent, so the stream has its own
+    db = ReadSessionLocal()
+    try:
+        query = db.query(model).options(*options).filter(*filters)
+        if after is not None:
+            query = query.filter(model.id > after)
+        if upto is not None:
+            query = query.filter(model.id <= upto)
+        for obj in query.order_by(model.id).yield_per(STREAM_BATCH_ROWS):
+            yield to_item(obj)
+    finally:
+        db.close()
+
+def stream_list(fmt: str, db, model, to_item: Callable[[object], dict], filters: Sequence = (),
+                options: Sequence = (), cursor: Optional[str] = None, limit: Optional[int] = None,
+                headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    Stream `model` rows matching `filters` as NDJSON or CSV, after `cursor`
+    and at most `limit` of them. `to_item` turns a row into the dict that
+    the JSON list endpoint would return for it.
+    """
+    after = decode_cursor(cursor)
+    headers = dict(headers or {}, Vary="Accept")
+    upto = None
+    if limit is not None:
+        # Ids of the page's last row and the one after it, if there is one
+        boundary = db.query(model.id).filter(*filters)
+        if after is not None:
+            boundary = boundary.filter(model.id > after)
+        ids = [row[0] for row in boundary.order_by(model.id).offset(limit - 1).limit(2)]
+        if len(ids) == 2:
+            upto = ids[0]
+            headers["X-Next-Cursor"] = encode_cursor(upto)
+    items = _items(model, filters, options, after, upto, to_item)
+    chunks = _ndjson_chunks(items) if fmt == NDJSON else _csv_chunks(items)
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,198 @@
+"""
+Live auction state, sharded per auction.
+
+Each running auction gets its own AuctionShard holding the WebSocket
+connections watching it, so a bid in one room is only serialized once and
+only sent to that room's viewers. Connections that do not name an auction
+join the lobby, which hears every auction (the single-auction behaviour).
+
+A shard also keeps a bounded tail of the bids on the lot currently on the
+block, so the bid history of the player being auctioned is served from
+memory. The tail is seeded from the database on the lot's first bid, grows
+when bids commit, and is dropped whenever the lot closes or its bids change.
+It is only used while it ends at the player's newest bid in the database,
+since bids taken by other workers never reach it.
+
+live_version() reads a version of the auction, bid, player and team tables
+from the database in one query, so cached views of the live auction (and
+their ETags) change with a write committed by any worker, not only this one.
+"""
+import asyncio
+import json
+from collections import deque
+from typing import Dict, List, Optional
+from fastapi import WebSocket
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, selectinload
+import schemas
+from models import Auction as AuctionModel, Bid as BidModel, Player as PlayerModel, Team as TeamModel
+
+BID_TAIL_SIZE = 200
+
+def live_version(db: Session) -> tuple:
+    """
+    Row count, newest updated_at and highest id of the auction, player and
+    team tables, plus the bids' count, highest id and total (bids have no
+    updated_at; the total catches an edited amount), in one query
+    """
+    aggregates = []
+    for model in (AuctionModel, PlayerModel, TeamModel):
+        aggregates += [(model, func.count(model.id)), (model, func.max(model.updated_at)), (model, func.max(model.id))]
+    aggregates += [(BidModel, func.count(BidModel.id)), (BidModel, func.max(BidModel.id)),
+                   (BidModel, func.sum(BidModel.bid_amount))]
+    # A scalar subquery per aggregate, so the tables are never joined
+    return tuple(db.execute(select(*[
+        select(aggregate).select_from(model).scalar_subquery() for model, aggregate in aggregates
+    ])).one())
+
+def bid_history_query(db: Session, player_id: int):
+    """A player's bids, oldest first, with team and player loaded up front"""
+    return (
+        db.query(BidModel)
+        .options(selectinload(BidModel.team), selectinload(BidModel.player))
+        .filter(BidModel.player_id == player_id)
+        .order_by(BidModel.id)
+    )
+
+class AuctionShard:
+    """Live state for one auction"""
+
+    def __init__(self, auction_id: int):
+        self.auction_id = auction_id
+        self.connections: List[WebSocket] = []
+        self.lot_player_id: Optional[int] = None
+        self.bid_tail: Optional[deque] = None
+        # Id of the newest bid pushed out of the tail; older pages need the database
+        self.tail_floor = 0
+
+    def seed_bids(self, player_id: int, bids: list):
+        self.lot_player_id = player_id
+        self.bid_tail = deque(maxlen=BID_TAIL_SIZE)
+        self.tail_floor = 0
+        self.append_bids(player_id, bids)
+
+    def append_bids(self, player_id: int, bids: list):
+        if self.lot_player_id != player_id or self.bid_tail is None:
+            return
+        for bid in bids:
+            if len(self.bid_tail) == BID_TAIL_SIZE:
+                self.tail_floor = self.bid_tail[0].id
+            self.bid_tail.append(bid)
+
+    def clear_bids(self):
+        self.lot_player_id = None
+        self.bid_tail = None
+        self.tail_floor = 0
+
+    def lot_bids(self, player_id: int, after_id: Optional[int] = None) -> Optional[list]:
+        """Bids on the player after after_id, or None if the tail cannot answer"""
+        if self.lot_player_id != player_id or self.bid_tail is None:
+            return None
+        after_id = after_id or 0
+        if after_id < self.tail_floor:
+            return None
+        return [bid for bid in self.bid_tail if bid.id > after_id]
+
+    def tail_end(self) -> Optional[int]:
+        """Id of the newest bid in the tail"""
+        return self.bid_tail[-1].id if self.bid_tail else None
+
+class ConnectionManager:
+    def __init__(self):
+        self.shards: Dict[int, AuctionShard] = {}
+        self.lobby: List[WebSocket] = []
+        # auction_id (None for "the live auction") -> (live_version, body)
+        self.snapshots: Dict[Optional[int], tuple] = {}
+
+    def shard(self, auction_id: int) -> AuctionShard:
+        shard = self.shards.get(auction_id)
+        if shard is None:
+            shard = self.shards[auction_id] = AuctionShard(auction_id)
+        return shard
+
+    def _group(self, auction_id: Optional[int]) -> List[WebSocket]:
+        return self.lobby if auction_id is None else self.shard(auction_id).connections
+
+    async def connect(self, websocket: WebSocket, auction_id: Optional[int] = None):
+        await websocket.accept()
+        self._group(auction_id).append(websocket)
+
+    def disconnect(self, websocket: WebSocket, auction_id: Optional[int] = None):
+        group = self._group(auction_id)
+        if websocket in group:
+            group.remove(websocket)
+
+    def lot_bids(self, db: Session, player_id: int, after_id: Optional[int] = None) -> Optional[list]:
+        """
+        In-memory bid history for a player on the block in any auction, or None.
+        The tail only grows with this worker's commits, so it answers only
+        while it ends at the player's newest bid in the database.
+        """
+        for shard in self.shards.values():
+            bids = shard.lot_bids(player_id, after_id)
+            if bids is not None:
+                newest = db.scalar(select(func.max(BidModel.id)).where(BidModel.player_id == player_id))
+                return bids if shard.tail_end() == newest else None
+        return None
+
+    def clear_player_bids(self, player_id: int):
+        for shard in self.shards.values():
+            if shard.lot_player_id == player_id:
+                shard.clear_bids()
+
+    async def broadcast(self, auction_id: Optional[int], message: dict):
+        """Send a message to one auction's viewers (and the lobby)"""
+        connections = self.lobby
+        if auction_id is not None:
+            connections = self.shard(auction_id).connections + self.lobby
+        await self._send(connections, message)
+
+    async def broadcast_all(self, message: dict):
+        """Send a message to every connected client"""
+        connections = list(self.lobby)
+        for shard in self.shards.values():
+            connections.extend(shard.connections)
+        await self._send(connections, message)
+
+    async def _send(self, connections: List[WebSocket], message: dict):
+        if not connections:
+            return
+        # Serialize once, not once per viewer
+        text = json.dumps(message, default=str, separators=(",", ":"), ensure_ascii=False)
+        results = await asyncio.gather(
+            *(connection.send_text(text) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                for group in [self.lobby] + [shard.connections for shard in self.shards.values()]:
+                    if connection in group:
+                        group.remove(connection)
+
+manager = ConnectionManager()
+
+def record_lot_bids(db: Session, auction_id: int, player_id: int, bids: list):
+    """
+    Queue bids just flushed on the lot on the block for the shard's tail.
+    The tail is updated when the session commits; on the lot's first bid it
+    is seeded with the player's full history instead.
+    """
+    shard = manager.shard(auction_id)
+    seed = shard.lot_player_id != player_id or shard.bid_tail is None
+    if seed:
+        bids = bid_history_query(db, player_id).all()
+    entries = [schemas.BidWithDetails.model_validate(bid) for bid in bids]
+    db.info.setdefault("lot_bids", []).append((auction_id, player_id, entries, seed))
+
+@event.listens_for(Session, "after_commit")
+def _apply_lot_bids(session):
+    for auction_id, player_id, entries, seed in session.info.pop("lot_bids", []):
+        shard = manager.shard(auction_id)
+        if seed:
+            shard.seed_bids(player_id, entries)
+        else:
+            shard.append_bids(player_id, entries)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_lot_bids(session):
+    session.info.pop("lot_bids", None)
@@ -0,0 +1,135 @@
+"""
+Server-side lot timer.
+
+One asyncio task per process keeps a heap of lot deadlines and sleeps until
+the earliest one, so the cost does not grow with the number of viewers or
+running auctions, and nothing ticks every second. Clients are sent the
+authoritative deadline once per reset and run their own countdown against
+it. When a deadline passes, the expiry callback performs the sold/unsold
+transition.
+
+The clock and sleep functions are injectable so the timer can be driven by
+a manual clock instead of real time.
+"""
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+class LotTimer:
+    def __init__(
+        self,
+        on_expire: Callable[[int, int], Awaitable[None]],
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Args:
+            on_expire: coroutine called with (auction_id, player_id) when a lot's time runs out
+            clock: monotonic clock used for scheduling
+            wall_clock: epoch clock used for the deadlines sent to clients
+            sleep: coroutine used to wait; must be cancellable
+        """
+        self.on_expire = on_expire
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.sleep = sleep
+        self._deadlines: Dict[int, tuple] = {}  # auction_id -> (deadline, player_id, generation)
+        self._heap = []
+        self._generation = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self, auction_id: int, player_id: int, duration: float) -> dict:
+        """Start or restart the countdown for the lot on the block. Returns the deadline message."""
+        self._generation += 1
+        deadline = self.clock() + duration
+        self._deadlines[auction_id] = (deadline, player_id, self._generation)
+        heapq.heappush(self._heap, (deadline, self._generation, auction_id))
+        self._ensure_running()
+        self._wakeup.set()
+        return self.describe(auction_id, duration)
+
+    def cancel(self, auction_id: int):
+        # Stale heap entries are skipped when they come up
+        self._deadlines.pop(auction_id, None)
+
+    def remaining(self, auction_id: int) -> Optional[float]:
+        entry = self._deadlines.get(auction_id)
+        if entry is None:
+            return None
+        return max(0.0, entry[0] - self.clock())
+
+    def describe(self, auction_id: int, duration: float = None) -> Optional[dict]:
+        """Deadline as sent to clients: absolute epoch time plus server time for skew correction"""
+        entry = self._deadlines.get(auction_id)
+        if entry is None:
+            return None
+        now_wall = self.wall_clock()
+        remaining = max(0.0, entry[0] - self.clock())
+        message = {
+            "auction_id": auction_id,
+            "player_id": entry[1],
+            "deadline": now_wall + remaining,
+            "server_time": now_wall,
+            "remaining_seconds": remaining
+        }
+        if duration is not None:
+            message["duration_seconds"] = duration
+        return message
+
+    async def stop(self):
+        self._deadlines.clear()
+        self._heap.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _pop_due(self):
+        """Remove and return (auction_id, player_id) for every lot whose deadline has passed"""
+        due = []
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            _, generation, auction_id = heapq.heappop(self._heap)
+            entry = self._deadlines.get(auction_id)
+            if entry is not None and entry[2] == generation:
+                del self._deadlines[auction_id]
+                due.append((auction_id, entry[1]))
+        # Drop superseded entries sitting at the top of the heap
+        while self._heap:
+            deadline, generation, auction_id = self._heap[0]
+            entry = self._deadlines.get(auction_id)
+            if entry is not None and entry[2] == generation:
+                break
+            heapq.heappop(self._heap)
+        return due
+
+    async def _run(self):
+        while True:
+            for auction_id, player_id in self._pop_due():
+                try:
+                    await self.on_expire(auction_id, player_id)
+                except Exception as e:
+                    print(f"Lot timer expiry failed for auction {auction_id}: {e}")
+
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - self.clock()
+            sleeper = asyncio.ensure_future(self.sleep(max(delay, 0)))
+            waker = asyncio.ensure_future(self._wakeup.wait())
+            done, pending = await asyncio.wait({sleeper, waker}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
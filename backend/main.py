@@ -1,28 +1,45 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
 
-from database import engine, Base, get_db
-from routers import players, teams, auction, payments, registration, auth, owner_registration
+from database import engine, Base, get_db, LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from routers import players, teams, auction, payments, registration, auth, owner_registration, analytics, exports, checkpoints
+from response_cache import response_cache, notifier
+from export_jobs import export_jobs
+from auth import get_current_admin_user
+from models import User
 
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Initialize default users
-from auth import init_default_users
-db = next(get_db())
-init_default_users(db)
-db.close()
+def init_database():
+    """Create database tables and default users"""
+    Base.metadata.create_all(bind=engine)
+    
+    from auth import init_default_users
+    from leaderboards import leaderboards
+    from feasibility import feasibility
+    db = next(get_db())
+    try:
+        init_default_users(db)
+        # Rebuild the live leaderboards and player pool before the first sale or viewer
+        leaderboards.ensure_loaded(db)
+        feasibility.ensure_loaded(db)
+    finally:
+        db.close()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup - touch the database here rather than at import time so that
+    # importing the app (workers, tooling, cold starts) stays cheap
+    init_database()
+    notifier.start(engine)
     yield
     # Shutdown
+    notifier.stop()
+    export_jobs.stop()
+    await auction.lot_timer.stop()
 
 app = FastAPI(
     title="Galaxia Premier League Season 2",
@@ -41,8 +58,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", LAST_WRITE_HEADER],
 )
 
+# Keeps a client's reads on the primary after it writes
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(players.router, prefix="/api/players", tags=["players"])
@@ -51,6 +72,9 @@ app.include_router(auction.router, prefix="/api/auction", tags=["auction"])
 app.include_router(payments.router, prefix="/api/payments", tags=["payments"])
 app.include_router(registration.router, prefix="/api/registration", tags=["registration"])
 app.include_router(owner_registration.router, prefix="/api", tags=["owner-registration"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(exports.router, prefix="/api/exports", tags=["exports"])
+app.include_router(checkpoints.router, prefix="/api/checkpoints", tags=["checkpoints"])
 
 @app.get("/")
 async def root():
@@ -63,6 +87,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/admin/cache-stats")
+async def cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """Response cache size and hit/miss/eviction counters for this worker"""
+    return response_cache.stats()
+
 @app.post("/api/admin/migrate-owner-registrations")
 async def migrate_owner_registrations():
     """
@@ -124,3 +153,129 @@ async def migrate_add_auction_order():
             "status": "error",
             "message": str(e)
         }
+
+@app.post("/api/admin/migrate-add-player-rating")
+async def migrate_add_player_rating():
+    """
+    One-time migration endpoint to add the rating column to players table.
+    This endpoint can be called once to update the database schema.
+    """
+    from sqlalchemy import text
+    try:
+        db = next(get_db())
+        migration = "ALTER TABLE players ADD COLUMN IF NOT EXISTS rating FLOAT"
+        
+        db.execute(text(migration))
+        db.commit()
+        db.close()
+        
+        return {
+            "status": "completed",
+            "message": "rating column added successfully",
+            "sql": migration
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+@app.post("/api/admin/migrate-add-auction-updated-at")
+async def migrate_add_auction_updated_at():
+    """
+    One-time migration endpoint to add the updated_at column to auctions table,
+    which versions the live auction views across workers.
+    """
+    from sqlalchemy import text
+    try:
+        db = next(get_db())
+        migration = "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"
+        
+        db.execute(text(migration))
+        db.commit()
+        db.close()
+        
+        return {
+            "status": "completed",
+            "message": "updated_at column added to auctions successfully",
+            "sql": migration
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+@app.post("/api/admin/migrate-add-lot-deadline")
+async def migrate_add_lot_deadline():
+    """
+    One-time migration endpoint to add the lot timer columns to auctions table,
+    which keep the countdown in the database so that every worker sees it.
+    """
+    from sqlalchemy import text
+    try:
+        db = next(get_db())
+        migrations = [
+            "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS lot_timer_seconds FLOAT",
+            "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS lot_deadline TIMESTAMP",
+        ]
+        
+        results = []
+        for migration in migrations:
+            try:
+                db.execute(text(migration))
+                db.commit()
+                results.append({"sql": migration, "status": "success"})
+            except Exception as e:
+                db.rollback()
+                results.append({"sql": migration, "status": "skipped", "error": str(e)})
+        
+        db.close()
+        return {
+            "status": "completed",
+            "message": "Lot timer columns migration executed",
+            "results": results
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+@app.post("/api/admin/migrate-add-leagues")
+async def migrate_add_leagues():
+    """
+    One-time migration endpoint to add league columns used for running
+    several auctions at the same time.
+    """
+    from sqlalchemy import text
+    try:
+        db = next(get_db())
+        migrations = [
+            "ALTER TABLE players ADD COLUMN IF NOT EXISTS league VARCHAR",
+            "ALTER TABLE teams ADD COLUMN IF NOT EXISTS league VARCHAR",
+            "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS name VARCHAR",
+            "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS league VARCHAR",
+        ]
+        
+        results = []
+        for migration in migrations:
+            try:
+                db.execute(text(migration))
+                db.commit()
+                results.append({"sql": migration, "status": "success"})
+            except Exception as e:
+                db.rollback()
+                results.append({"sql": migration, "status": "skipped", "error": str(e)})
+        
+        db.close()
+        return {
+            "status": "completed",
+            "message": "League columns migration executed",
+            "results": results
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
@@ -24,6 +24,15 @@ def migrate_database():
                 "ALTER TABLE players ADD COLUMN IF NOT EXISTS payment_transaction_number VARCHAR",
                 "ALTER TABLE players ADD COLUMN IF NOT EXISTS payment_date TIMESTAMP",
                 "ALTER TABLE players ADD COLUMN IF NOT EXISTS jersey_size VARCHAR",
+                "ALTER TABLE players ADD COLUMN IF NOT EXISTS league VARCHAR",
+                "ALTER TABLE teams ADD COLUMN IF NOT EXISTS league VARCHAR",
+                "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS name VARCHAR",
+                "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS league VARCHAR",
+                "ALTER TABLE players ADD COLUMN IF NOT EXISTS rating FLOAT",
+                "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+                "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS lot_timer_seconds FLOAT",
+                "ALTER TABLE auctions ADD COLUMN IF NOT EXISTS lot_deadline TIMESTAMP",
+                "CREATE INDEX IF NOT EXISTS ix_bids_player_id ON bids (player_id)",
             ]
             
             for migration in migrations:
@@ -89,6 +89,7 @@ class Team(Base):
     budget = Column(Float, default=1000000.0)  # 10 lakhs INR
     remaining_budget = Column(Float, default=1000000.0)
     players_count = Column(Integer, default=0)
+    league = Column(String, nullable=True, index=True)  # Teams only bid in their league's auction
     
     # Team registration details
     owner_name = Column(String, nullable=True)
@@ -149,6 +150,8 @@ class Player(Base):
     sold_price = Column(Float, nullable=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     auction_order = Column(Integer, nullable=True)  # Custom order for auction sequence
+    rating = Column(Float, nullable=True)  # 0-100 from CricHeroes stats, see player_ratings
+    league = Column(String, nullable=True, index=True)  # e.g. junior / senior, for concurrent auctions
     
     # Registration
     registration_fee_paid = Column(Boolean, default=False)
@@ -171,13 +174,18 @@ class Auction(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     season = Column(Integer, default=2)
+    name = Column(String, nullable=True)
+    league = Column(String, nullable=True, index=True)  # None: auction over all players
     status = Column(Enum(AuctionStatus), default=AuctionStatus.NOT_STARTED)
     current_player_id = Column(Integer, ForeignKey("players.id"), nullable=True)
     current_bid_amount = Column(Float, nullable=True)
     current_bidding_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     started_at = Column(DateTime, nullable=True)
     ended_at = Column(DateTime, nullable=True)
+    lot_timer_seconds = Column(Float, nullable=True)  # None: LOT_TIMER_SECONDS
+    lot_deadline = Column(DateTime, nullable=True)  # UTC; when the lot on the block closes, if it is timed
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     bids = relationship("Bid", back_populates="auction")
 
@@ -186,7 +194,7 @@ class Bid(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
     bid_amount = Column(Float, nullable=False)
     is_winning_bid = Column(Boolean, default=False)
@@ -196,6 +204,78 @@ class Bid(Base):
     player = relationship("Player", back_populates="bids")
     team = relationship("Team", back_populates="bids")
 
+class BidArchive(Base):
+    """Bids moved out of the bids table by an auction reset"""
+    __tablename__ = "bid_archives"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bid_id = Column(Integer, nullable=False)
+    auction_id = Column(Integer, nullable=False, index=True)
+    player_id = Column(Integer, nullable=False)
+    team_id = Column(Integer, nullable=False)
+    bid_amount = Column(Float, nullable=False)
+    is_winning_bid = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+class Checkpoint(Base):
+    """A named copy of the auction state that can be restored (see checkpoints.py)"""
+    __tablename__ = "checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    players = Column(Integer, default=0)
+    teams = Column(Integer, default=0)
+    auctions = Column(Integer, default=0)
+    bids = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CheckpointPlayer(Base):
+    __tablename__ = "checkpoint_players"
+    
+    checkpoint_id = Column(Integer, ForeignKey("checkpoints.id", ondelete="CASCADE"), primary_key=True)
+    player_id = Column(Integer, primary_key=True)
+    status = Column(Enum(PlayerStatus))
+    team_id = Column(Integer, nullable=True)
+    sold_price = Column(Float, nullable=True)
+
+class CheckpointTeam(Base):
+    __tablename__ = "checkpoint_teams"
+    
+    checkpoint_id = Column(Integer, ForeignKey("checkpoints.id", ondelete="CASCADE"), primary_key=True)
+    team_id = Column(Integer, primary_key=True)
+    budget = Column(Float)
+    remaining_budget = Column(Float)
+    players_count = Column(Integer)
+
+class CheckpointAuction(Base):
+    __tablename__ = "checkpoint_auctions"
+    
+    checkpoint_id = Column(Integer, ForeignKey("checkpoints.id", ondelete="CASCADE"), primary_key=True)
+    auction_id = Column(Integer, primary_key=True)
+    season = Column(Integer)
+    name = Column(String, nullable=True)
+    league = Column(String, nullable=True)
+    status = Column(Enum(AuctionStatus))
+    current_player_id = Column(Integer, nullable=True)
+    current_bid_amount = Column(Float, nullable=True)
+    current_bidding_team_id = Column(Integer, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime)
+
+class CheckpointBid(Base):
+    __tablename__ = "checkpoint_bids"
+    
+    checkpoint_id = Column(Integer, ForeignKey("checkpoints.id", ondelete="CASCADE"), primary_key=True)
+    bid_id = Column(Integer, primary_key=True)
+    auction_id = Column(Integer, nullable=False)
+    player_id = Column(Integer, nullable=False)
+    team_id = Column(Integer, nullable=False)
+    bid_amount = Column(Float, nullable=False)
+    is_winning_bid = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+
 class Payment(Base):
     __tablename__ = "payments"
     
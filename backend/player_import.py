@@ -0,0 +1,143 @@
+"""
+Bulk player import: pre-registered players from a CSV or XLSX upload.
+
+Rows are read one at a time from the uploaded file (a csv reader, or an
+openpyxl read-only workbook) and validated with the same PlayerRegistration
+schema as POST /api/registration/register. Emails are checked against a set
+loaded once up front, which also catches duplicates within the file, and
+valid rows are inserted IMPORT_BATCH_ROWS at a time with one executemany
+each, instead of a uniqueness query and a commit per player.
+
+Imported players are created the way registration creates them: available
+and paid. CricHeroes stats are not fetched during an import.
+"""
+import csv
+import io
+from datetime import date, datetime
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from lazy_imports import get_openpyxl
+from models import Player as PlayerModel, PlayerStatus
+import schemas
+
+IMPORT_BATCH_ROWS = 500
+REQUIRED_COLUMNS = ("name", "email", "role")
+COLUMNS = tuple(schemas.PlayerRegistration.model_fields)
+
+def _column(header) -> str:
+    """'Date of Birth' -> 'date_of_birth'"""
+    return "_".join(str(header or "").strip().lower().replace("-", " ").split())
+
+def _cell(value):
+    """Cells as registration form values: text, except for dates; blanks are None"""
+    if value is None or isinstance(value, (datetime, date)):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # XLSX stores 25 and 9876543210 as floats
+    value = str(value).strip()
+    return value or None
+
+def _check_header(headers: List[str]) -> List[str]:
+    missing = [column for column in REQUIRED_COLUMNS if column not in headers]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return headers
+
+def read_csv(file: BinaryIO) -> Tuple[List[str], Iterator[Tuple[int, dict]]]:
+    """(columns, iterator of (line number, row)) from a UTF-8 CSV; ValueError if unreadable"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    try:
+        headers = _check_header([_column(header) for header in next(reader, [])])
+    except UnicodeDecodeError:
+        raise ValueError("CSV file must be UTF-8 encoded")
+
+    def rows():
+        try:
+            for values in reader:
+                if any(value.strip() for value in values):
+                    yield reader.line_num, {
+                        column: _cell(value) for column, value in zip(headers, values) if column
+                    }
+        except UnicodeDecodeError:
+            raise ValueError(f"CSV file must be UTF-8 encoded (line {reader.line_num + 1})")
+    return headers, rows()
+
+def read_xlsx(file: BinaryIO) -> Tuple[List[str], Iterator[Tuple[int, dict]]]:
+    """(columns, iterator of (row number, row)) from the first sheet; ValueError if unreadable"""
+    openpyxl = get_openpyxl()
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Could not read XLSX file: {e}")
+    sheet = workbook.worksheets[0]
+    values = sheet.iter_rows(values_only=True)
+    headers = _check_header([_column(header) for header in next(values, ())])
+
+    def rows():
+        try:
+            for number, row in enumerate(values, start=2):
+                if any(value not in (None, "") for value in row):
+                    yield number, {column: _cell(value) for column, value in zip(headers, row) if column}
+        finally:
+            workbook.close()
+    return headers, rows()
+
+def _errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+def _player_row(registration: schemas.PlayerRegistration) -> dict:
+    """Insert values for a registration, as register_player() sets them"""
+    values = registration.model_dump()
+    values.update(
+        status=PlayerStatus.AVAILABLE,
+        registration_fee_paid=True,
+        has_cricheroes_data=bool(registration.cricheroes_id),
+    )
+    return values
+
+def _insert(db: Session, batch: List[dict]) -> int:
+    # render_nulls keeps every row's key set the same, so the batch stays one
+    # executemany instead of a statement per pattern of blank columns
+    db.execute(insert(PlayerModel).execution_options(render_nulls=True), batch)
+    return len(batch)
+
+def import_players(db: Session, headers: List[str], rows: Iterable[Tuple[int, dict]],
+                   batch_rows: int = IMPORT_BATCH_ROWS) -> dict:
+    """
+    Validate and insert rows; returns counts and a per-row error report.
+    Does not commit.
+    """
+    emails = {email.lower() for email in db.scalars(select(PlayerModel.email))}
+    imported, errors, batch = 0, [], []
+    total = 0
+    for number, row in rows:
+        total += 1
+        try:
+            registration = schemas.PlayerRegistration.model_validate(row)
+        except ValidationError as e:
+            errors.append({"row": number, "email": row.get("email"), "errors": _errors(e)})
+            continue
+        email = registration.email.lower()
+        if email in emails:
+            errors.append({"row": number, "email": registration.email, "errors": ["email: Email already registered"]})
+            continue
+        emails.add(email)
+        batch.append(_player_row(registration))
+        if len(batch) >= batch_rows:
+            imported += _insert(db, batch)
+            batch = []
+    if batch:
+        imported += _insert(db, batch)
+    return {
+        "rows": total,
+        "imported": imported,
+        "rejected": len(errors),
+        "ignored_columns": [column for column in headers if column and column not in COLUMNS],
+        "errors": errors,
+    }
@@ -0,0 +1,160 @@
+"""
+Player ratings from CricHeroes stats.
+
+Every player's matches, runs, wickets and averages are loaded into NumPy
+arrays, and a 0-100 composite rating is computed for all of them in one
+vectorized pass:
+- each stat becomes a feature between 0 and 1, scaled against the player
+  pool (the 95th percentile of players who have that stat scores 1), with
+  bowling average inverted since lower is better;
+- a role-by-feature weight matrix picks each player's weights by role, so
+  batsmen are rated on batting, bowlers on bowling and all-rounders on both.
+Players with no matches are left unrated (NULL). Only ratings that changed
+are written back, with one executemany, for auction ordering and display.
+"""
+from typing import Dict, Optional
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from database import stored_rows
+from lazy_imports import get_numpy
+from models import Player as PlayerModel, PlayerRole
+
+FEATURES = ("runs_per_match", "batting_average", "strike_rate", "wickets_per_match", "bowling_average", "experience")
+
+# Relative weight of each feature by role; a role's weights need not add up to 1
+DEFAULT_WEIGHTS: Dict[str, Dict[str, float]] = {
+    PlayerRole.BATSMAN.value: {
+        "runs_per_match": 0.35, "batting_average": 0.3, "strike_rate": 0.25, "experience": 0.1,
+    },
+    PlayerRole.LEFT_HANDED.value: {
+        "runs_per_match": 0.35, "batting_average": 0.3, "strike_rate": 0.25, "experience": 0.1,
+    },
+    PlayerRole.BOWLER.value: {
+        "wickets_per_match": 0.5, "bowling_average": 0.4, "experience": 0.1,
+    },
+    PlayerRole.ALL_ROUNDER.value: {
+        "runs_per_match": 0.2, "batting_average": 0.15, "strike_rate": 0.1,
+        "wickets_per_match": 0.25, "bowling_average": 0.2, "experience": 0.1,
+    },
+}
+
+SCALE_PERCENTILE = 95
+RATING_DECIMALS = 1
+
+ROLES = list(PlayerRole)
+
+def validate_weights(weights: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Default weights overridden by `weights`, role by role. Raises ValueError on unknown names."""
+    merged = {role: dict(features) for role, features in DEFAULT_WEIGHTS.items()}
+    for role, features in weights.items():
+        if role not in merged:
+            raise ValueError(f"Unknown role: {role}")
+        unknown = set(features) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in features.values()):
+            raise ValueError("Weights cannot be negative")
+        merged[role] = dict(features)
+    if any(sum(features.values()) <= 0 for features in merged.values()):
+        raise ValueError("Every role needs a positive weight")
+    return merged
+
+def weight_matrix(weights: Dict[str, Dict[str, float]]):
+    """Roles x features, each row summing to 1"""
+    np = get_numpy()
+    matrix = np.array([[weights[role.value].get(feature, 0.0) for feature in FEATURES] for role in ROLES])
+    return matrix / matrix.sum(axis=1, keepdims=True)
+
+def _scale(values, mask):
+    """values / (95th percentile of values where mask), clipped to [0, 1]"""
+    np = get_numpy()
+    if not mask.any():
+        return np.zeros_like(values)
+    top = np.percentile(values[mask], SCALE_PERCENTILE)
+    if top <= 0:
+        return np.zeros_like(values)
+    return np.clip(values / top, 0.0, 1.0)
+
+def feature_matrix(matches, runs, wickets, batting_average, bowling_average, strike_rate):
+    """Players x FEATURES, every feature between 0 and 1"""
+    np = get_numpy()
+    played = matches > 0
+    games = np.maximum(matches, 1)
+    runs_per_match = runs / games
+    wickets_per_match = wickets / games
+    bowled = played & (bowling_average > 0) & (wickets > 0)
+    # Lower is better: the best (5th percentile) average scores 1, twice that scores 0.5
+    best = np.percentile(bowling_average[bowled], 100 - SCALE_PERCENTILE) if bowled.any() else 0.0
+    bowling = np.where(bowled, np.clip(best / np.where(bowled, bowling_average, 1.0), 0.0, 1.0), 0.0)
+    return np.column_stack([
+        _scale(runs_per_match, played & (runs > 0)),
+        _scale(batting_average, played & (batting_average > 0)),
+        _scale(strike_rate, played & (strike_rate > 0)),
+        _scale(wickets_per_match, played & (wickets > 0)),
+        bowling,
+        _scale(np.log1p(matches), played),
+    ])
+
+def compute_ratings(role_codes, stats, weights: Optional[Dict[str, Dict[str, float]]] = None):
+    """
+    Ratings for every player: role_codes indexes ROLES, stats is players x 6
+    (matches, runs, wickets, batting average, bowling average, strike rate).
+    Unrated players (no matches) get NaN.
+    """
+    np = get_numpy()
+    matrix = weight_matrix(weights or DEFAULT_WEIGHTS)
+    matches, runs, wickets, batting_average, bowling_average, strike_rate = stats.T
+    features = feature_matrix(matches, runs, wickets, batting_average, bowling_average, strike_rate)
+    # Row-wise dot product of each player's features with their role's weights
+    ratings = np.einsum("ij,ij->i", features, matrix[role_codes]) * 100
+    return np.where(matches > 0, np.round(ratings, RATING_DECIMALS), np.nan)
+
+def load_stats(db: Session):
+    """
+    Ids, current ratings, role codes and the stats matrix of every player.
+    Read with stored_rows (role as its stored name), as building an enum
+    member per player costs more than the whole computation.
+    """
+    np = get_numpy()
+    rows = stored_rows(db, (
+        PlayerModel.id, PlayerModel.rating, PlayerModel.role, PlayerModel.matches_played,
+        PlayerModel.runs_scored, PlayerModel.wickets_taken, PlayerModel.batting_average,
+        PlayerModel.bowling_average, PlayerModel.strike_rate
+    ))
+    count = len(rows)
+    if not count:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros((0, 6))
+    ids, current, roles, *stats = zip(*rows)
+    codes = {role.name: index for index, role in enumerate(ROLES)}
+    # NULL ratings become NaN, NULL stats count as 0
+    stats = np.array(stats, dtype=np.float64).T
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(current, dtype=np.float64),
+        np.fromiter((codes[role] for role in roles), dtype=np.int64, count=count),
+        np.nan_to_num(stats),
+    )
+
+def recompute_ratings(db: Session, weights: Optional[Dict[str, Dict[str, float]]] = None) -> dict:
+    """Rate every player and store the ratings that changed. Commits."""
+    np = get_numpy()
+    ids, current, role_codes, stats = load_stats(db)
+    ratings = compute_ratings(role_codes, stats, weights)
+    same = (ratings == current) | (np.isnan(ratings) & np.isnan(current))
+    changed = np.flatnonzero(~same)
+    if len(changed):
+        now = datetime.utcnow()
+        db.execute(update(PlayerModel), [
+            {"id": int(ids[i]), "rating": None if np.isnan(ratings[i]) else float(ratings[i]), "updated_at": now}
+            for i in changed
+        ])
+        db.commit()
+    rated = ratings[~np.isnan(ratings)]
+    return {
+        "players": int(len(ids)),
+        "rated": int(len(rated)),
+        "updated": int(len(changed)),
+        "average_rating": round(float(rated.mean()), RATING_DECIMALS) if len(rated) else None,
+        "highest_rating": float(rated.max()) if len(rated) else None,
+    }
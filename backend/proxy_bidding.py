@@ -0,0 +1,136 @@
+"""
+Proxy (auto) bidding.
+
+The admin can register a ceiling for a team on the current lot. Competing
+ceilings are resolved on the server in one go, eBay-style: the team with
+the highest ceiling wins at one increment above the runner-up's ceiling
+(never above its own), and at most two bids are written - the runner-up's
+last and the winner's - in a single commit instead of one HTTP round trip
+per increment.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+BID_INCREMENT = 5000
+
+def resolve_proxy_bids(
+    ceilings: Dict[int, float],
+    leader_id: Optional[int],
+    current_amount: float,
+    base_price: float,
+    increment: float = BID_INCREMENT
+) -> List[Tuple[int, float]]:
+    """
+    Resolve a bidding war between proxy ceilings in closed form.
+
+    The highest ceiling wins; ties go to the team already holding the lot,
+    then to the earlier registration. The price is one increment above the
+    runner-up's ceiling, capped at the winner's own ceiling (so a tie is won
+    at the shared ceiling), and never below the next valid bid.
+
+    Args:
+        ceilings: team_id -> highest amount the team will bid, in registration
+            order
+        leader_id: team currently holding the lot, or None if nobody has bid
+        current_amount: current bid (or the base price when there is no leader)
+        base_price: opening bid for the lot
+
+    Returns:
+        list: (team_id, amount) bids to record, in order: the runner-up's
+        last bid if it raised the price, then the winner's. Empty if no
+        ceiling can beat the current bid.
+    """
+    next_price = base_price if leader_id is None else current_amount + increment
+    if not any(ceiling >= next_price for team_id, ceiling in ceilings.items() if team_id != leader_id):
+        return []
+    # The leader stands at its current bid even without a ceiling
+    limits = dict(ceilings)
+    if leader_id is not None:
+        limits[leader_id] = max(limits.get(leader_id, current_amount), current_amount)
+    priority = {team_id: index for index, team_id in enumerate(ceilings)}
+    priority[leader_id] = -1
+    ranked = sorted(limits, key=lambda team_id: (-limits[team_id], priority[team_id]))
+    winner = ranked[0]
+    runner_up = ranked[1] if len(ranked) > 1 else None
+
+    if runner_up is None:
+        return [(winner, next_price)]
+    second = limits[runner_up]
+    price = limits[winner] if second >= limits[winner] else min(limits[winner], second + increment)
+    if winner != leader_id:
+        price = max(price, next_price)
+    ladder = []
+    # The runner-up's last bid, if it went above what already stands
+    if second < price and second >= next_price and not (runner_up == leader_id and second <= current_amount):
+        ladder.append((runner_up, second))
+    ladder.append((winner, price))
+    return ladder
+
+def compress_ladder(ladder: List[Tuple[int, float]], increment: float = BID_INCREMENT) -> List[dict]:
+    """
+    Collapse a ladder into runs of two teams alternating at a fixed step.
+    A 40-bid war between two teams becomes one segment.
+    """
+    segments = []
+    for team_id, amount in ladder:
+        segment = segments[-1] if segments else None
+        if (
+            segment
+            and amount - segment["to"] == increment
+            and team_id != segment["last_team_id"]
+            and (team_id in segment["teams"] or len(segment["teams"]) < 2)
+        ):
+            if team_id not in segment["teams"]:
+                segment["teams"].append(team_id)
+            segment["to"] = amount
+            segment["last_team_id"] = team_id
+            segment["bids"] += 1
+        else:
+            segments.append({
+                "teams": [team_id],
+                "from": amount,
+                "to": amount,
+                "step": increment,
+                "bids": 1,
+                "last_team_id": team_id
+            })
+    return [{key: value for key, value in segment.items() if key != "last_team_id"} for segment in segments]
+
+class ProxyBidBook:
+    """Registered ceilings for the lot currently on the block, per auction"""
+
+    def __init__(self):
+        self._lots = {}
+        self._lock = threading.Lock()
+
+    def set_ceiling(self, auction_id: int, player_id: int, team_id: int, max_amount: float):
+        with self._lock:
+            lot = self._lots.get(auction_id)
+            if lot is None or lot["player_id"] != player_id:
+                lot = {"player_id": player_id, "ceilings": {}}
+                self._lots[auction_id] = lot
+            # Re-registering keeps the original priority for ties
+            lot["ceilings"][team_id] = max_amount
+
+    def remove_ceiling(self, auction_id: int, player_id: int, team_id: int) -> bool:
+        with self._lock:
+            lot = self._lots.get(auction_id)
+            if lot is None or lot["player_id"] != player_id:
+                return False
+            return lot["ceilings"].pop(team_id, None) is not None
+
+    def ceilings(self, auction_id: int, player_id: int) -> Dict[int, float]:
+        with self._lock:
+            lot = self._lots.get(auction_id)
+            if lot is None or lot["player_id"] != player_id:
+                return {}
+            return dict(lot["ceilings"])
+
+    def clear(self, auction_id: int = None):
+        with self._lock:
+            if auction_id is None:
+                self._lots.clear()
+            else:
+                self._lots.pop(auction_id, None)
+
+proxy_book = ProxyBidBook()
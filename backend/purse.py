@@ -0,0 +1,173 @@
+"""
+Team purse accounting.
+
+All changes to a team's remaining budget and player count go through
+record_sale() / record_refund(), which apply them as atomic SQL increments
+(so concurrent sales and refunds cannot lose updates) and return the new
+values. Those values feed an in-memory per-team projection that is applied
+when the session commits, so reading every team's purse and max bid costs
+no queries.
+"""
+import threading
+from typing import Dict, List, Tuple
+from sqlalchemy import case, event, select, update
+from sqlalchemy.orm import Session
+from models import Team as TeamModel
+
+MINIMUM_PLAYERS = 13
+BASE_PLAYER_PRICE = 10000
+DEFAULT_TEAM_BUDGET = 1000000
+
+def max_bid_for(remaining_budget: float, players_count: int) -> float:
+    """Maximum bid a team can make while still affording its minimum squad"""
+    players_still_needed = MINIMUM_PLAYERS - players_count
+    if players_still_needed <= 0:
+        # Team has met minimum requirement, can bid full remaining budget
+        return remaining_budget
+    # Must reserve money for remaining minimum players
+    reserved_amount = (players_still_needed - 1) * BASE_PLAYER_PRICE
+    return max(remaining_budget - reserved_amount, BASE_PLAYER_PRICE)
+
+def calculate_max_bid_limit(team: TeamModel) -> float:
+    """Calculate maximum bid limit for a team based on remaining budget and players needed"""
+    return max_bid_for(team.remaining_budget, team.players_count)
+
+class TeamPurse:
+    __slots__ = ("team_id", "remaining_budget", "players_count", "max_bid_limit", "league")
+
+    def __init__(self, team_id: int, remaining_budget: float, players_count: int, league: str = None):
+        self.team_id = team_id
+        self.remaining_budget = remaining_budget
+        self.players_count = players_count
+        self.max_bid_limit = max_bid_for(remaining_budget, players_count)
+        self.league = league
+
+    @property
+    def players_needed(self) -> int:
+        return max(0, MINIMUM_PLAYERS - self.players_count)
+
+    def to_dict(self) -> dict:
+        return {
+            "team_id": self.team_id,
+            "remaining_budget": self.remaining_budget,
+            "players_count": self.players_count,
+            "players_needed": self.players_needed,
+            "max_bid_limit": self.max_bid_limit,
+            "league": self.league
+        }
+
+def read_purses(db: Session, league: str = None) -> list:
+    """Every team's purse (or one league's) as committed, bypassing the projection"""
+    query = select(TeamModel.id, TeamModel.remaining_budget, TeamModel.players_count, TeamModel.league)
+    if league:
+        query = query.where(TeamModel.league == league)
+    return [
+        TeamPurse(row.id, row.remaining_budget, row.players_count, row.league)
+        for row in db.execute(query.order_by(TeamModel.id))
+    ]
+
+class PurseProjection:
+    """In-memory view of every team's purse, loaded once and kept current"""
+
+    def __init__(self):
+        self._purses = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        purses = read_purses(db)
+        with self._lock:
+            self._purses = {purse.team_id: purse for purse in purses}
+            self._loaded = True
+
+    def invalidate(self):
+        """Drop the projection; the next reader reloads it from the database"""
+        with self._lock:
+            self._purses = {}
+            self._loaded = False
+
+    def get(self, db: Session, team_id: int):
+        self.ensure_loaded(db)
+        return self._purses.get(team_id)
+
+    def all(self, db: Session, league: str = None):
+        """All purses, or only those of one league's teams"""
+        self.ensure_loaded(db)
+        purses = self._purses.values()
+        if league:
+            purses = [purse for purse in purses if purse.league == league]
+        return sorted(purses, key=lambda purse: purse.team_id)
+
+    def apply(self, team_id: int, remaining_budget: float, players_count: int, league: str = None) -> TeamPurse:
+        purse = TeamPurse(team_id, remaining_budget, players_count, league)
+        with self._lock:
+            if self._loaded:
+                self._purses[team_id] = purse
+        return purse
+
+projection = PurseProjection()
+
+def _increment(db: Session, team_id: int, budget_delta: float, count_change):
+    row = db.execute(
+        update(TeamModel)
+        .where(TeamModel.id == team_id)
+        .values(
+            remaining_budget=TeamModel.remaining_budget + budget_delta,
+            players_count=count_change
+        )
+        .returning(TeamModel.id, TeamModel.remaining_budget, TeamModel.players_count, TeamModel.league)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return None
+    # Applied to the projection once the transaction commits
+    db.info.setdefault("purse_updates", []).append(tuple(row))
+    return TeamPurse(*row)
+
+def record_sale(db: Session, team_id: int, amount: float):
+    """Debit a team for a purchased player. Returns the new purse."""
+    return _increment(db, team_id, -amount, TeamModel.players_count + 1)
+
+def record_refund(db: Session, team_id: int, amount: float):
+    """Credit a team back for a released player. Returns the new purse."""
+    return _increment(
+        db, team_id, amount,
+        case((TeamModel.players_count > 0, TeamModel.players_count - 1), else_=0)
+    )
+
+def record_refunds(db: Session, refunds: Dict[int, Tuple[float, int]]) -> List[TeamPurse]:
+    """
+    Credit several teams back at once: team id -> (amount, players released).
+    One UPDATE for all of them. Returns the new purses.
+    """
+    if not refunds:
+        return []
+    rows = db.execute(
+        update(TeamModel)
+        .where(TeamModel.id.in_(list(refunds)))
+        .values(
+            remaining_budget=TeamModel.remaining_budget + case(
+                *[(TeamModel.id == team_id, amount) for team_id, (amount, _) in refunds.items()], else_=0
+            ),
+            players_count=case(
+                *[(TeamModel.id == team_id, case((TeamModel.players_count > count, TeamModel.players_count - count), else_=0))
+                  for team_id, (_, count) in refunds.items()],
+                else_=TeamModel.players_count
+            )
+        )
+        .returning(TeamModel.id, TeamModel.remaining_budget, TeamModel.players_count, TeamModel.league)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.info.setdefault("purse_updates", []).extend(tuple(row) for row in rows)
+    return sorted((TeamPurse(*row) for row in rows), key=lambda purse: purse.team_id)
+
+@event.listens_for(Session, "after_commit")
+def _apply_purse_updates(session):
+    for update_row in session.info.pop("purse_updates", []):
+        projection.apply(*update_row)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_purse_updates(session):
+    session.info.pop("purse_updates", None)
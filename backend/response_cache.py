@@ -0,0 +1,249 @@
+"""
+Read-through response cache.
+
+Serialized response bodies are kept in a byte-bounded LRU, keyed by route and
+parameters and tagged with the rows they were built from ("team:3",
+"player:12", "teams" for the team list). The tags are invalidated from
+session events when a transaction commits, so every handler that changes a
+team or player (sold, unsold, mark-available, updates, registration) drops
+exactly the entries that read it, without each handler having to remember.
+
+With RESPONSE_CACHE_CHANNEL set and a PostgreSQL database, invalidations are
+also sent to the other workers with NOTIFY and applied from a LISTEN thread.
+"""
+import json
+import os
+import select
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models import Player as PlayerModel, Team as TeamModel
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_CHANNEL = os.getenv("RESPONSE_CACHE_CHANNEL", "")
+
+def json_bytes(content) -> bytes:
+    """Serialize content the way FastAPI's JSONResponse does"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+class ResponseCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (body, tags)
+        self._tags: Dict[str, Set[str]] = {}  # tag -> keys
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self) -> int:
+        """Take before reading the database; pass to set() with the result"""
+        return self._generation
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], generation: int):
+        """
+        Store a body built from data read at `generation`. Dropped if anything
+        was invalidated in the meantime, since the body may predate that change.
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove(key)
+            tags = frozenset(tags)
+            self._entries[key] = (body, tags)
+            self.size += len(body)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str] = (), prefixes: Iterable[str] = ()):
+        """Drop entries carrying any of the tags, or any tag starting with one of the prefixes"""
+        with self._lock:
+            self._generation += 1
+            tags = set(tags)
+            for prefix in prefixes:
+                tags.update(tag for tag in self._tags if tag.startswith(prefix))
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if self._remove(key):
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        body, tags = entry
+        self.size -= len(body)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+
+def cached_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+# Invalidation from session events
+
+def _team_ids(player) -> Set[int]:
+    """Teams whose detail view lists the player, before and after this change"""
+    history = inspect(player).attrs.team_id.history
+    return {team_id for team_id in (*history.deleted, player.team_id) if team_id is not None}
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_rows(session, flush_context):
+    tags = session.info.setdefault("cache_tags", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, TeamModel):
+            tags.update((f"team:{obj.id}", "teams"))
+        elif isinstance(obj, PlayerModel):
+            tags.add(f"player:{obj.id}")
+            tags.update(f"team:{team_id}" for team_id in _team_ids(obj))
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    # Bulk UPDATE/DELETE (purse increments, resets) cannot say which rows changed
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    prefixes = orm_execute_state.session.info.setdefault("cache_prefixes", set())
+    if issubclass(mapper.class_, TeamModel):
+        prefixes.add("team")
+    elif issubclass(mapper.class_, PlayerModel):
+        prefixes.update(("player:", "team:"))
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop("cache_tags", None) or set()
+    prefixes = session.info.pop("cache_prefixes", None) or set()
+    if tags or prefixes:
+        response_cache.invalidate(tags, prefixes)
+        notifier.publish(tags, prefixes)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_rows(session):
+    session.info.pop("cache_tags", None)
+    session.info.pop("cache_prefixes", None)
+
+# Cross-worker invalidation
+
+class InvalidationNotifier:
+    """Relays invalidations between workers over PostgreSQL LISTEN/NOTIFY"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self.engine = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self, engine):
+        if not self.channel or engine.dialect.name != "postgresql":
+            return
+        self.engine = engine
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="response-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self.engine = None
+
+    def publish(self, tags, prefixes):
+        if self.engine is None:
+            return
+        payload = json.dumps({"origin": self.origin, "tags": sorted(tags), "prefixes": sorted(prefixes)})
+        try:
+            with self.engine.connect() as connection:
+                connection.exec_driver_sql("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                connection.commit()
+        except Exception as e:
+            # Another worker may serve stale data until its next invalidation
+            print(f"Response cache invalidation notify failed: {e}")
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            try:
+                connection = self.engine.raw_connection()
+            except Exception as e:
+                print(f"Response cache listener could not connect: {e}")
+                self._stopping.wait(5)
+                continue
+            try:
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                # Anything may have changed while we were not listening
+                response_cache.clear()
+                while not self._stopping.is_set():
+                    if select.select([driver_connection], [], [], 5) == ([], [], []):
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        self._apply(driver_connection.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Response cache listener error: {e}")
+                self._stopping.wait(1)
+            finally:
+                connection.invalidate()
+
+    def _apply(self, payload: str):
+        message = json.loads(payload)
+        if message["origin"] != self.origin:
+            response_cache.invalidate(message["tags"], message["prefixes"])
+
+notifier = InvalidationNotifier(RESPONSE_CACHE_CHANNEL)
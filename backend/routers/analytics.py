@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from database import get_read_db, read_from_replica
+from models import Player, Team, User
+from auth import get_current_admin_user
+from lazy_imports import is_available
+from columnar_export import EXPORT_TABLES, FORMATS, PARQUET, build_export, zip_files
+from auction_analytics import build_summary, bids_version
+from conditional import table_version, make_etag, etag_matches, set_etag, not_modified
+from response_cache import response_cache, json_bytes, cached_response
+
+router = APIRouter()
+
+# pyarrow is optional: without it the columnar export answers 503
+COLUMNAR_AVAILABLE = is_available("pyarrow")
+# pandas is optional too: without it the summary answers 503
+SUMMARY_AVAILABLE = is_available("pandas")
+
+@router.get("/summary")
+async def get_auction_summary(
+    request: Request,
+    league: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Post-auction summary (Admin only): spend per team, prices and premiums by
+    role, block-wise distribution, bid wars and lot times, and top buys.
+    Built once per version of players, teams and bids, then served from the
+    response cache (or as a 304) until one of them changes.
+    """
+    if not SUMMARY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Auction summary requires pandas")
+    version = (table_version(db, Player), table_version(db, Team), bids_version(db))
+    etag = make_etag("analytics-summary", league, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # The version is part of the key, so a changed auction simply misses
+    key = f"/analytics/summary?league={league}&version={etag}"
+    body = response_cache.get(key)
+    if body is None:
+        generation = response_cache.generation()
+        body = json_bytes(await run_in_threadpool(build_summary, league))
+        if not read_from_replica(db):
+            response_cache.set(key, body, ["analytics"], generation)
+    response = cached_response(body)
+    set_etag(response, etag)
+    return response
+
+@router.get("/export")
+async def export_columnar(
+    format: str = Query(PARQUET, pattern="^(parquet|arrow)$"),
+    tables: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Export players, teams, bids and auctions with typed columns (Admin only).
+    format is parquet or arrow (an Arrow IPC stream). A single table comes
+    back as that file; several come back zipped, one file per table.
+    """
+    if not COLUMNAR_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Columnar export requires pyarrow")
+    tables = tables or list(EXPORT_TABLES)
+    unknown = [name for name in tables if name not in EXPORT_TABLES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(unknown)}")
+    
+    # Reading and encoding whole tables would stall the event loop
+    files = await run_in_threadpool(build_export, format, tables)
+    
+    if len(files) == 1:
+        filename, content = next(iter(files.items()))
+        media_type = FORMATS[format][1]
+    else:
+        filename, content = f"gpl_auction_{format}.zip", await run_in_threadpool(zip_files, files)
+        media_type = "application/zip"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
-from typing import List, Dict
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import DateTime, delete, insert, literal, select, true, update
+from sqlalchemy.orm import Session, defer, joinedload
+from typing import List, Dict, Optional
+from database import get_db, get_read_db, SessionLocal
 from models import (
     Auction as AuctionModel, 
     Bid as BidModel, 
+    BidArchive as BidArchiveModel,
     Player as PlayerModel, 
     Team as TeamModel,
     AuctionStatus, 
@@ -12,69 +15,229 @@ from models import (
     User
 )
 from auth import get_current_admin_user
+from purse import MINIMUM_PLAYERS, record_sale, projection, read_purses
+from leaderboards import leaderboards, record_sold
+from feasibility import feasibility
+from auction_order import apply_order, eligible_players, generate_order
+from proxy_bidding import BID_INCREMENT, proxy_book, resolve_proxy_bids, compress_ladder
+from lot_timer import LotTimer
+from live_state import manager, bid_history_query, live_version, record_lot_bids
+from conditional import make_etag, etag_matches, set_etag, not_modified
+from list_stream import stream_format, stream_list, encode_cursor, decode_cursor, STREAM_MAX_LIMIT
 import schemas
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import json
+import os
 import random
+import time
 
 router = APIRouter()
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+# Bids included in the snapshot, newest last
+SNAPSHOT_BIDS = 20
+# Largest JSON page of bid history; the streaming formats go up to STREAM_MAX_LIMIT
+HISTORY_MAX_LIMIT = 500
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+def get_live_auction(db: Session, auction_id: Optional[int] = None, statuses=(AuctionStatus.IN_PROGRESS,)):
+    """
+    Resolve the auction an endpoint acts on. Without an auction_id there must
+    be exactly one live auction, which keeps single-auction clients working.
+    """
+    query = db.query(AuctionModel).filter(AuctionModel.status.in_(statuses))
+    if auction_id is not None:
+        return query.filter(AuctionModel.id == auction_id).first()
+    auctions = query.limit(2).all()
+    if len(auctions) > 1:
+        raise HTTPException(status_code=400, detail="Multiple auctions are running; pass auction_id")
+    return auctions[0] if auctions else None
+
+def get_live_lot(db: Session, auction_id: Optional[int] = None, statuses=(AuctionStatus.IN_PROGRESS,), options=()):
+    """
+    get_live_auction plus the player on the block and the leading team, fetched
+    in one outer-joined query. Returns (auction, player, team), or None.
+    """
+    query = db.query(AuctionModel, PlayerModel, TeamModel).outerjoin(
+        PlayerModel, PlayerModel.id == AuctionModel.current_player_id
+    ).outerjoin(
+        TeamModel, TeamModel.id == AuctionModel.current_bidding_team_id
+    ).options(*options).filter(AuctionModel.status.in_(statuses))
+    if auction_id is not None:
+        query = query.filter(AuctionModel.id == auction_id)
+    rows = query.limit(2).all()
+    if len(rows) > 1:
+        raise HTTPException(status_code=400, detail="Multiple auctions are running; pass auction_id")
+    return rows[0] if rows else None
+
+def in_league(query, league: Optional[str]):
+    """Restrict a player query to an auction's league, if it has one"""
+    if league:
+        return query.filter(PlayerModel.league == league)
+    return query
+
+def check_team_league(team: TeamModel, auction: AuctionModel):
+    if auction.league and team.league != auction.league:
+        raise HTTPException(status_code=400, detail=f"{team.name} is not part of the {auction.league} auction")
+
+# Lot countdown in seconds for auctions without one of their own; 0 leaves
+# going-once/going-twice to the auctioneer
+LOT_TIMER_SECONDS = float(os.getenv("LOT_TIMER_SECONDS", "0"))
+
+def lot_timer_seconds(db: Session) -> float:
+    """The countdown last set with PUT /timer, kept on the newest auction; new auctions take it"""
+    seconds = db.scalar(select(AuctionModel.lot_timer_seconds).order_by(AuctionModel.id.desc()).limit(1))
+    return LOT_TIMER_SECONDS if seconds is None else seconds
+
+def describe_lot_deadline(auction: AuctionModel) -> Optional[dict]:
+    """The deadline stored on the auction, as lot_timer messages describe it"""
+    if auction.lot_deadline is None or not auction.current_player_id:
+        return None
+    now = time.time()
+    deadline = auction.lot_deadline.replace(tzinfo=timezone.utc).timestamp()
+    return {
+        "auction_id": auction.id,
+        "player_id": auction.current_player_id,
+        "deadline": deadline,
+        "server_time": now,
+        "remaining_seconds": max(0.0, deadline - now)
+    }
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+async def _on_lot_timer_expired(auction_id: int, player_id: int):
+    """
+    Close the lot when its timer runs out: sold if anyone bid, unsold otherwise.
+    Each worker only knows the countdowns it started, so the deadline in the
+    auction row decides: a later one set by another worker re-arms this
+    worker's timer, and the close is claimed so that one worker makes it.
+    """
+    db = SessionLocal()
+    try:
+        auction = db.query(AuctionModel).filter(AuctionModel.id == auction_id).first()
+        if (not auction or auction.status != AuctionStatus.IN_PROGRESS
+                or auction.current_player_id != player_id or auction.lot_deadline is None):
+            return
+        remaining = (auction.lot_deadline - datetime.utcnow()).total_seconds()
+        if remaining > 0:
+            lot_timer.start(auction_id, player_id, remaining)
+            return
+        claimed = db.execute(
+            update(AuctionModel)
+            .where(AuctionModel.id == auction_id, AuctionModel.current_player_id == player_id,
+                   AuctionModel.lot_deadline == auction.lot_deadline)
+            .values(lot_deadline=None)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        if auction.current_bidding_team_id:
+            await mark_player_sold(auction_id=auction_id, db=db, current_user=None)
+        else:
+            await mark_player_unsold(auction_id=auction_id, db=db, current_user=None)
+    finally:
+        db.close()
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+lot_timer = LotTimer(on_expire=_on_lot_timer_expired)
 
-manager = ConnectionManager()
+async def restart_lot_timer(db: Session, auction_id: int, player_id: int):
+    """
+    Start the countdown for the lot on the block, store its deadline on the
+    auction and tell clients. Clears the deadline if the auction is not timed.
+    """
+    seconds, deadline = db.execute(
+        select(AuctionModel.lot_timer_seconds, AuctionModel.lot_deadline).where(AuctionModel.id == auction_id)
+    ).one()
+    seconds = LOT_TIMER_SECONDS if seconds is None else seconds
+    if seconds <= 0 or not player_id:
+        if deadline is not None:
+            db.execute(update(AuctionModel).where(AuctionModel.id == auction_id).values(lot_deadline=None))
+            db.commit()
+            lot_timer.cancel(auction_id)
+            await manager.broadcast(auction_id, {"type": "lot_timer", "data": None})
+        return
+    db.execute(
+        update(AuctionModel).where(AuctionModel.id == auction_id)
+        .values(lot_deadline=datetime.utcnow() + timedelta(seconds=seconds))
+    )
+    db.commit()
+    message = lot_timer.start(auction_id, player_id, seconds)
+    await manager.broadcast(auction_id, {"type": "lot_timer", "data": message})
 
-def calculate_max_bid_limit(team: TeamModel, db: Session) -> float:
-    """Calculate maximum bid limit for a team"""
-    MINIMUM_PLAYERS = 13
-    BASE_PLAYER_PRICE = 10000
+async def run_proxy_bids(db: Session, auction: AuctionModel, player: PlayerModel, include_ladder: bool = False):
+    """Resolve registered proxy ceilings for the current lot and record the war in one commit"""
+    ceilings = proxy_book.ceilings(auction.id, player.id)
+    if not ceilings:
+        return None
     
-    players_still_needed = MINIMUM_PLAYERS - team.players_count
-    if players_still_needed <= 0:
-        return team.remaining_budget
-    else:
-        reserved_amount = (players_still_needed - 1) * BASE_PLAYER_PRICE
-        max_bid = team.remaining_budget - reserved_amount
-        return max(max_bid, BASE_PLAYER_PRICE)
+    teams = {team.id: team for team in db.query(TeamModel).filter(TeamModel.id.in_(list(ceilings))).all()}
+    # A ceiling never lets a team bid past its max bid limit
+    effective_ceilings = {
+        team_id: min(ceiling, feasibility.max_bid(db, teams[team_id], auction.league), teams[team_id].remaining_budget)
+        for team_id, ceiling in ceilings.items()
+        if team_id in teams
+    }
+    ladder = resolve_proxy_bids(
+        effective_ceilings,
+        auction.current_bidding_team_id,
+        auction.current_bid_amount,
+        player.base_price
+    )
+    if not ladder:
+        return None
+    
+    bids = [
+        BidModel(auction_id=auction.id, player_id=player.id, team_id=team_id, bid_amount=amount)
+        for team_id, amount in ladder
+    ]
+    db.add_all(bids)
+    winner_id, final_amount = ladder[-1]
+    auction.current_bid_amount = final_amount
+    auction.current_bidding_team_id = winner_id
+    db.flush()
+    record_lot_bids(db, auction.id, player.id, bids)
+    db.commit()
+    
+    winner = teams[winner_id]
+    message = {
+        "team_id": winner.id,
+        "team_name": winner.name,
+        "team_color": winner.color_primary,
+        "bid_amount": final_amount,
+        "player_id": player.id,
+        "player_name": player.name,
+        "timestamp": datetime.utcnow().isoformat(),
+        "proxy": True,
+        "bids_count": len(ladder)
+    }
+    if include_ladder:
+        message["ladder"] = compress_ladder(ladder)
+    
+    # Only the final contested price goes out to clients
+    await manager.broadcast(auction.id, {"type": "new_bid", "data": message})
+    return message
 
 @router.get("/current")
-async def get_current_auction(db: Session = Depends(get_db)):
+async def get_current_auction(
+    request: Request,
+    response: Response,
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
     """Get current active auction"""
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status.in_([AuctionStatus.IN_PROGRESS, AuctionStatus.PAUSED])
-    ).first()
-    
-    if not auction:
-        raise HTTPException(status_code=404, detail="No active auction found")
+    # Versioned from the database, so a bid taken by another worker changes it
+    etag = make_etag("current", auction_id, live_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Get current player details
-    current_player = None
-    if auction.current_player_id:
-        current_player = db.query(PlayerModel).filter(PlayerModel.id == auction.current_player_id).first()
+    # Auction, current player and current bidding team in one query
+    lot = get_live_lot(db, auction_id, (AuctionStatus.IN_PROGRESS, AuctionStatus.PAUSED))
     
-    # Get current bidding team details  
-    current_bidding_team = None
-    if auction.current_bidding_team_id:
-        current_bidding_team = db.query(TeamModel).filter(TeamModel.id == auction.current_bidding_team_id).first()
+    if not lot:
+        raise HTTPException(status_code=404, detail="No active auction found")
+    auction, current_player, current_bidding_team = lot
     
+    set_etag(response, etag)
     return {
         "id": auction.id,
+        "name": auction.name,
+        "league": auction.league,
         "season": auction.season,
         "status": auction.status,
         "current_player_id": auction.current_player_id,
@@ -87,19 +250,88 @@ async def get_current_auction(db: Session = Depends(get_db)):
         "current_bidding_team": current_bidding_team
     }
 
+def columns_dict(obj, exclude=()) -> dict:
+    """Column values of a model instance, skipping the excluded columns"""
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns if column.key not in exclude}
+
+def build_snapshot(db: Session, auction_id: Optional[int]) -> bytes:
+    # Auction, player on the block and leading team in one query, without the image blobs
+    lot = get_live_lot(
+        db, auction_id, (AuctionStatus.IN_PROGRESS, AuctionStatus.PAUSED),
+        options=(defer(PlayerModel.player_image), defer(TeamModel.team_logo))
+    )
+    if not lot:
+        raise HTTPException(status_code=404, detail="No active auction found")
+    auction, player, team = lot
+    
+    # Bids and purses come from the database too, not from this worker's
+    # bid tail and purse projection, which miss other workers' commits
+    bids = []
+    if player:
+        lot_bids = db.query(BidModel).filter(
+            BidModel.player_id == player.id
+        ).order_by(BidModel.id.desc()).limit(SNAPSHOT_BIDS).all()[::-1]
+        bid_fields = set(schemas.Bid.model_fields)
+        bids = [schemas.Bid.model_validate(bid).model_dump(include=bid_fields) for bid in lot_bids]
+    
+    snapshot = {
+        "auction": columns_dict(auction),
+        "current_player": columns_dict(player, exclude=("player_image",)) if player else None,
+        "current_bidding_team": columns_dict(team, exclude=("team_logo",)) if team else None,
+        "purses": [purse.to_dict() for purse in read_purses(db, auction.league)],
+        "bids": bids
+    }
+    return json.dumps(jsonable_encoder(snapshot), separators=(",", ":")).encode()
+
+@router.get("/snapshot")
+async def get_auction_snapshot(request: Request, auction_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """
+    Everything the live page needs in one response: the auction, the player on
+    the block (without the image), the leading team, every team's purse and the
+    latest bids. Cached per live version (read from the database, so every
+    worker sees every write) and served with an ETag, so a reconnect with
+    nothing new costs a 304 and one query.
+    """
+    version = live_version(db)
+    etag = make_etag("snapshot", auction_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    cached = manager.snapshots.get(auction_id)
+    if cached is None or cached[0] != version:
+        cached = (version, build_snapshot(db, auction_id))
+        manager.snapshots[auction_id] = cached
+    response = Response(content=cached[1], media_type="application/json")
+    set_etag(response, etag)
+    return response
+
 @router.post("/start")
-async def start_auction(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
-    """Start a new auction (Admin only)"""
-    # Check if there's already an active auction
-    active_auction = db.query(AuctionModel).filter(
+async def start_auction(
+    league: Optional[str] = None,
+    name: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Start a new auction (Admin only).
+    Auctions for different leagues can run at the same time; an auction
+    without a league takes every player and runs alone.
+    """
+    # Check if there's already an active auction for the same players
+    active_query = db.query(AuctionModel).filter(
         AuctionModel.status.in_([AuctionStatus.IN_PROGRESS, AuctionStatus.PAUSED])
-    ).first()
+    )
+    if league:
+        active_query = active_query.filter(
+            (AuctionModel.league == league) | (AuctionModel.league.is_(None))
+        )
+    active_auction = active_query.first()
     
     if active_auction:
         raise HTTPException(status_code=400, detail="An auction is already in progress")
     
     # Get all available players ordered by auction_order (nulls last), then by id
-    available_players = db.query(PlayerModel).filter(
+    available_players = in_league(db.query(PlayerModel), league).filter(
         PlayerModel.status == PlayerStatus.AVAILABLE,
         PlayerModel.registration_fee_paid == True
     ).order_by(
@@ -116,9 +348,12 @@ async def start_auction(db: Session = Depends(get_db), current_user: User = Depe
     # Create new auction
     auction = AuctionModel(
         season=2,
+        name=name,
+        league=league,
         status=AuctionStatus.IN_PROGRESS,
         current_player_id=first_player.id,
         current_bid_amount=first_player.base_price,
+        lot_timer_seconds=lot_timer_seconds(db),
         started_at=datetime.utcnow()
     )
     db.add(auction)
@@ -126,10 +361,11 @@ async def start_auction(db: Session = Depends(get_db), current_user: User = Depe
     db.refresh(auction)
     
     # Broadcast auction start
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "auction_started",
         "data": {
             "auction_id": auction.id,
+            "league": auction.league,
             "player": {
                 "id": first_player.id,
                 "name": first_player.name,
@@ -138,16 +374,20 @@ async def start_auction(db: Session = Depends(get_db), current_user: User = Depe
             }
         }
     })
+    await restart_lot_timer(db, auction.id, first_player.id)
     
     return {"message": "Auction started", "auction_id": auction.id}
 
 @router.post("/bid")
-async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def place_bid(
+    bid: schemas.BidCreate,
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
     """Place a bid on the current player (Admin only)"""
     # Get current auction
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status == AuctionStatus.IN_PROGRESS
-    ).first()
+    auction = get_live_auction(db, auction_id)
     
     if not auction:
         raise HTTPException(status_code=400, detail="No active auction")
@@ -156,9 +396,10 @@ async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), curre
     team = db.query(TeamModel).filter(TeamModel.id == bid.team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
+    check_team_league(team, auction)
     
-    # Calculate max bid limit
-    max_bid = calculate_max_bid_limit(team, db)
+    # Calculate max bid limit, keeping enough players in the pool to complete the squad
+    max_bid = feasibility.max_bid(db, team, auction.league)
     
     # Get current player to check base price
     player = db.query(PlayerModel).filter(PlayerModel.id == auction.current_player_id).first()
@@ -174,14 +415,14 @@ async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), curre
             )
     else:
         # Subsequent bids - must increment by at least 5000
-        if bid.bid_amount < auction.current_bid_amount + 5000:
+        if bid.bid_amount < auction.current_bid_amount + BID_INCREMENT:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Bid must be at least ₹{auction.current_bid_amount + 5000}"
+                detail=f"Bid must be at least ₹{auction.current_bid_amount + BID_INCREMENT}"
             )
     
     if bid.bid_amount > max_bid:
-        players_needed = 13 - team.players_count
+        players_needed = MINIMUM_PLAYERS - team.players_count
         raise HTTPException(
             status_code=400, 
             detail=f"Bid exceeds maximum limit of ₹{max_bid}. You need to reserve money for {players_needed} more player(s)."
@@ -203,6 +444,8 @@ async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), curre
     auction.current_bid_amount = bid.bid_amount
     auction.current_bidding_team_id = bid.team_id
     
+    db.flush()
+    record_lot_bids(db, auction.id, player.id, [db_bid])
     db.commit()
     db.refresh(db_bid)
     
@@ -210,7 +453,7 @@ async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), curre
     player = db.query(PlayerModel).filter(PlayerModel.id == auction.current_player_id).first()
     
     # Broadcast bid
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "new_bid",
         "data": {
             "bid_id": db_bid.id,
@@ -224,14 +467,90 @@ async def place_bid(bid: schemas.BidCreate, db: Session = Depends(get_db), curre
         }
     })
     
-    return {"message": "Bid placed successfully", "bid_id": db_bid.id}
+    # Let registered proxy ceilings answer the manual bid
+    proxy_result = await run_proxy_bids(db, auction, player)
+    await restart_lot_timer(db, auction.id, player.id)
+    
+    return {"message": "Bid placed successfully", "bid_id": db_bid.id, "proxy_response": proxy_result}
+
+@router.post("/proxy-bid")
+async def register_proxy_bid(
+    proxy_bid: schemas.ProxyBidCreate,
+    include_ladder: bool = False,
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Register a team's ceiling for the current lot and resolve competing ceilings (Admin only)"""
+    auction = get_live_auction(db, auction_id)
+    
+    if not auction or not auction.current_player_id:
+        raise HTTPException(status_code=400, detail="No active auction")
+    
+    team = db.query(TeamModel).filter(TeamModel.id == proxy_bid.team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    check_team_league(team, auction)
+    
+    player = db.query(PlayerModel).filter(PlayerModel.id == auction.current_player_id).first()
+    if proxy_bid.max_amount < player.base_price:
+        raise HTTPException(status_code=400, detail=f"Ceiling must be at least base price: ₹{player.base_price}")
+    
+    proxy_book.set_ceiling(auction.id, player.id, team.id, proxy_bid.max_amount)
+    result = await run_proxy_bids(db, auction, player, include_ladder)
+    if result:
+        await restart_lot_timer(db, auction.id, player.id)
+    
+    return {
+        "message": "Proxy bid registered",
+        "team_id": team.id,
+        "max_amount": proxy_bid.max_amount,
+        "effective_max_amount": min(proxy_bid.max_amount, feasibility.max_bid(db, team, auction.league)),
+        "current_bid_amount": auction.current_bid_amount,
+        "current_bidding_team_id": auction.current_bidding_team_id,
+        "result": result
+    }
+
+@router.delete("/proxy-bid/{team_id}")
+async def withdraw_proxy_bid(
+    team_id: int,
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Withdraw a team's ceiling for the current lot (Admin only)"""
+    auction = get_live_auction(db, auction_id)
+    
+    if not auction or not auction.current_player_id:
+        raise HTTPException(status_code=400, detail="No active auction")
+    
+    if not proxy_book.remove_ceiling(auction.id, auction.current_player_id, team_id):
+        raise HTTPException(status_code=404, detail="No proxy bid registered for this team")
+    return {"message": "Proxy bid withdrawn"}
+
+@router.get("/proxy-bids")
+async def get_proxy_bids(
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """List registered ceilings for the current lot (Admin only)"""
+    auction = get_live_auction(db, auction_id)
+    
+    if not auction or not auction.current_player_id:
+        raise HTTPException(status_code=400, detail="No active auction")
+    
+    ceilings = proxy_book.ceilings(auction.id, auction.current_player_id)
+    return [{"team_id": team_id, "max_amount": amount} for team_id, amount in ceilings.items()]
 
 @router.post("/sold")
-async def mark_player_sold(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def mark_player_sold(
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
     """Mark current player as sold and move to next player (Admin only)"""
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status == AuctionStatus.IN_PROGRESS
-    ).first()
+    auction = get_live_auction(db, auction_id)
     
     if not auction:
         raise HTTPException(status_code=400, detail="No active auction")
@@ -259,14 +578,16 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
     player.sold_price = auction.current_bid_amount
     player.team_id = team.id
     
-    # Update team
-    team.remaining_budget -= auction.current_bid_amount
-    team.players_count += 1
+    # Update team purse atomically
+    purse = record_sale(db, team.id, auction.current_bid_amount)
+    record_sold(db, player, team, auction.current_bid_amount)
     
     db.commit()
+    # The winning flag changed, so the lot's in-memory history is stale
+    manager.shard(auction.id).clear_bids()
     
     # Get next player ordered by auction_order (nulls last), then by id
-    next_player = db.query(PlayerModel).filter(
+    next_player = in_league(db.query(PlayerModel), auction.league).filter(
         PlayerModel.status == PlayerStatus.AVAILABLE,
         PlayerModel.registration_fee_paid == True
     ).order_by(
@@ -275,7 +596,7 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
     ).first()
     
     # Broadcast player sold
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "player_sold",
         "data": {
             "player_id": player.id,
@@ -285,6 +606,8 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
             "sold_price": auction.current_bid_amount
         }
     })
+    await manager.broadcast(auction.id, {"type": "purse_update", "data": purse.to_dict()})
+    await manager.broadcast(auction.id, {"type": "leaderboards", "data": leaderboards.snapshot(db, auction.league)})
     
     if next_player:
         # Move to next player
@@ -294,7 +617,7 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
         db.commit()
         
         # Broadcast next player
-        await manager.broadcast({
+        await manager.broadcast(auction.id, {
             "type": "next_player",
             "data": {
                 "player": {
@@ -306,6 +629,7 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
                 }
             }
         })
+        await restart_lot_timer(db, auction.id, next_player.id)
         
         return {"message": "Player sold, moved to next player", "next_player_id": next_player.id}
     else:
@@ -314,7 +638,8 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
         auction.ended_at = datetime.utcnow()
         db.commit()
         
-        await manager.broadcast({
+        lot_timer.cancel(auction.id)
+        await manager.broadcast(auction.id, {
             "type": "auction_completed",
             "data": {"message": "All players have been auctioned"}
         })
@@ -322,11 +647,13 @@ async def mark_player_sold(db: Session = Depends(get_db), current_user: User = D
         return {"message": "Auction completed"}
 
 @router.post("/unsold")
-async def mark_player_unsold(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def mark_player_unsold(
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
     """Mark current player as unsold and move to next player (Admin only)"""
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status == AuctionStatus.IN_PROGRESS
-    ).first()
+    auction = get_live_auction(db, auction_id)
     
     if not auction:
         raise HTTPException(status_code=400, detail="No active auction")
@@ -337,7 +664,7 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
     
     # Get next available player (excluding current and other unsold) ordered by auction_order
     # Only get AVAILABLE players, not UNSOLD ones to avoid re-auctioning unsold players
-    available_players = db.query(PlayerModel).filter(
+    available_players = in_league(db.query(PlayerModel), auction.league).filter(
         PlayerModel.status == PlayerStatus.AVAILABLE,
         PlayerModel.registration_fee_paid == True,
         PlayerModel.id != player.id
@@ -347,7 +674,7 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
     ).all()
     
     # Broadcast player unsold
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "player_unsold",
         "data": {
             "player_id": player.id,
@@ -363,8 +690,10 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
         auction.current_bid_amount = next_player.base_price
         auction.current_bidding_team_id = None
         db.commit()
+        # The lot is closed, so its in-memory history is stale
+        manager.shard(auction.id).clear_bids()
         
-        await manager.broadcast({
+        await manager.broadcast(auction.id, {
             "type": "next_player",
             "data": {
                 "player": {
@@ -375,6 +704,7 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
                 }
             }
         })
+        await restart_lot_timer(db, auction.id, next_player.id)
         
         return {"message": "Player marked unsold, moved to next player"}
     else:
@@ -382,7 +712,9 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
         auction.ended_at = datetime.utcnow()
         db.commit()
         
-        await manager.broadcast({
+        lot_timer.cancel(auction.id)
+        manager.shard(auction.id).clear_bids()
+        await manager.broadcast(auction.id, {
             "type": "auction_completed",
             "data": {"message": "All players have been auctioned"}
         })
@@ -390,17 +722,19 @@ async def mark_player_unsold(db: Session = Depends(get_db), current_user: User =
         return {"message": "Auction completed"}
 
 @router.post("/next-random")
-async def get_random_next_player(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+async def get_random_next_player(
+    auction_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
     """Choose a random player for auction instead of sequential (Admin only)"""
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status == AuctionStatus.IN_PROGRESS
-    ).first()
+    auction = get_live_auction(db, auction_id)
     
     if not auction:
         raise HTTPException(status_code=400, detail="No active auction")
     
     # Get all available players (including unsold)
-    available_players = db.query(PlayerModel).filter(
+    available_players = in_league(db.query(PlayerModel), auction.league).filter(
         PlayerModel.status.in_([PlayerStatus.AVAILABLE, PlayerStatus.UNSOLD]),
         PlayerModel.registration_fee_paid == True,
         PlayerModel.id != auction.current_player_id  # Exclude current player
@@ -419,7 +753,7 @@ async def get_random_next_player(db: Session = Depends(get_db), current_user: Us
     db.commit()
     
     # Broadcast next player
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "next_player",
         "data": {
             "player": {
@@ -431,6 +765,7 @@ async def get_random_next_player(db: Session = Depends(get_db), current_user: Us
             }
         }
     })
+    await restart_lot_timer(db, auction.id, next_player.id)
     
     return {
         "message": "Random player selected",
@@ -443,33 +778,144 @@ async def get_random_next_player(db: Session = Depends(get_db), current_user: Us
     }
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, db: Session = Depends(get_db)):
-    """WebSocket endpoint for real-time auction updates"""
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, auction_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """
+    WebSocket endpoint for real-time auction updates.
+    Pass auction_id to follow one auction; without it every auction's updates are received.
+    """
+    league = None
+    if auction_id is not None:
+        auction = db.query(AuctionModel).filter(AuctionModel.id == auction_id).first()
+        league = auction.league if auction else None
+    purses = [purse.to_dict() for purse in projection.all(db, league)]
+    boards = leaderboards.snapshot(db, league)
+    # Release the pooled connection before awaiting anything, so a burst of
+    # viewers connecting at once cannot exhaust the pool
+    db.close()
+
+    await manager.connect(websocket, auction_id)
+    await websocket.send_json({"type": "purses", "data": purses})
+    await websocket.send_json({"type": "leaderboards", "data": boards})
     try:
         while True:
             data = await websocket.receive_text()
             # Echo back or handle specific messages if needed
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        manager.disconnect(websocket, auction_id)
+
+@router.websocket("/ws/{auction_id}")
+async def auction_websocket_endpoint(websocket: WebSocket, auction_id: int, db: Session = Depends(get_db)):
+    """WebSocket endpoint for one auction's real-time updates"""
+    await websocket_endpoint(websocket, auction_id, db)
+
+@router.get("/leaderboards")
+async def get_leaderboards(league: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    Most expensive buys, top spenders, biggest bidding wars and role record
+    prices, served from memory once their version matches the database's.
+    Updates are pushed over the WebSocket as
+    "leaderboards" messages after every sale and refund.
+    """
+    return leaderboards.snapshot(db, league)
+
+@router.get("/timer")
+async def get_lot_timer(auction_id: Optional[int] = None, db: Session = Depends(get_read_db)):
+    """Get the authoritative deadline for the lot on the block"""
+    auction = get_live_auction(db, auction_id)
+    
+    if auction is None:
+        seconds, deadline = lot_timer_seconds(db), None
+    else:
+        seconds = LOT_TIMER_SECONDS if auction.lot_timer_seconds is None else auction.lot_timer_seconds
+        deadline = describe_lot_deadline(auction)
+    return {
+        "duration_seconds": seconds,
+        "active": deadline is not None,
+        "deadline": deadline
+    }
+
+@router.put("/timer")
+async def set_lot_timer(
+    seconds: float,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Set the lot countdown in seconds, 0 to disable (Admin only). Restarts the timer of every running lot."""
+    if seconds < 0:
+        raise HTTPException(status_code=400, detail="Timer duration cannot be negative")
+    
+    # Kept on the running auctions and the newest one, which the next auction copies
+    newest = select(AuctionModel.id).order_by(AuctionModel.id.desc()).limit(1).scalar_subquery()
+    db.execute(
+        update(AuctionModel)
+        .where(AuctionModel.status.in_([AuctionStatus.IN_PROGRESS, AuctionStatus.PAUSED]) | (AuctionModel.id == newest))
+        .values(lot_timer_seconds=seconds)
+    )
+    db.commit()
+    auctions = db.query(AuctionModel.id, AuctionModel.current_player_id).filter(
+        AuctionModel.status == AuctionStatus.IN_PROGRESS
+    ).all()
+    
+    for auction in auctions:
+        await restart_lot_timer(db, auction.id, auction.current_player_id)
+    
+    return {"message": "Lot timer updated", "duration_seconds": seconds}
 
 @router.get("/history/{player_id}", response_model=List[schemas.BidWithDetails])
-async def get_player_bid_history(player_id: int, db: Session = Depends(get_db)):
-    """Get all bids for a specific player"""
-    bids = db.query(BidModel).filter(BidModel.player_id == player_id).all()
+async def get_player_bid_history(
+    player_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=STREAM_MAX_LIMIT),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get bids for a specific player, oldest first.
+    Pass limit to page through them: the X-Next-Cursor header carries the cursor
+    for the next page and is absent on the last one.
+    With Accept: application/x-ndjson or text/csv the bids are streamed instead.
+    """
+    fmt = stream_format(request)
+    if fmt:
+        return stream_list(
+            fmt, db, BidModel, bid_list_item, [BidModel.player_id == player_id],
+            options=(joinedload(BidModel.team), joinedload(BidModel.player)),
+            cursor=cursor, limit=limit
+        )
+    if limit is not None and limit > HISTORY_MAX_LIMIT:
+        raise HTTPException(status_code=422, detail=f"limit must be at most {HISTORY_MAX_LIMIT}")
+    response.headers["Vary"] = "Accept"
+    
+    after = decode_cursor(cursor)
+    # The player on the block is answered from the auction's in-memory tail
+    bids = manager.lot_bids(db, player_id, after)
+    if bids is None:
+        query = bid_history_query(db, player_id)
+        if after is not None:
+            query = query.filter(BidModel.id > after)
+        if limit is not None:
+            query = query.limit(limit + 1)
+        bids = query.all()
+    
+    if limit is not None and len(bids) > limit:
+        bids = bids[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(bids[-1].id)
     return bids
 
+def bid_list_item(bid: BidModel) -> dict:
+    return schemas.BidWithDetails.model_validate(bid).model_dump(mode="json")
+
 @router.put("/edit-last-bid")
 async def edit_last_bid(
     team_id: int,
     bid_amount: float,
+    auction_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Edit the last bid in case of manual entry mistake (Admin only)"""
-    auction = db.query(AuctionModel).filter(
-        AuctionModel.status == AuctionStatus.IN_PROGRESS
-    ).first()
+    auction = get_live_auction(db, auction_id)
     
     if not auction:
         raise HTTPException(status_code=400, detail="No active auction")
@@ -481,6 +927,7 @@ async def edit_last_bid(
     team = db.query(TeamModel).filter(TeamModel.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
+    check_team_league(team, auction)
     
     # Get current player
     player = db.query(PlayerModel).filter(PlayerModel.id == auction.current_player_id).first()
@@ -490,7 +937,7 @@ async def edit_last_bid(
         raise HTTPException(status_code=400, detail=f"Bid amount must be at least base price: ₹{player.base_price}")
     
     # Calculate and check max bid limit
-    max_bid_limit = calculate_max_bid_limit(team, db)
+    max_bid_limit = feasibility.max_bid(db, team, auction.league)
     if bid_amount > max_bid_limit:
         raise HTTPException(
             status_code=400,
@@ -503,7 +950,7 @@ async def edit_last_bid(
     db.commit()
     
     # Broadcast the updated bid
-    await manager.broadcast({
+    await manager.broadcast(auction.id, {
         "type": "bid_updated",
         "data": {
             "player_id": player.id,
@@ -513,6 +960,7 @@ async def edit_last_bid(
             "bid_amount": bid_amount
         }
     })
+    await restart_lot_timer(db, auction.id, player.id)
     
     return {
         "message": "Bid updated successfully",
@@ -521,8 +969,27 @@ async def edit_last_bid(
         "bid_amount": bid_amount
     }
 
+def archive_bid_history(db: Session, league: Optional[str] = None) -> int:
+    """Move bids (on one league's players, if given) to bid_archives. Returns how many were moved."""
+    condition = true()
+    if league:
+        condition = BidModel.player_id.in_(select(PlayerModel.id).where(PlayerModel.league == league))
+    archived = db.execute(
+        insert(BidArchiveModel).from_select(
+            ["bid_id", "auction_id", "player_id", "team_id", "bid_amount", "is_winning_bid", "created_at", "archived_at"],
+            select(
+                BidModel.id, BidModel.auction_id, BidModel.player_id, BidModel.team_id, BidModel.bid_amount,
+                BidModel.is_winning_bid, BidModel.created_at, literal(datetime.utcnow(), DateTime)
+            ).where(condition)
+        )
+    ).rowcount
+    db.execute(delete(BidModel).where(condition).execution_options(synchronize_session=False))
+    return archived
+
 @router.post("/reset")
 async def reset_auction(
+    auction_id: Optional[int] = None,
+    archive_bids: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
@@ -532,63 +999,93 @@ async def reset_auction(
     - Resets team purses to 10 lakh (1000000)
     - Clears all player-team assignments
     - Resets auction status
+    - With archive_bids, moves the bid history to bid_archives
+    With auction_id, only that auction and its league's players and teams are reset.
+    Each step is one set-based UPDATE rather than a loop over loaded rows.
     """
     try:
-        # 1. Reset all players
-        all_players = db.query(PlayerModel).all()
-        reset_count = 0
+        active_query = db.query(AuctionModel).filter(AuctionModel.status == AuctionStatus.IN_PROGRESS)
+        league = None
+        if auction_id is not None:
+            auction = db.query(AuctionModel).filter(AuctionModel.id == auction_id).first()
+            if not auction:
+                raise HTTPException(status_code=404, detail="Auction not found")
+            league = auction.league
+            active_query = active_query.filter(AuctionModel.id == auction_id)
         
-        for player in all_players:
-            player.status = PlayerStatus.AVAILABLE
-            player.team_id = None
-            player.sold_price = None
-            reset_count += 1
+        # 1. Reset all players
+        players = update(PlayerModel)
+        teams = update(TeamModel)
+        if league:
+            players = players.where(PlayerModel.league == league)
+            teams = teams.where(TeamModel.league == league)
+        reset_count = db.execute(
+            players.values(status=PlayerStatus.AVAILABLE, team_id=None, sold_price=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
         
         # 2. Reset all teams
-        all_teams = db.query(TeamModel).all()
-        team_count = 0
-        
-        for team in all_teams:
-            team.remaining_budget = 1000000  # 10 lakh
-            team.budget = 1000000
-            team.players_count = 0
-            team_count += 1
+        team_count = db.execute(
+            teams.values(remaining_budget=1000000, budget=1000000, players_count=0)  # 10 lakh
+            .execution_options(synchronize_session=False)
+        ).rowcount
         
         # 3. Reset auction status
-        active_auction = db.query(AuctionModel).filter(
-            AuctionModel.status == AuctionStatus.IN_PROGRESS
-        ).first()
-        
-        if active_auction:
-            active_auction.status = AuctionStatus.COMPLETED
-            active_auction.current_player_id = None
-            active_auction.current_bid_amount = None
-            active_auction.current_bidding_team_id = None
+        active_ids = [row.id for row in active_query.with_entities(AuctionModel.id)]
+        if active_ids:
+            db.execute(
+                update(AuctionModel)
+                .where(AuctionModel.id.in_(active_ids))
+                .values(status=AuctionStatus.COMPLETED, current_player_id=None,
+                        current_bid_amount=None, current_bidding_team_id=None)
+                .execution_options(synchronize_session=False)
+            )
         
-        # 4. Clear all bids (optional - you can keep history)
-        # db.query(BidModel).delete()
+        # 4. Move bids to the archive (optional - by default the history is kept)
+        bids_archived = 0
+        if archive_bids:
+            bids_archived = archive_bid_history(db, league)
         
         db.commit()
+        # Only once the reset is committed: if it rolls back, the auctions are
+        # still live and keep their timers, proxy ceilings and bid tails
+        for active_id in active_ids:
+            lot_timer.cancel(active_id)
+            proxy_book.clear(active_id)
+            manager.shard(active_id).clear_bids()
+        if archive_bids:
+            for shard in manager.shards.values():
+                shard.clear_bids()
+        projection.invalidate()
+        leaderboards.invalidate()
+        feasibility.invalidate()
         
         # 5. Broadcast reset notification
-        await manager.broadcast({
+        reset_message = {
             "type": "auction_reset",
             "data": {
                 "message": "Auction has been reset",
                 "players_reset": reset_count,
                 "teams_reset": team_count
             }
-        })
+        }
+        if auction_id is not None:
+            await manager.broadcast(auction_id, reset_message)
+        else:
+            await manager.broadcast_all(reset_message)
         
         return {
             "message": "Auction reset successfully",
             "details": {
                 "players_reset": reset_count,
                 "teams_reset": team_count,
+                "bids_archived": bids_archived,
                 "team_purse_reset_to": "₹10,00,000"
             }
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to reset auction: {str(e)}")
@@ -604,19 +1101,10 @@ async def set_auction_order(
     Expected format: [{"player_id": 1, "order": 1}, {"player_id": 2, "order": 2}, ...]
     """
     try:
-        updated_count = 0
-        for item in player_orders:
-            player_id = item.get("player_id")
-            order = item.get("order")
-            
-            if player_id is None or order is None:
-                continue
-                
-            player = db.query(PlayerModel).filter(PlayerModel.id == player_id).first()
-            if player:
-                player.auction_order = order
-                updated_count += 1
-        
+        updated_count = apply_order(db, (
+            (item.get("player_id"), item.get("order")) for item in player_orders
+            if item.get("player_id") is not None and item.get("order") is not None
+        ))
         db.commit()
         
         return {
@@ -626,3 +1114,29 @@ async def set_auction_order(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to set auction order: {str(e)}")
+
+@router.post("/generate-auction-order")
+async def generate_auction_order(
+    rules: schemas.AuctionOrderRules,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Generate the auction order of every available player (Admin only):
+    marquee players first, then roles interleaved, blocks spread out and
+    higher ratings earlier. With apply false the sequence is only previewed.
+    """
+    order = generate_order(eligible_players(db, rules.league), rules.marquee_count, rules.marquee_ids)
+    updated_count = 0
+    if rules.apply:
+        try:
+            updated_count = apply_order(db, ((player_id, position) for position, player_id in enumerate(order, 1)))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to set auction order: {str(e)}")
+    return {
+        "message": f"Auction order generated for {len(order)} players",
+        "updated_count": updated_count,
+        "order": order
+    }
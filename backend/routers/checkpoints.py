@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from database import get_db
+from models import Auction as AuctionModel, AuctionStatus, Checkpoint, User
+from auth import get_current_admin_user
+from checkpoints import create_checkpoint, restore_checkpoint, delete_checkpoint
+from purse import projection
+from leaderboards import leaderboards
+from feasibility import feasibility
+from proxy_bidding import proxy_book
+from live_state import manager
+from response_cache import response_cache
+from routers.auction import lot_timer, restart_lot_timer
+import schemas
+
+router = APIRouter()
+
+def get_checkpoint(db: Session, name: str) -> Checkpoint:
+    checkpoint = db.query(Checkpoint).filter(Checkpoint.name == name).first()
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+    return checkpoint
+
+@router.get("/", response_model=List[schemas.Checkpoint])
+async def list_checkpoints(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """All checkpoints, newest first (Admin only)"""
+    return db.query(Checkpoint).order_by(Checkpoint.created_at.desc(), Checkpoint.id.desc()).all()
+
+@router.post("/", response_model=schemas.Checkpoint)
+async def save_checkpoint(
+    body: schemas.CheckpointCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Save the auction state - players' status, team and price, team purses,
+    auctions and bids - under a name, to restore later (Admin only)
+    """
+    if db.query(Checkpoint.id).filter(Checkpoint.name == body.name).first():
+        raise HTTPException(status_code=400, detail="Checkpoint name already exists")
+    try:
+        return create_checkpoint(db, body.name)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save checkpoint: {str(e)}")
+
+@router.post("/{name}/restore")
+async def restore_auction_checkpoint(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Put the auction back exactly as it was when the checkpoint was saved (Admin only)"""
+    checkpoint = get_checkpoint(db, name)
+    try:
+        restored = restore_checkpoint(db, checkpoint)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to restore checkpoint: {str(e)}")
+    
+    # Everything kept in memory describes the state that was just replaced
+    projection.invalidate()
+    leaderboards.invalidate()
+    feasibility.invalidate()
+    response_cache.clear()
+    proxy_book.clear()
+    for auction_id, shard in list(manager.shards.items()):
+        lot_timer.cancel(auction_id)
+        shard.clear_bids()
+    
+    live_auctions = db.query(AuctionModel.id, AuctionModel.current_player_id).filter(
+        AuctionModel.status == AuctionStatus.IN_PROGRESS
+    ).all()
+    for auction in live_auctions:
+        await restart_lot_timer(db, auction.id, auction.current_player_id)
+    await manager.broadcast_all({
+        "type": "checkpoint_restored",
+        "data": {"name": checkpoint.name, "created_at": checkpoint.created_at.isoformat()}
+    })
+    await manager.broadcast_all({"type": "purses", "data": [purse.to_dict() for purse in projection.all(db)]})
+    
+    return {
+        "message": f"Restored checkpoint {checkpoint.name}",
+        "checkpoint": schemas.Checkpoint.model_validate(checkpoint),
+        "restored": restored
+    }
+
+@router.delete("/{name}")
+async def remove_checkpoint(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Delete a checkpoint (Admin only)"""
+    delete_checkpoint(db, get_checkpoint(db, name))
+    db.commit()
+    return {"message": "Checkpoint deleted successfully"}
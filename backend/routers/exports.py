@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from database import get_db
+from models import User
+from auth import get_current_admin_user
+from export_jobs import export_jobs, EXPORT_KINDS, download_filename
+
+router = APIRouter()
+
+@router.post("/{kind}")
+async def create_export_job(
+    kind: str,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Start an export (players, teams or owner-registrations) in the background (Admin only).
+    If nothing changed since the last one, the finished job is returned straight away.
+    """
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {kind}")
+    job = export_jobs.submit(db, kind)
+    if job["status"] != "done":
+        response.status_code = 202
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_export_job(job_id: str, current_user: User = Depends(get_current_admin_user)):
+    """Status of an export job; done jobs carry their download_url"""
+    job = export_jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@router.get("/jobs/{job_id}/download")
+async def download_export(job_id: str, current_user: User = Depends(get_current_admin_user)):
+    """Download a finished export"""
+    job = export_jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Export is {job['status']}")
+    kind = EXPORT_KINDS[job["kind"]]
+    return FileResponse(export_jobs.artifact_path(job_id), media_type=kind.media_type, filename=download_filename(kind))
@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from typing import List, Optional
+from database import get_db, SessionLocal
 from models import OwnerRegistration
 import schemas
-from io import BytesIO
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from datetime import datetime
+from lazy_imports import get_openpyxl, get_openpyxl_styles
+from conditional import table_version, make_etag, etag_matches, set_etag, not_modified
+from export_jobs import export_jobs, EXPORT_KINDS, download_filename
+from list_stream import stream_format, stream_list, STREAM_MAX_LIMIT
 
 router = APIRouter()
 
@@ -36,11 +36,37 @@ async def create_owner_registration(
     return db_registration
 
 @router.get("/owner-registrations/", response_model=List[schemas.OwnerRegistrationResponse])
-async def get_owner_registrations(db: Session = Depends(get_db)):
-    """Get all owner registrations"""
+async def get_owner_registrations(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=STREAM_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all owner registrations, newest first.
+    With Accept: application/x-ndjson or text/csv they are streamed by id
+    instead, and cursor/limit page through them (see list_stream).
+    """
+    fmt = stream_format(request)
+    etag = make_etag("owner-registrations", fmt, cursor, limit, table_version(db, OwnerRegistration))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    if fmt:
+        return stream_list(
+            fmt, db, OwnerRegistration, owner_registration_item,
+            cursor=cursor, limit=limit, headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept"
     registrations = db.query(OwnerRegistration).order_by(OwnerRegistration.created_at.desc()).all()
     return registrations
 
+def owner_registration_item(registration: OwnerRegistration) -> dict:
+    return schemas.OwnerRegistrationResponse.model_validate(registration).model_dump(mode="json")
+
 @router.get("/owner-registrations/{registration_id}", response_model=schemas.OwnerRegistrationResponse)
 async def get_owner_registration(registration_id: int, db: Session = Depends(get_db)):
     """Get a specific owner registration by ID"""
@@ -52,117 +78,132 @@ async def get_owner_registration(registration_id: int, db: Session = Depends(get
 @router.get("/owner-registrations/export/excel")
 async def export_owner_registrations_excel(db: Session = Depends(get_db)):
     """Export all owner registrations to Excel"""
-    registrations = db.query(OwnerRegistration).order_by(OwnerRegistration.created_at.desc()).all()
-    
-    # Create workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Owner Registrations"
-    
-    # Define header style
-    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Add event information at the top
-    ws.merge_cells('A1:I1')
-    event_cell = ws['A1']
-    event_cell.value = "Galaxia Premier League Season 2 - Owner Registrations"
-    event_cell.font = Font(bold=True, size=16, color="4F81BD")
-    event_cell.alignment = Alignment(horizontal="center", vertical="center")
-    
-    ws.merge_cells('A2:I2')
-    event_details = ws['A2']
-    event_details.value = "Tournament: 10-11 January 2026 | Auction: 2nd November 2025 at Club Stella | Team Price: ₹15,000"
-    event_details.font = Font(size=11, italic=True)
-    event_details.alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Add empty row
-    ws.append([])
-    
-    # Headers
-    headers = [
-        "ID",
-        "Owner Full Name",
-        "Owner Block",
-        "Owner Unit",
-        "Co-Owner Full Name",
-        "Co-Owner Block",
-        "Co-Owner Unit",
-        "Interested to Buy",
-        "Team Price (INR)",
-        "Registration Date"
+    # Built (or reused) by an export job in the worker process, off the event loop
+    try:
+        path = await export_jobs.artifact(db, "owner-registrations")
+    except (RuntimeError, TimeoutError) as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {e}")
+    kind = EXPORT_KINDS["owner-registrations"]
+    return FileResponse(path, media_type=kind.media_type, filename=download_filename(kind))
+
+OWNER_EXPORT_TITLE = "Galaxia Premier League Season 2 - Owner Registrations"
+OWNER_EXPORT_DETAILS = "Tournament: 10-11 January 2026 | Auction: 2nd November 2025 at Club Stella | Team Price: ₹15,000"
+OWNER_EXPORT_HEADERS = [
+    "ID",
+    "Owner Full Name",
+    "Owner Block",
+    "Owner Unit",
+    "Co-Owner Full Name",
+    "Co-Owner Block",
+    "Co-Owner Unit",
+    "Interested to Buy",
+    "Team Price (INR)",
+    "Registration Date"
+]
+
+def owner_export_styles() -> list:
+    """Named styles of the owner registrations workbook (new objects each time, as they bind to a workbook)"""
+    styles = get_openpyxl_styles()
+    NamedStyle, Font, PatternFill, Alignment = styles.NamedStyle, styles.Font, styles.PatternFill, styles.Alignment
+    centered = dict(horizontal="center", vertical="center")
+    return [
+        NamedStyle("gpl_title", font=Font(bold=True, size=16, color="4F81BD"), alignment=Alignment(**centered)),
+        NamedStyle("gpl_details", font=Font(size=11, italic=True), alignment=Alignment(**centered)),
+        NamedStyle("gpl_header", font=Font(bold=True, color="FFFFFF", size=12), alignment=Alignment(**centered),
+                   fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")),
+        NamedStyle("gpl_total_label", font=Font(bold=True, size=11), alignment=Alignment(horizontal="right")),
+        NamedStyle("gpl_total", font=Font(bold=True, size=11)),
+        NamedStyle("gpl_interested_label", font=Font(bold=True, size=11, color="00B050"),
+                   alignment=Alignment(horizontal="right")),
+        NamedStyle("gpl_interested", font=Font(bold=True, size=11, color="00B050")),
     ]
+
+def write_owner_registrations_export(path: str):
+    """
+    Write the owner registrations workbook to a file (run by export jobs).
+    Cell values, column widths and totals are worked out in one pass over the
+    registrations; the sheet is then written in write-only mode.
+    """
+    db = SessionLocal()
+    try:
+        registrations = db.query(
+            OwnerRegistration.id,
+            OwnerRegistration.owner_full_name,
+            OwnerRegistration.owner_block,
+            OwnerRegistration.owner_unit_number,
+            OwnerRegistration.co_owner_full_name,
+            OwnerRegistration.co_owner_block,
+            OwnerRegistration.co_owner_unit_number,
+            OwnerRegistration.interested_to_buy,
+            OwnerRegistration.team_price,
+            OwnerRegistration.created_at,
+        ).order_by(OwnerRegistration.created_at.desc()).all()
+    finally:
+        db.close()
+    
+    # A column is as wide as its longest text from the title down to the last
+    # registration (blank cells count as "None"), plus 2 and at most 50
+    widths = [len("None")] * len(OWNER_EXPORT_HEADERS)
+    widths[0] = max(len(OWNER_EXPORT_TITLE), len(OWNER_EXPORT_DETAILS))
+    widths = list(map(max, widths, map(len, OWNER_EXPORT_HEADERS)))
+    prices = {}
+    rows = []
+    interested_count = 0
+    for (reg_id, owner_name, owner_block, owner_unit, co_owner_name, co_owner_block, co_owner_unit,
+         interested, team_price, created_at) in registrations:
+        if team_price not in prices:
+            prices[team_price] = f"₹{team_price:,.0f}"
+        row = (
+            reg_id,
+            owner_name,
+            owner_block.value if owner_block else "",
+            owner_unit,
+            co_owner_name if co_owner_name else "N/A",
+            co_owner_block.value if co_owner_block else "N/A",
+            co_owner_unit if co_owner_unit else "N/A",
+            "Yes" if interested else "No",
+            prices[team_price],
+            created_at.strftime("%d-%b-%Y %I:%M %p")
+        )
+        widths = list(map(max, widths, map(len, map(str, row))))
+        interested_count += bool(interested)
+        rows.append(row)
+    
+    openpyxl = get_openpyxl()
+    WriteOnlyCell, get_column_letter = openpyxl.cell.WriteOnlyCell, openpyxl.utils.get_column_letter
+    
+    wb = openpyxl.Workbook(write_only=True)
+    for style in owner_export_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet("Owner Registrations")
+    # Write-only sheets put column widths ahead of the rows, so they are set first
+    for index, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = min(width + 2, 50)
+    
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+    
+    # Event information at the top, then an empty row, headers and data
+    ws.merged_cells.add("A1:I1")
+    ws.append([styled(OWNER_EXPORT_TITLE, "gpl_title")])
+    ws.merged_cells.add("A2:I2")
+    ws.append([styled(OWNER_EXPORT_DETAILS, "gpl_details")])
+    ws.append([])
+    ws.append([styled(header, "gpl_header") for header in OWNER_EXPORT_HEADERS])
+    for row in rows:
+        ws.append(row)
     
-    ws.append(headers)
-    
-    # Style headers
-    for cell in ws[4]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Add data
-    for reg in registrations:
-        ws.append([
-            reg.id,
-            reg.owner_full_name,
-            reg.owner_block.value if reg.owner_block else "",
-            reg.owner_unit_number,
-            reg.co_owner_full_name if reg.co_owner_full_name else "N/A",
-            reg.co_owner_block.value if reg.co_owner_block else "N/A",
-            reg.co_owner_unit_number if reg.co_owner_unit_number else "N/A",
-            "Yes" if reg.interested_to_buy else "No",
-            f"₹{reg.team_price:,.0f}",
-            reg.created_at.strftime("%d-%b-%Y %I:%M %p")
-        ])
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Add summary section
-    last_row = ws.max_row + 2
-    ws.merge_cells(f'A{last_row}:B{last_row}')
-    summary_cell = ws[f'A{last_row}']
-    summary_cell.value = "Total Registrations:"
-    summary_cell.font = Font(bold=True, size=11)
-    summary_cell.alignment = Alignment(horizontal="right")
-    ws[f'C{last_row}'] = len(registrations)
-    ws[f'C{last_row}'].font = Font(bold=True, size=11)
-    
-    interested_count = sum(1 for reg in registrations if reg.interested_to_buy)
-    last_row += 1
-    ws.merge_cells(f'A{last_row}:B{last_row}')
-    interested_cell = ws[f'A{last_row}']
-    interested_cell.value = "Interested to Buy:"
-    interested_cell.font = Font(bold=True, size=11, color="00B050")
-    interested_cell.alignment = Alignment(horizontal="right")
-    ws[f'C{last_row}'] = interested_count
-    ws[f'C{last_row}'].font = Font(bold=True, size=11, color="00B050")
-    
-    # Save to BytesIO
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
-    
-    # Generate filename with timestamp
-    filename = f"GPL_Season2_Owner_Registrations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    # Summary section after one empty row
+    ws.append([])
+    summary_row = len(rows) + 6
+    ws.merged_cells.add(f"A{summary_row}:B{summary_row}")
+    ws.append([styled("Total Registrations:", "gpl_total_label"), None, styled(len(rows), "gpl_total")])
+    ws.merged_cells.add(f"A{summary_row + 1}:B{summary_row + 1}")
+    ws.append([styled("Interested to Buy:", "gpl_interested_label"), None, styled(interested_count, "gpl_interested")])
     
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    wb.save(path)
 
 @router.delete("/owner-registrations/{registration_id}")
 async def delete_owner_registration(registration_id: int, db: Session = Depends(get_db)):
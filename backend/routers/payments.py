@@ -3,20 +3,23 @@ from sqlalchemy.orm import Session
 from database import get_db
 from models import Payment as PaymentModel, Player as PlayerModel, PaymentStatus
 import schemas
-import razorpay
 import hmac
 import hashlib
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
+from lazy_imports import get_razorpay
 
 load_dotenv()
 
 router = APIRouter()
 
-# Initialize Razorpay client
-razorpay_client = razorpay.Client(
-    auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET"))
-)
+@lru_cache(maxsize=1)
+def get_razorpay_client():
+    """Build the Razorpay client on first use instead of at import time"""
+    return get_razorpay().Client(
+        auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET"))
+    )
 
 @router.post("/create-order")
 async def create_razorpay_order(player_id: int, db: Session = Depends(get_db)):
@@ -38,7 +41,7 @@ async def create_razorpay_order(player_id: int, db: Session = Depends(get_db)):
             db.refresh(payment)
         
         # Create Razorpay order
-        razorpay_order = razorpay_client.order.create({
+        razorpay_order = get_razorpay_client().order.create({
             "amount": 50000,  # 500 INR in paise
             "currency": "INR",
             "receipt": f"gpl_reg_{player_id}_{payment.id}",
@@ -100,7 +103,7 @@ async def verify_payment(
             raise HTTPException(status_code=404, detail="Payment record not found")
         
         # Fetch payment details from Razorpay to get UPI details
-        razorpay_payment_details = razorpay_client.payment.fetch(razorpay_payment_id)
+        razorpay_payment_details = get_razorpay_client().payment.fetch(razorpay_payment_id)
         
         # Update payment record
         payment.razorpay_payment_id = razorpay_payment_id
@@ -182,7 +185,7 @@ async def razorpay_webhook(request: Request, db: Session = Depends(get_db)):
     else:
         # Verify webhook signature
         try:
-            razorpay_client.utility.verify_webhook_signature(
+            get_razorpay_client().utility.verify_webhook_signature(
                 payload.decode(),
                 signature,
                 webhook_secret
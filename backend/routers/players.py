@@ -1,38 +1,94 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, defer, joinedload
 from typing import List, Optional
-from database import get_db
+from database import get_db, get_read_db, read_from_replica, SessionLocal
 from models import Player as PlayerModel, PlayerStatus, PlayerRole, User, Team as TeamModel, Bid
 from auth import get_current_user, get_current_admin_user
+from purse import record_refund, record_refunds
+from leaderboards import leaderboards, record_released
+from live_state import manager
+from response_cache import response_cache, cached_response, json_bytes
+from conditional import table_version, tables_version, make_etag, etag_matches, set_etag, not_modified
+from list_stream import stream_format, stream_list, STREAM_MAX_LIMIT
 import schemas
+from xlsx_stream import stream_xlsx, XLSX_MEDIA_TYPE, EXPORT_BATCH_ROWS
+from export_jobs import export_jobs
+from lazy_imports import is_available
+from player_ratings import recompute_ratings, validate_weights
+from player_import import import_players, read_csv, read_xlsx
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Player])
 async def get_all_players(
+    request: Request,
+    response: Response,
     status: Optional[PlayerStatus] = None,
     role: Optional[PlayerRole] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=STREAM_MAX_LIMIT),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Get all players with optional filters (Admin only)"""
-    query = db.query(PlayerModel)
+    """
+    Get all players with optional filters (Admin only).
+    With Accept: application/x-ndjson or text/csv the rows are streamed by id,
+    and cursor/limit page through them (see list_stream).
+    """
+    fmt = stream_format(request)
+    etag = make_etag("players", status, role, fmt, cursor, limit, table_version(db, PlayerModel))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
+    filters = []
     if status:
-        query = query.filter(PlayerModel.status == status)
+        filters.append(PlayerModel.status == status)
     if role:
-        query = query.filter(PlayerModel.role == role)
+        filters.append(PlayerModel.role == role)
     
-    players = query.all()
+    if fmt:
+        return stream_list(
+            fmt, db, PlayerModel, player_list_item, filters,
+            cursor=cursor, limit=limit, headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept"
+    players = db.query(PlayerModel).filter(*filters).all()
     return players
 
+def player_list_item(player: PlayerModel) -> dict:
+    return schemas.Player.model_validate(player).model_dump(mode="json")
+
 @router.get("/{player_id}", response_model=schemas.PlayerWithTeam)
-async def get_player(player_id: int, db: Session = Depends(get_db)):
+async def get_player(player_id: int, db: Session = Depends(get_read_db)):
     """Get player details by ID"""
-    player = db.query(PlayerModel).filter(PlayerModel.id == player_id).first()
+    # Versioned like the lists, so another worker's sale misses this worker's entry
+    key = f"/players/{player_id}?version={make_etag(tables_version(db, PlayerModel, TeamModel))}"
+    body = response_cache.get(key)
+    if body is not None:
+        return cached_response(body)
+    generation = response_cache.generation()
+    
+    # The team is part of the response; load it in the same query
+    player = db.query(PlayerModel).options(
+        joinedload(PlayerModel.team)
+    ).filter(PlayerModel.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
-    return player
+    
+    tags = [f"player:{player_id}"]
+    if player.team_id:
+        # The embedded team (and its purse) changes with every sale to it
+        tags.append(f"team:{player.team_id}")
+    body = json_bytes(schemas.PlayerWithTeam.model_validate(player))
+    if not read_from_replica(db):
+        response_cache.set(key, body, tags, generation)
+    return cached_response(body)
 
 @router.post("/", response_model=schemas.Player)
 async def create_player(player: schemas.PlayerCreate, db: Session = Depends(get_db)):
@@ -65,6 +121,9 @@ async def update_player(
         setattr(player, field, value)
     
     db.commit()
+    if player.status == PlayerStatus.SOLD:
+        # A sold player's name, role or league is shown on the leaderboards
+        leaderboards.invalidate()
     db.refresh(player)
     return player
 
@@ -97,10 +156,11 @@ async def delete_player(
     # Now delete the player
     db.delete(player)
     db.commit()
+    manager.clear_player_bids(player_id)
     return {"message": "Player deleted successfully"}
 
 @router.get("/available/count")
-async def get_available_players_count(db: Session = Depends(get_db)):
+async def get_available_players_count(db: Session = Depends(get_read_db)):
     """Get count of available players for auction"""
     count = db.query(PlayerModel).filter(
         PlayerModel.status == PlayerStatus.AVAILABLE,
@@ -108,6 +168,160 @@ async def get_available_players_count(db: Session = Depends(get_db)):
     ).count()
     return {"count": count}
 
+# numpy is optional: without it ratings cannot be recomputed (503)
+RATINGS_AVAILABLE = is_available("numpy")
+
+@router.post("/ratings/recompute")
+async def recompute_player_ratings(
+    body: Optional[schemas.RatingRecompute] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Rate every player from their CricHeroes stats (Admin only), optionally
+    with custom role weights, and store the ratings that changed.
+    """
+    if not RATINGS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Player ratings require numpy")
+    weights = None
+    if body is not None and body.weights:
+        try:
+            weights = validate_weights(body.weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await run_in_threadpool(recompute_ratings, db, weights)
+
+def load_batch(db: Session, player_ids: List[int]) -> list:
+    """Status columns of a batch of players; 404 naming any that don't exist"""
+    rows = db.query(
+        PlayerModel.id, PlayerModel.status, PlayerModel.team_id, PlayerModel.sold_price,
+        PlayerModel.league, PlayerModel.registration_fee_paid
+    ).filter(PlayerModel.id.in_(player_ids)).all()
+    missing = sorted(set(player_ids) - {row.id for row in rows})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Players not found: {missing}")
+    return rows
+
+def release_sold_players(db: Session, rows: list) -> list:
+    """Credit back the teams of the sold players among rows, with one UPDATE. Returns the new purses."""
+    refunds = {}
+    for row in rows:
+        if row.status != PlayerStatus.SOLD:
+            continue
+        if row.team_id and row.sold_price:
+            amount, count = refunds.get(row.team_id, (0.0, 0))
+            refunds[row.team_id] = (amount + row.sold_price, count + 1)
+        record_released(db, row)
+    return record_refunds(db, refunds)
+
+def set_batch_status(db: Session, player_ids: List[int], status: PlayerStatus, release: bool):
+    """One UPDATE for the whole batch; release also clears team and sold price"""
+    if not player_ids:
+        return
+    values = {"status": status, "team_id": None, "sold_price": None} if release else {"status": status}
+    db.execute(
+        update(PlayerModel).where(PlayerModel.id.in_(player_ids)).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+async def broadcast_released(db: Session, rows: list, purses: list):
+    for purse in purses:
+        await manager.broadcast_all({"type": "purse_update", "data": purse.to_dict()})
+    for league in sorted({row.league for row in rows if row.status == PlayerStatus.SOLD}, key=str):
+        await manager.broadcast_all({"type": "leaderboards", "data": leaderboards.snapshot(db, league)})
+
+@router.post("/batch/mark-available")
+async def mark_players_available(
+    batch: schemas.PlayerBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Mark several players as available for auction in one transaction (Admin only)
+    Sold players' teams are credited back, as with mark-available"""
+    rows = load_batch(db, batch.player_ids)
+    unpaid = [row.id for row in rows if not row.registration_fee_paid]
+    if unpaid:
+        raise HTTPException(status_code=400, detail=f"Registration fee not paid: {sorted(unpaid)}")
+    
+    purses = release_sold_players(db, rows)
+    set_batch_status(db, [row.id for row in rows if row.status == PlayerStatus.SOLD], PlayerStatus.AVAILABLE, True)
+    set_batch_status(db, [row.id for row in rows if row.status != PlayerStatus.SOLD], PlayerStatus.AVAILABLE, False)
+    db.commit()
+    
+    await broadcast_released(db, rows, purses)
+    return {
+        "message": f"{len(rows)} players marked as available for auction",
+        "updated_count": len(rows),
+        "purses": [purse.to_dict() for purse in purses]
+    }
+
+@router.post("/batch/mark-unsold")
+async def mark_sold_players_as_unsold(
+    batch: schemas.PlayerBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Mark several SOLD players as UNSOLD in one transaction and credit back their teams (Admin only)"""
+    rows = load_batch(db, batch.player_ids)
+    not_sold = [row.id for row in rows if row.status != PlayerStatus.SOLD]
+    if not_sold:
+        raise HTTPException(status_code=400, detail=f"Players not in SOLD status: {sorted(not_sold)}")
+    incomplete = [row.id for row in rows if not (row.team_id and row.sold_price)]
+    if incomplete:
+        raise HTTPException(status_code=400, detail=f"No team or sold price information found: {sorted(incomplete)}")
+    
+    purses = release_sold_players(db, rows)
+    set_batch_status(db, [row.id for row in rows], PlayerStatus.UNSOLD, True)
+    db.commit()
+    
+    await broadcast_released(db, rows, purses)
+    credited_amount = sum(row.sold_price for row in rows)
+    return {
+        "message": f"{len(rows)} players marked as unsold. ₹{credited_amount:,.0f} credited back to {len(purses)} teams",
+        "updated_count": len(rows),
+        "credited_amount": credited_amount,
+        "purses": [purse.to_dict() for purse in purses]
+    }
+
+# openpyxl is optional: without it only CSV files can be imported (503 for XLSX)
+XLSX_IMPORT_AVAILABLE = is_available("openpyxl")
+
+def run_import(db: Session, file, reader) -> dict:
+    headers, rows = reader(file)
+    report = import_players(db, headers, rows)
+    db.commit()
+    return report
+
+@router.post("/import")
+async def import_players_file(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Register players in bulk from a CSV or XLSX file (Admin only). The first
+    row names the columns, as in the registration form (name, email and role
+    are required). Valid rows are imported; the others are reported by row.
+    """
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv"):
+        reader = read_csv
+    elif filename.endswith(".xlsx"):
+        if not XLSX_IMPORT_AVAILABLE:
+            raise HTTPException(status_code=503, detail="XLSX import requires openpyxl")
+        reader = read_xlsx
+    else:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .xlsx file")
+    try:
+        report = await run_in_threadpool(run_import, db, file.file, reader)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="A player in the file registered during the import; try again")
+    return dict(report, message=f"{report['imported']} players imported, {report['rejected']} rows rejected")
+
 @router.post("/{player_id}/mark-available")
 async def mark_player_available(
     player_id: int, 
@@ -124,13 +338,12 @@ async def mark_player_available(
         raise HTTPException(status_code=400, detail="Registration fee not paid")
     
     # Reset player data and credit back amount if they were previously sold
+    purse = None
     if player.status == PlayerStatus.SOLD:
         if player.team_id and player.sold_price:
-            # Get the team and credit back the amount
-            team = db.query(TeamModel).filter(TeamModel.id == player.team_id).first()
-            if team:
-                team.remaining_budget += player.sold_price
-                team.players_count = max(0, team.players_count - 1)
+            # Credit back the amount to the team
+            purse = record_refund(db, player.team_id, player.sold_price)
+        record_released(db, player)
         
         player.team_id = None
         player.sold_price = None
@@ -138,6 +351,10 @@ async def mark_player_available(
     player.status = PlayerStatus.AVAILABLE
     db.commit()
     db.refresh(player)
+    
+    if purse:
+        await manager.broadcast_all({"type": "purse_update", "data": purse.to_dict()})
+        await manager.broadcast_all({"type": "leaderboards", "data": leaderboards.snapshot(db, player.league)})
     return {"message": "Player marked as available for auction", "player": player}
 
 @router.post("/{player_id}/mark-unsold")
@@ -156,13 +373,9 @@ async def mark_sold_player_as_unsold(
     
     # Credit back the sold amount to the team
     if player.team_id and player.sold_price:
-        team = db.query(TeamModel).filter(TeamModel.id == player.team_id).first()
-        if team:
-            team.remaining_budget += player.sold_price
-            team.players_count = max(0, team.players_count - 1)
-            team_name = team.name
-        else:
-            team_name = "Unknown"
+        purse = record_refund(db, player.team_id, player.sold_price)
+        record_released(db, player)
+        team_name = player.team.name if player.team else "Unknown"
     else:
         raise HTTPException(status_code=400, detail="No team or sold price information found")
     
@@ -177,6 +390,10 @@ async def mark_sold_player_as_unsold(
     db.commit()
     db.refresh(player)
     
+    if purse:
+        await manager.broadcast_all({"type": "purse_update", "data": purse.to_dict()})
+        await manager.broadcast_all({"type": "leaderboards", "data": leaderboards.snapshot(db, player.league)})
+    
     return {
         "message": f"Player marked as unsold. ₹{credited_amount:,.0f} credited back to {team_name}",
         "player": player,
@@ -184,70 +401,81 @@ async def mark_sold_player_as_unsold(
         "team_name": team_name
     }
 
+PLAYER_EXPORT_COLUMNS = [
+    "ID", "Name", "Email", "Phone", "Age", "Role", "Status", "Batting Style", "Bowling Style",
+    "Block Name", "Flat Number", "Jersey Size", "Cricheroes ID", "Base Price", "Sold Price",
+    "Team ID", "Team Name", "Team Short Name", "Registration Fee Paid", "Matches Played",
+    "Runs Scored", "Wickets Taken", "Batting Average", "Strike Rate", "Created At"
+]
+
+def player_export_row(player: PlayerModel) -> tuple:
+    """One export row, in PLAYER_EXPORT_COLUMNS order"""
+    team = player.team
+    return (
+        player.id,
+        player.name,
+        player.email,
+        player.phone,
+        player.age,
+        player.role.value if player.role else None,
+        player.status.value if player.status else None,
+        player.batting_style.value if player.batting_style else None,
+        player.bowling_style.value if player.bowling_style else None,
+        player.block_name.value if player.block_name else None,
+        player.flat_number,
+        player.jersey_size.value if player.jersey_size else None,
+        player.cricheroes_id,
+        player.base_price,
+        player.sold_price,
+        player.team_id,
+        team.name if team else None,
+        team.short_name if team else None,
+        player.registration_fee_paid,
+        player.matches_played,
+        player.runs_scored,
+        player.wickets_taken,
+        player.batting_average,
+        player.strike_rate,
+        player.created_at
+    )
+
+def iter_player_export_rows():
+    """
+    Stream export rows from a server-side cursor, EXPORT_BATCH_ROWS players
+    at a time. Opens its own session because the body is produced after the
+    request's dependencies have been cleaned up.
+    """
+    db = SessionLocal()
+    try:
+        # Team names joined in, image blobs (not exported) left behind
+        query = db.query(PlayerModel).options(
+            defer(PlayerModel.player_image),
+            joinedload(PlayerModel.team).load_only(TeamModel.name, TeamModel.short_name)
+        ).order_by(PlayerModel.id).yield_per(EXPORT_BATCH_ROWS)
+        for player in query:
+            yield player_export_row(player)
+    finally:
+        db.close()
+
+def write_players_export(path: str):
+    """Write the players workbook to a file (run by export jobs)"""
+    with open(path, "wb") as f:
+        for chunk in stream_xlsx("Players", PLAYER_EXPORT_COLUMNS, iter_player_export_rows()):
+            f.write(chunk)
+
 @router.get("/export/excel")
 async def export_players_to_excel(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Export all players to Excel (Admin only)"""
-    import io
-    import pandas as pd
-    from fastapi.responses import StreamingResponse
-    
-    players = db.query(PlayerModel).all()
-    
-    # Convert to dict
-    players_data = []
-    for player in players:
-        # Get team details if player is assigned to a team
-        team_name = None
-        team_short_name = None
-        if player.team_id:
-            team = db.query(TeamModel).filter(TeamModel.id == player.team_id).first()
-            if team:
-                team_name = team.name
-                team_short_name = team.short_name
-        
-        players_data.append({
-            "ID": player.id,
-            "Name": player.name,
-            "Email": player.email,
-            "Phone": player.phone,
-            "Age": player.age,
-            "Role": player.role.value if player.role else None,
-            "Status": player.status.value if player.status else None,
-            "Batting Style": player.batting_style.value if player.batting_style else None,
-            "Bowling Style": player.bowling_style.value if player.bowling_style else None,
-            "Block Name": player.block_name.value if player.block_name else None,
-            "Flat Number": player.flat_number,
-            "Jersey Size": player.jersey_size.value if player.jersey_size else None,
-            "Cricheroes ID": player.cricheroes_id,
-            "Base Price": player.base_price,
-            "Sold Price": player.sold_price,
-            "Team ID": player.team_id,
-            "Team Name": team_name,
-            "Team Short Name": team_short_name,
-            "Registration Fee Paid": player.registration_fee_paid,
-            "Matches Played": player.matches_played,
-            "Runs Scored": player.runs_scored,
-            "Wickets Taken": player.wickets_taken,
-            "Batting Average": player.batting_average,
-            "Strike Rate": player.strike_rate,
-            "Created At": player.created_at
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(players_data)
-    
-    # Write to Excel
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Players')
-    output.seek(0)
-    
+    # An export job may already have built this version of the workbook
+    path = export_jobs.cached_artifact(db, "players")
+    if path is not None:
+        return FileResponse(path, media_type=XLSX_MEDIA_TYPE, filename="gpl_players.xlsx")
     return StreamingResponse(
-        output,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        stream_xlsx("Players", PLAYER_EXPORT_COLUMNS, iter_player_export_rows()),
+        media_type=XLSX_MEDIA_TYPE,
         headers={'Content-Disposition': 'attachment; filename=gpl_players.xlsx'}
     )
 
@@ -4,17 +4,15 @@ from database import get_db
 from models import Player as PlayerModel, Payment as PaymentModel, PlayerStatus
 import models
 import schemas
+import re
+from lazy_imports import is_available, get_requests, get_beautifulsoup
 
 router = APIRouter()
 
-# Try to import required packages for web scraping
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    import re
-    SCRAPING_AVAILABLE = True
-except ImportError:
-    SCRAPING_AVAILABLE = False
+# Check for web scraping packages without importing them; requests and bs4
+# are loaded on the first CricHeroes lookup instead of at startup
+SCRAPING_AVAILABLE = is_available("requests", "bs4")
+if not SCRAPING_AVAILABLE:
     print("Warning: Web scraping packages not available. Player data fetching will be limited.")
 
 async def fetch_cricheroes_data(cricheroes_id: str):
@@ -34,6 +32,9 @@ async def fetch_cricheroes_data(cricheroes_id: str):
         print("Warning: Web scraping not available")
         return None
     
+    requests = get_requests()
+    BeautifulSoup = get_beautifulsoup()
+    
     try:
         # Parse the cricheroes_id to get the profile URL
         if cricheroes_id.startswith('http'):
@@ -192,6 +193,7 @@ async def register_player(
         cricheroes_id=registration.cricheroes_id,
         bio=registration.bio,
         player_image=registration.player_image,  # Store player image URL
+        league=registration.league,
         status=PlayerStatus.AVAILABLE,
         registration_fee_paid=True,
         has_cricheroes_data=bool(registration.cricheroes_id)
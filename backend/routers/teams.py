@@ -1,65 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import Team as TeamModel, PlayerStatus, User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session, defer, selectinload
+from typing import List, Optional
+from database import get_db, get_read_db, read_from_replica, SessionLocal
+from models import Player as PlayerModel, Team as TeamModel, PlayerStatus, User
 from auth import get_current_admin_user
 import schemas
+from xlsx_stream import stream_xlsx, XLSX_MEDIA_TYPE, EXPORT_BATCH_ROWS
+from export_jobs import export_jobs
+from purse import MINIMUM_PLAYERS, BASE_PLAYER_PRICE, calculate_max_bid_limit, projection
+from feasibility import feasibility
+from leaderboards import leaderboards
+from response_cache import response_cache, cached_response, json_bytes
+from conditional import table_version, tables_version, make_etag, etag_matches, set_etag, not_modified
+from list_stream import stream_format, stream_list, STREAM_MAX_LIMIT
 
 router = APIRouter()
 
-MINIMUM_PLAYERS = 13
-BASE_PLAYER_PRICE = 10000
+@router.get("/")
+async def get_all_teams(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=STREAM_MAX_LIMIT),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get all teams with their current budget and player count.
+    With Accept: application/x-ndjson or text/csv the rows are streamed by id,
+    and cursor/limit page through them (see list_stream).
+    """
+    fmt = stream_format(request)
+    etag = make_etag("teams", fmt, cursor, limit, table_version(db, TeamModel))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    if fmt:
+        return stream_list(
+            fmt, db, TeamModel, team_list_item,
+            cursor=cursor, limit=limit, headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    
+    # The version is part of the key, as in the analytics summary: another
+    # worker's write changes the ETag, and this worker's older body misses
+    key = f"/teams/?version={etag}"
+    body = response_cache.get(key)
+    if body is None:
+        body = build_teams_list(db, key)
+    response = cached_response(body)
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept"
+    return response
 
-def calculate_max_bid_limit(team: TeamModel) -> float:
-    """Calculate maximum bid limit for a team based on remaining budget and players needed"""
-    players_still_needed = MINIMUM_PLAYERS - team.players_count
-    if players_still_needed <= 0:
-        # Team has met minimum requirement, can bid full remaining budget
-        return team.remaining_budget
-    else:
-        # Must reserve money for remaining minimum players
-        reserved_amount = (players_still_needed - 1) * BASE_PLAYER_PRICE
-        max_bid = team.remaining_budget - reserved_amount
-        return max(max_bid, BASE_PLAYER_PRICE)
+def team_list_item(team: TeamModel) -> dict:
+    return {
+        "id": team.id,
+        "name": team.name,
+        "short_name": team.short_name,
+        "league": team.league,
+        "logo_url": team.logo_url,
+        "team_logo": team.team_logo,
+        "color_primary": team.color_primary,
+        "color_secondary": team.color_secondary,
+        "budget": team.budget,
+        "remaining_budget": team.remaining_budget,
+        "players_count": team.players_count,
+        "created_at": team.created_at,
+        "max_bid_limit": calculate_max_bid_limit(team),
+        "owner_name": team.owner_name,
+        "owner_email": team.owner_email,
+        "owner_phone": team.owner_phone,
+        "sponsor_name": team.sponsor_name,
+        "sponsor_details": team.sponsor_details,
+        "about_us": team.about_us,
+        "team_registered": team.team_registered
+    }
 
-@router.get("/")
-async def get_all_teams(db: Session = Depends(get_db)):
-    """Get all teams with their current budget and player count"""
+def build_teams_list(db: Session, key: str) -> bytes:
+    generation = response_cache.generation()
+    
     teams = db.query(TeamModel).all()
-    result = []
-    for team in teams:
-        team_dict = {
-            "id": team.id,
-            "name": team.name,
-            "short_name": team.short_name,
-            "logo_url": team.logo_url,
-            "team_logo": team.team_logo,
-            "color_primary": team.color_primary,
-            "color_secondary": team.color_secondary,
-            "budget": team.budget,
-            "remaining_budget": team.remaining_budget,
-            "players_count": team.players_count,
-            "created_at": team.created_at,
-            "max_bid_limit": calculate_max_bid_limit(team),
-            "owner_name": team.owner_name,
-            "owner_email": team.owner_email,
-            "owner_phone": team.owner_phone,
-            "sponsor_name": team.sponsor_name,
-            "sponsor_details": team.sponsor_details,
-            "about_us": team.about_us,
-            "team_registered": team.team_registered
-        }
-        result.append(team_dict)
-    return result
+    result = [team_list_item(team) for team in teams]
+    
+    body = json_bytes(result)
+    # A replica that has not caught up would cache an old list under a new key
+    if not read_from_replica(db):
+        response_cache.set(key, body, ["teams"], generation)
+    return body
+
+@router.get("/purses")
+async def get_team_purses(league: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """Remaining budget, players needed and max bid for every team, served from memory"""
+    return [purse.to_dict() for purse in projection.all(db, league)]
+
+@router.get("/feasibility")
+async def get_squad_feasibility(league: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    Players left to auction by role and base price, how many every team
+    still needs, and each team's guaranteed max bid, served from memory
+    """
+    return feasibility.summary(db, league)
 
 @router.get("/{team_id}", response_model=schemas.TeamWithPlayers)
-async def get_team(team_id: int, db: Session = Depends(get_db)):
+async def get_team(team_id: int, db: Session = Depends(get_read_db)):
     """Get team details with all players"""
-    team = db.query(TeamModel).filter(TeamModel.id == team_id).first()
+    # Versioned like the list, so another worker's sale misses this worker's entry
+    key = f"/teams/{team_id}?version={make_etag(tables_version(db, TeamModel, PlayerModel))}"
+    body = response_cache.get(key)
+    if body is not None:
+        return cached_response(body)
+    generation = response_cache.generation()
+    
+    team = db.query(TeamModel).options(
+        selectinload(TeamModel.players)
+    ).filter(TeamModel.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    return team
+    
+    body = json_bytes(schemas.TeamWithPlayers.model_validate(team))
+    if not read_from_replica(db):
+        response_cache.set(key, body, [f"team:{team_id}"], generation)
+    return cached_response(body)
 
 @router.post("/", response_model=schemas.Team)
 async def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db)):
@@ -73,11 +133,12 @@ async def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db)):
     db.add(db_team)
     db.commit()
     db.refresh(db_team)
+    projection.invalidate()
     
     return db_team
 
 @router.get("/{team_id}/max-bid-limit")
-async def get_team_max_bid_limit(team_id: int, db: Session = Depends(get_db)):
+async def get_team_max_bid_limit(team_id: int, db: Session = Depends(get_read_db)):
     """Get the maximum bid limit for a team"""
     team = db.query(TeamModel).filter(TeamModel.id == team_id).first()
     if not team:
@@ -94,6 +155,7 @@ async def get_team_max_bid_limit(team_id: int, db: Session = Depends(get_db)):
         "min_players_required": MINIMUM_PLAYERS,
         "players_still_needed": players_needed,
         "max_bid_limit": max_bid,
+        "guaranteed_max_bid_limit": feasibility.max_bid(db, team, team.league),
         "explanation": f"Reserve {(players_needed - 1) * BASE_PLAYER_PRICE if players_needed > 0 else 0} INR for {players_needed - 1 if players_needed > 0 else 0} more players" if players_needed > 0 else "Minimum player requirement met"
     }
 
@@ -124,6 +186,7 @@ async def initialize_teams(db: Session = Depends(get_db)):
             created_teams.append(team_data["name"])
     
     db.commit()
+    projection.invalidate()
     return {"message": f"Initialized {len(created_teams)} teams", "teams": created_teams}
 
 @router.post("/register", response_model=schemas.Team)
@@ -160,6 +223,7 @@ async def register_team(
         "id": team.id,
         "name": team.name,
         "short_name": team.short_name,
+        "league": team.league,
         "logo_url": team.logo_url,
         "team_logo": team.team_logo,
         "color_primary": team.color_primary,
@@ -197,16 +261,27 @@ async def update_team(
         raise HTTPException(status_code=404, detail="Team not found")
     
     # Update team fields
-    for field, value in team_update.dict(exclude_unset=True).items():
+    update_data = team_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
         setattr(team, field, value)
     
     db.commit()
+    if "league" in update_data:
+        # The purses (and with them bid caps and feasibility) are grouped by
+        # league; the boards are dropped too so nothing keeps the old grouping
+        projection.invalidate()
+        feasibility.invalidate()
+        leaderboards.invalidate()
+    elif "name" in update_data:
+        # Team names are shown on the leaderboards
+        leaderboards.invalidate()
     db.refresh(team)
     
     return {
         "id": team.id,
         "name": team.name,
         "short_name": team.short_name,
+        "league": team.league,
         "logo_url": team.logo_url,
         "team_logo": team.team_logo,
         "color_primary": team.color_primary,
@@ -225,52 +300,63 @@ async def update_team(
         "created_at": team.created_at
     }
 
+TEAM_EXPORT_COLUMNS = [
+    "ID", "Name", "Short Name", "Budget", "Remaining Budget", "Players Count", "Owner Name",
+    "Owner Email", "Owner Phone", "Sponsor Name", "Sponsor Details", "About Us",
+    "Team Registered", "Color Primary", "Color Secondary", "Created At"
+]
+
+def team_export_row(team: TeamModel) -> tuple:
+    """One export row, in TEAM_EXPORT_COLUMNS order"""
+    return (
+        team.id,
+        team.name,
+        team.short_name,
+        team.budget,
+        team.remaining_budget,
+        team.players_count,
+        team.owner_name,
+        team.owner_email,
+        team.owner_phone,
+        team.sponsor_name,
+        team.sponsor_details,
+        team.about_us,
+        team.team_registered,
+        team.color_primary,
+        team.color_secondary,
+        team.created_at
+    )
+
+def iter_team_export_rows():
+    """Stream export rows with their own session, like iter_player_export_rows"""
+    db = SessionLocal()
+    try:
+        # Logos are not exported
+        query = db.query(TeamModel).options(defer(TeamModel.team_logo)).order_by(TeamModel.id).yield_per(EXPORT_BATCH_ROWS)
+        for team in query:
+            yield team_export_row(team)
+    finally:
+        db.close()
+
+def write_teams_export(path: str):
+    """Write the teams workbook to a file (run by export jobs)"""
+    with open(path, "wb") as f:
+        for chunk in stream_xlsx("Teams", TEAM_EXPORT_COLUMNS, iter_team_export_rows()):
+            f.write(chunk)
+
 @router.get("/export/excel")
 async def export_teams_to_excel(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """Export all teams to Excel (Admin only)"""
-    import io
-    import pandas as pd
-    from fastapi.responses import StreamingResponse
-    
-    teams = db.query(TeamModel).all()
-    
-    # Convert to dict
-    teams_data = []
-    for team in teams:
-        teams_data.append({
-            "ID": team.id,
-            "Name": team.name,
-            "Short Name": team.short_name,
-            "Budget": team.budget,
-            "Remaining Budget": team.remaining_budget,
-            "Players Count": team.players_count,
-            "Owner Name": team.owner_name,
-            "Owner Email": team.owner_email,
-            "Owner Phone": team.owner_phone,
-            "Sponsor Name": team.sponsor_name,
-            "Sponsor Details": team.sponsor_details,
-            "About Us": team.about_us,
-            "Team Registered": team.team_registered,
-            "Color Primary": team.color_primary,
-            "Color Secondary": team.color_secondary,
-            "Created At": team.created_at
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(teams_data)
-    
-    # Write to Excel
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Teams')
-    output.seek(0)
-    
+    # An export job may already have built this version of the workbook
+    path = export_jobs.cached_artifact(db, "teams")
+    if path is not None:
+        return FileResponse(path, media_type=XLSX_MEDIA_TYPE, filename="gpl_teams.xlsx")
     return StreamingResponse(
-        output,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        stream_xlsx("Teams", TEAM_EXPORT_COLUMNS, iter_team_export_rows()),
+        media_type=XLSX_MEDIA_TYPE,
         headers={'Content-Disposition': 'attachment; filename=gpl_teams.xlsx'}
     )
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, date
 from models import PlayerRole, PlayerStatus, AuctionStatus, PaymentStatus, BattingStyle, BowlingStyle, BlockName, PaymentMode, JerseySize, UserRole
 
@@ -44,6 +44,7 @@ class PasswordUpdate(BaseModel):
 class TeamBase(BaseModel):
     name: str
     short_name: str
+    league: Optional[str] = None
     logo_url: Optional[str] = None
     color_primary: Optional[str] = None
     color_secondary: Optional[str] = None
@@ -54,6 +55,7 @@ class TeamCreate(TeamBase):
 class TeamUpdate(BaseModel):
     name: Optional[str] = None
     short_name: Optional[str] = None
+    league: Optional[str] = None
     owner_name: Optional[str] = None
     logo_url: Optional[str] = None
     team_logo: Optional[str] = None  # Base64 encoded team logo image
@@ -111,6 +113,7 @@ class PlayerBase(BaseModel):
     jersey_size: Optional[JerseySize] = None
     cricheroes_id: Optional[str] = None
     bio: Optional[str] = None
+    league: Optional[str] = None
 
     @field_validator('flat_number')
     @classmethod
@@ -148,6 +151,7 @@ class PlayerUpdate(BaseModel):
     player_image: Optional[str] = None
     base_price: Optional[float] = None
     auction_order: Optional[int] = None
+    league: Optional[str] = None
 
 class Player(PlayerBase):
     id: int
@@ -163,6 +167,7 @@ class Player(PlayerBase):
     sold_price: Optional[float] = None
     team_id: Optional[int] = None
     auction_order: Optional[int] = None
+    rating: Optional[float] = None
     registration_fee_paid: bool
     photo_url: Optional[str] = None
     player_image: Optional[str] = None
@@ -174,6 +179,20 @@ class Player(PlayerBase):
 class PlayerWithTeam(Player):
     team: Optional[Team] = None
 
+class PlayerBatch(BaseModel):
+    player_ids: List[int]
+
+    @field_validator('player_ids')
+    @classmethod
+    def validate_player_ids(cls, v):
+        if not v:
+            raise ValueError('player_ids cannot be empty')
+        return list(dict.fromkeys(v))
+
+class RatingRecompute(BaseModel):
+    # role -> feature -> weight, overriding player_ratings.DEFAULT_WEIGHTS for the roles given
+    weights: Optional[Dict[str, Dict[str, float]]] = None
+
 # Auction Schemas
 class AuctionBase(BaseModel):
     season: int = 2
@@ -183,6 +202,8 @@ class AuctionCreate(AuctionBase):
 
 class Auction(AuctionBase):
     id: int
+    name: Optional[str] = None
+    league: Optional[str] = None
     status: AuctionStatus
     current_player_id: Optional[int] = None
     current_bid_amount: Optional[float] = None
@@ -194,15 +215,60 @@ class Auction(AuctionBase):
     class Config:
         from_attributes = True
 
+class AuctionOrderRules(BaseModel):
+    league: Optional[str] = None
+    # Marquee players open the auction: these ids, or else the marquee_count highest rated
+    marquee_ids: Optional[List[int]] = None
+    marquee_count: int = 10
+    # False previews the sequence without storing it
+    apply: bool = True
+
+    @field_validator('marquee_count')
+    @classmethod
+    def validate_marquee_count(cls, v):
+        if v < 0:
+            raise ValueError('marquee_count cannot be negative')
+        return v
+
 class AuctionWithDetails(Auction):
     current_player: Optional[Player] = None
     current_bidding_team: Optional[Team] = None
 
+# Checkpoint Schemas
+class CheckpointCreate(BaseModel):
+    name: str
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('Checkpoint name cannot be empty')
+        if len(v) > 100:
+            raise ValueError('Checkpoint name must be at most 100 characters')
+        return v
+
+class Checkpoint(BaseModel):
+    id: int
+    name: str
+    players: int
+    teams: int
+    auctions: int
+    bids: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # Bid Schemas
 class BidCreate(BaseModel):
     team_id: int
     bid_amount: float
 
+class ProxyBidCreate(BaseModel):
+    team_id: int
+    max_amount: float
+
 class Bid(BaseModel):
     id: int
     auction_id: int
@@ -259,6 +325,7 @@ class PlayerRegistration(BaseModel):
     cricheroes_id: Optional[str] = None
     bio: Optional[str] = None
     player_image: Optional[str] = None  # Player registration image
+    league: Optional[str] = None
 
     @field_validator('flat_number')
     @classmethod
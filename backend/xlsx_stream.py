@@ -0,0 +1,187 @@
+"""
+Streaming XLSX writer.
+
+An .xlsx file is a zip of XML parts, and zipfile can write to a stream it
+cannot seek (each member is followed by a data descriptor). The writer
+deflates worksheet rows into an in-memory sink as they arrive and hands the
+compressed bytes to the caller in chunks. The first bytes go out before the
+first row is read, and memory stays flat no matter how many rows there are.
+
+Strings are written inline rather than through a shared-strings table, so
+nothing accumulates per row. Cells are written the way the pandas/openpyxl
+exports this replaces wrote them: a header row styled as pandas 2.x styles
+it (bold, thin borders, centred), integral floats as integers, and
+datetimes formatted "YYYY-MM-DD HH:MM:SS".
+"""
+import math
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Rows deflated per chunk, and ORM rows fetched per round trip by the exports
+BATCH_ROWS = 500
+EXPORT_BATCH_ROWS = 1000
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+# Control characters are not allowed in XML 1.0 (openpyxl raises on them)
+_ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Style indexes into cellXfs below
+_DATETIME_STYLE = 1
+_DATE_STYLE = 2
+_HEADER_STYLE = 3
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2"><numFmt numFmtId="164" formatCode="YYYY-MM-DD HH:MM:SS"/>'
+    '<numFmt numFmtId="165" formatCode="YYYY-MM-DD"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="top"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+class _Sink:
+    """Write-only file object that collects what zipfile writes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _text(value: str) -> str:
+    return escape(_ILLEGAL_CHARS.sub("", value))
+
+def _cell(ref: str, value, style: int = 0) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return ""
+        if value.is_integer():
+            value = int(value)
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    if isinstance(value, int):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        serial = (value.replace(tzinfo=None) - _EXCEL_EPOCH) / timedelta(days=1)
+        return f'<c r="{ref}" s="{_DATETIME_STYLE}"><v>{serial!r}</v></c>'
+    if isinstance(value, date):
+        serial = (value - _EXCEL_EPOCH.date()).days
+        return f'<c r="{ref}" s="{_DATE_STYLE}"><v>{serial}</v></c>'
+    text = _text(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    styled = f' s="{style}"' if style else ""
+    return f'<c r="{ref}"{styled} t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+def _row(number: int, letters: Sequence[str], values: Sequence, style: int = 0) -> str:
+    cells = "".join(_cell(f"{letter}{number}", value, style) for letter, value in zip(letters, values))
+    return f'<row r="{number}">{cells}</row>'
+
+def stream_xlsx(sheet_name: str, headers: Sequence[str], rows: Iterable[Sequence],
+                batch_rows: int = BATCH_ROWS) -> Iterator[bytes]:
+    """Yield a single-sheet workbook as compressed chunks while `rows` is consumed"""
+    letters = [_column_letter(index) for index in range(len(headers))]
+    sink = _Sink()
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+            archive.writestr("_rels/.rels", _ROOT_RELS)
+            archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=_text(sheet_name[:31])))
+            archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+            archive.writestr("xl/styles.xml", _STYLES)
+            yield sink.drain()
+
+            with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+                batch = [_SHEET_HEAD, _row(1, letters, headers, _HEADER_STYLE)]
+                for number, values in enumerate(rows, start=2):
+                    batch.append(_row(number, letters, values))
+                    if len(batch) >= batch_rows:
+                        sheet.write("".join(batch).encode("utf-8"))
+                        batch.clear()
+                        chunk = sink.drain()
+                        if chunk:
+                            yield chunk
+                batch.append(_SHEET_TAIL)
+                sheet.write("".join(batch).encode("utf-8"))
+        yield sink.drain()
+    finally:
+        # Release the caller's cursor/session if the client went away mid-download
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
@@ -11,6 +11,10 @@ const api = axios.create({
   },
 });
 
+// Echo the time of our last write back to the API, so that our reads go to
+// the primary database until the read replicas have caught up with it
+let lastWrite = null;
+
 // Add request interceptor to include auth token
 api.interceptors.request.use(
   (config) => {
@@ -18,6 +22,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite;
+    }
     return config;
   },
   (error) => {
@@ -25,6 +32,14 @@ api.interceptors.request.use(
   }
 );
 
+api.interceptors.response.use((response) => {
+  const stamp = response.headers['x-last-write'];
+  if (stamp) {
+    lastWrite = stamp;
+  }
+  return response;
+});
+
 // Teams API
 export const teamsAPI = {
   getAll: () => api.get('/teams/'),